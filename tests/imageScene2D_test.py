@@ -23,10 +23,11 @@ from typing import Optional
 import unittest as ut
 import datetime
 import time
+from unittest import mock
 
 import pytest
 
-from qtpy.QtGui import QImage, QPainter
+from qtpy.QtGui import QImage, QPainter, QTransform
 from qtpy.QtWidgets import QStyleOptionGraphicsItem
 
 from qimage2ndarray import byte_view
@@ -34,7 +35,7 @@ import numpy as np
 
 from volumina.imageScene2D import ImageScene2D, DirtyIndicator
 from volumina.positionModel import PositionModel
-from volumina.pixelpipeline.datasources import ConstantSource
+from volumina.pixelpipeline.datasources import ArraySource, ConstantSource
 from volumina.pixelpipeline.slicesources import PlanarSliceSource
 from volumina.pixelpipeline.imagepump import StackedImageSources
 from volumina.tiling import Tiling
@@ -140,6 +141,129 @@ class ImageScene2DTest(ut.TestCase):
         s.stackedImageSources = sims
         self.assertEqual(id(s.stackedImageSources), id(sims))
 
+    def testTileWidthAlignedToChunks(self):
+        class ChunkedArray(np.ndarray):
+            chunks = (1, 100, 100, 1, 1)
+
+        ds = ArraySource(np.zeros((1, 500, 500, 1, 1), dtype=np.uint8).view(ChunkedArray))
+        layerstack = LayerStackModel()
+        layer = GrayscaleLayer(ds)
+        layerstack.append(layer)
+        sims = StackedImageSources(layerstack)
+        sims.register(layer, layer.createImageSource([PlanarSliceSource(ds)]))
+
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.stackedImageSources = sims
+        s.dataShape = (500, 500)
+        self.assertEqual(s.tileWidth(), 256)
+        self.assertEqual(s.currentTileWidth(), 300)
+
+        s.setTileWidthAdaptive(False)
+        self.assertEqual(s.currentTileWidth(), 256)
+
+    def testTileWidthFollowsZoom(self):
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.dataShape = (5000, 5000)
+
+        def zoom(scale):
+            s._updateZoomLevel(mock.Mock(transform=lambda: QTransform.fromScale(scale, scale)))
+            if s._retileTimer.isActive():
+                s._retileTimer.stop()
+                s._onRetileTimer()
+            return s.currentTileWidth()
+
+        self.assertEqual(zoom(1.0), 256)
+        self.assertEqual(zoom(0.25), 1024)
+        # within the hysteresis, the tiling is kept
+        self.assertEqual(zoom(0.4), 1024)
+        self.assertEqual(zoom(0.6), 512)
+        self.assertEqual(zoom(4.0), 64)
+
+    def testTileStepFollowsZoom(self):
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.dataShape = (5000, 5000)
+
+        def zoom(scale):
+            s._updateZoomLevel(mock.Mock(transform=lambda: QTransform.fromScale(scale, scale)))
+            if s._retileTimer.isActive():
+                s._retileTimer.stop()
+                s._onRetileTimer()
+            self.assertEqual(s._tileProvider.step, s.tileStep())
+            return s.tileStep()
+
+        self.assertEqual(zoom(1.0), 1)
+        # never coarser than the screen pixels
+        self.assertEqual(zoom(0.5), 1)
+        self.assertEqual(zoom(0.25), 2)
+        self.assertEqual(zoom(1 / 16), 8)
+        self.assertEqual(zoom(2.0), 1)
+
+        zoom(1 / 16)
+        s.setZoomSubsampling(False)
+        self.assertEqual(s.tileStep(), 1)
+        self.assertEqual(s._tileProvider.step, 1)
+
+    def testRetilingKeepsTileCaches(self):
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.dataShape = (5000, 5000)
+
+        def zoom(scale):
+            s._updateZoomLevel(mock.Mock(transform=lambda: QTransform.fromScale(scale, scale)))
+            if s._retileTimer.isActive():
+                s._retileTimer.stop()
+                s._onRetileTimer()
+            return s._tileProvider
+
+        full = zoom(1.0)
+        quarter = zoom(0.25)
+        self.assertIsNot(quarter, full)
+        # zooming back reuses the tile provider, and so its cache
+        self.assertIs(zoom(1.0), full)
+        self.assertIs(zoom(0.25), quarter)
+        self.assertIs(s._tiling, quarter.tiling)
+
+        for scale in (1 / 16, 1 / 64, 4.0):
+            zoom(scale)
+        self.assertIsNot(zoom(0.25), quarter)
+
+        s.dataShape = (300, 300)
+        self.assertEqual(len(s._retiredTileProviders), 0)
+
+    def testReusedTilingFollowsOrientation(self):
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.dataShape = (5000, 3000)
+
+        def zoom(scale):
+            s._updateZoomLevel(mock.Mock(transform=lambda: QTransform.fromScale(scale, scale)))
+            if s._retileTimer.isActive():
+                s._retileTimer.stop()
+                s._onRetileTimer()
+            return s._tileProvider
+
+        full = zoom(1.0)
+        zoom(0.25)
+        s._onSwapAxes()
+        self.assertIs(zoom(1.0), full)
+        self.assertEqual(s._tiling.data2scene, s.data2scene)
+
+        zoom(0.25)
+        s._onRotateLeft()
+        self.assertIs(zoom(1.0), full)
+        self.assertEqual(s._tiling.data2scene, s.data2scene)
+        self.assertEqual(full.tiling.data2scene, s.data2scene)
+
+    def testTileWidthChanged(self):
+        s = ImageScene2D(PositionModel(), (0, 3, 4), preemptive_fetch_number=0)
+        s.dataShape = (5000, 5000)
+        widths = []
+        s.tileWidthChanged.connect(widths.append)
+
+        s._updateZoomLevel(mock.Mock(transform=lambda: QTransform.fromScale(0.25, 0.25)))
+        s._retileTimer.stop()
+        s._onRetileTimer()
+        s.setZoomSubsampling(False)
+        self.assertEqual(widths, [1024])
+
 
 @pytest.mark.usefixtures("qapp")
 class ImageScene2D_RenderTest(ut.TestCase):
@@ -193,6 +317,25 @@ class ImageScene2D_RenderTest(ut.TestCase):
         self.assertTrue(np.all(aimg[:, :, 0:3] == self.GRAY))
         self.assertTrue(np.all(aimg[:, :, 3] == 255))
 
+    def testRenderingWithExhaustedFrameBudget(self):
+        self.scene.setTileWidth(50)
+        self.scene.stackedImageSources = self.sims
+        self.scene.dataShape = (310, 290)
+        # every frame refreshes a single tile, the remaining ones are deferred
+        self.scene.setFrameBudget(1e-9)
+
+        img = QImage(310, 290, QImage.Format_ARGB32_Premultiplied)
+        img.fill(0)
+        p = QPainter(img)
+        self.scene.render(p)
+        p.end()
+        assert self.scene.dirty
+
+        self.scene.setFrameBudget(None)
+        aimg = self.renderScene(self.scene)
+        self.assertTrue(np.all(aimg[:, :, 0:3] == self.GRAY))
+        assert not self.scene.dirty
+
 
 if __name__ == "__main__":
     ut.main()
@@ -0,0 +1,49 @@
+import numpy as np
+from pyqtgraph.opengl import MeshData
+
+from volumina.view3d.lod import LODMeshItem, decimate, select_levels
+
+
+def sphere(rows=40, cols=40):
+    mesh = MeshData.sphere(rows, cols, radius=10)
+    return mesh.vertexes(), mesh.faces()
+
+
+def test_decimate_keeps_small_meshes():
+    vertices, faces = sphere(4, 4)
+    assert decimate(vertices, faces, len(faces)) == (vertices, faces)
+
+
+def test_decimate_meets_budget():
+    vertices, faces = sphere()
+    new_vertices, new_faces = decimate(vertices, faces, 500)
+    assert 0 < len(new_faces) <= 500
+    assert new_faces.max() < len(new_vertices)
+    # every vertex is used and the shape is preserved
+    assert len(np.unique(new_faces)) == len(new_vertices)
+    np.testing.assert_allclose(np.linalg.norm(new_vertices, axis=1), 10, rtol=0.2)
+
+
+def test_select_levels_by_distance():
+    counts = [1000, 100, 10]
+    levels = select_levels([(counts, 10, 10), (counts, 10, 40), (counts, 10, 1000)])
+    assert levels == [0, 1, 2]
+
+
+def test_select_levels_by_budget():
+    counts = [1000, 100, 10]
+    assert select_levels([(counts, 10, 10)] * 3) == [0, 0, 0]
+    assert sorted(select_levels([(counts, 10, 10)] * 3, max_triangles=1200)) == [0, 1, 1]
+    assert select_levels([(counts, 10, 10)] * 3, max_triangles=1) == [2, 2, 2]
+
+
+def test_lod_mesh_item():
+    vertices, faces = sphere()
+    coarse = MeshData(*decimate(vertices, faces, 100))
+    item = LODMeshItem([MeshData(vertices, faces), coarse])
+    assert item.triangleCounts() == [len(faces), len(coarse.faces())]
+    assert item.radius > 10
+
+    item.setLevel(1)
+    assert item.level() == 1
+    assert item.opts["meshdata"] is coarse
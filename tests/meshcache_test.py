@@ -0,0 +1,80 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from pyqtgraph.opengl import MeshData
+
+from volumina.view3d.meshcache import MeshCache, mesh_key
+
+
+@pytest.fixture
+def labeling():
+    labeling = np.zeros((10, 12, 14), dtype=np.uint8)
+    labeling[1:4, 2:5, 3:6] = 1
+    labeling[6:9, 6:10, 8:12] = 2
+    return labeling
+
+
+@pytest.fixture
+def mesh():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    faces = np.array([[0, 1, 2]], dtype=np.uint32)
+    return MeshData(vertices, faces)
+
+
+def test_mesh_key_ignores_other_labels(labeling):
+    bbox = np.s_[1:4, 2:5, 3:6]
+    key = mesh_key(labeling, 1, bbox)
+
+    labeling[7, 7, 9] = 0
+    assert mesh_key(labeling, 1, bbox) == key
+
+    labeling[2, 3, 4] = 0
+    assert mesh_key(labeling, 1, bbox) != key
+
+
+def test_mesh_key_depends_on_position(labeling):
+    moved = np.roll(labeling, 1, axis=0)
+    assert mesh_key(labeling, 1, np.s_[1:4, 2:5, 3:6]) != mesh_key(moved, 1, np.s_[2:5, 2:5, 3:6])
+
+
+def test_memory_cache_evicts_least_recently_used(mesh):
+    cache = MeshCache(max_entries=2)
+    cache.put("a", mesh)
+    cache.put("b", mesh)
+    assert cache.get("a") is mesh
+    cache.put("c", mesh)
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b") is None
+
+
+def test_persisted_cache(tmp_path, mesh):
+    MeshCache(str(tmp_path)).put("a", mesh)
+
+    loaded = MeshCache(str(tmp_path)).get("a")
+    np.testing.assert_array_equal(loaded.vertexes(), mesh.vertexes())
+    np.testing.assert_array_equal(loaded.faces(), mesh.faces())
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), ValueError("cannot pickle")])
+def test_failed_write_leaves_no_files(tmp_path, mesh, error):
+    cache = MeshCache(str(tmp_path))
+    with mock.patch("numpy.savez", side_effect=error):
+        cache.put("a", mesh)
+    assert list(tmp_path.iterdir()) == []
+    # the mesh is still cached in memory
+    assert cache.get("a") is mesh
+
+
+def test_persisted_levels_of_detail(tmp_path, mesh):
+    MeshCache(str(tmp_path)).put("a", [mesh, mesh])
+
+    loaded = MeshCache(str(tmp_path)).get("a")
+    assert len(loaded) == 2
+    np.testing.assert_array_equal(loaded[1].faces(), mesh.faces())
+
+
+def test_mesh_key_depends_on_variant(labeling):
+    bbox = np.s_[1:4, 2:5, 3:6]
+    assert mesh_key(labeling, 1, bbox, ((1, 100),)) != mesh_key(labeling, 1, bbox, ((2, 100),))
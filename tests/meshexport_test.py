@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from pyqtgraph.opengl import MeshData
+
+from volumina.view3d.meshexport import (
+    mesh_file_format,
+    mesh_to_obj,
+    mesh_to_ply,
+    mesh_to_stl,
+    meshes_to_file,
+    vertex_normals,
+)
+
+
+@pytest.fixture
+def mesh():
+    return MeshData.sphere(6, 8, radius=2)
+
+
+def _read_obj(path):
+    vertices, faces = [], []
+    for line in open(path):
+        kind, *values = line.split()
+        if kind == "v":
+            vertices.append([float(v) for v in values])
+        elif kind == "f":
+            faces.append([int(v.split("//")[0]) - 1 for v in values])
+    return np.array(vertices), np.array(faces)
+
+
+def test_vertex_normals_match_mesh_data(mesh):
+    expected = MeshData(mesh.vertexes(), mesh.faces()).vertexNormals()
+    np.testing.assert_allclose(vertex_normals(mesh), expected, atol=1e-5)
+
+
+def test_obj(tmp_path, mesh):
+    path = str(tmp_path / "mesh.obj")
+    mesh_to_obj(mesh, path, "sphere")
+
+    vertices, faces = _read_obj(path)
+    np.testing.assert_array_equal(vertices.astype(mesh.vertexes().dtype), mesh.vertexes())
+    np.testing.assert_array_equal(faces, mesh.faces())
+
+
+def test_obj_with_several_objects(tmp_path, mesh):
+    path = str(tmp_path / "meshes.obj")
+    meshes_to_file([("a", mesh), ("b", mesh)], path)
+
+    vertices, faces = _read_obj(path)
+    n = len(mesh.vertexes())
+    assert len(vertices) == 2 * n
+    np.testing.assert_array_equal(faces[len(mesh.faces()) :], mesh.faces() + n)
+
+
+def test_ply(tmp_path, mesh):
+    path = str(tmp_path / "mesh.ply")
+    mesh_to_ply(mesh, path)
+
+    data = open(path, "rb").read()
+    header, body = data.split(b"end_header\n")
+    assert b"element vertex %d" % len(mesh.vertexes()) in header
+    vertices = np.frombuffer(body, dtype="<f4", count=6 * len(mesh.vertexes())).reshape(-1, 6)
+    np.testing.assert_allclose(vertices[:, :3], mesh.vertexes())
+    faces = np.frombuffer(body[vertices.nbytes :], dtype=[("n", "u1"), ("indices", "<i4", (3,))])
+    np.testing.assert_array_equal(faces["indices"], mesh.faces())
+
+
+@pytest.mark.parametrize("several", [False, True])
+def test_stl(tmp_path, mesh, several):
+    path = str(tmp_path / "mesh.stl")
+    if several:
+        meshes_to_file([("a", mesh), ("b", mesh)], path)
+    else:
+        mesh_to_stl(mesh, path)
+
+    data = open(path, "rb").read()
+    count = np.frombuffer(data[80:84], dtype="<u4")[0]
+    assert count == len(mesh.faces()) * (2 if several else 1)
+    assert len(data) == 84 + 50 * count
+
+
+def test_file_format():
+    assert mesh_file_format("a/b.PLY") == "ply"
+    assert mesh_file_format("a/b", "stl") == "stl"
+    with pytest.raises(ValueError):
+        mesh_file_format("a/b.vtk")
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+meshgenerator = pytest.importorskip("volumina.view3d.meshgenerator", exc_type=ImportError)
+
+
+@pytest.fixture
+def labeling():
+    labeling = np.zeros((30, 40, 50), dtype=np.uint8)
+    labeling[2:10, 5:20, 3:9] = 1
+    labeling[0:5, 30:40, 40:50] = 2
+    labeling[20:28, 10:12, 10:40] = 3
+    return labeling
+
+
+def test_label_bounding_boxes(labeling):
+    assert meshgenerator.label_bounding_boxes(labeling, [1, 2, 3, 7]) == {
+        1: (slice(2, 10), slice(5, 20), slice(3, 9)),
+        2: (slice(0, 5), slice(30, 40), slice(40, 50)),
+        3: (slice(20, 28), slice(10, 12), slice(10, 40)),
+    }
+
+
+def test_label_bounding_boxes_in_slabs(labeling, monkeypatch):
+    expected = meshgenerator.label_bounding_boxes(labeling, [1, 2, 3])
+    # slabs of 3 planes, the last one partial
+    monkeypatch.setattr(meshgenerator, "BBOX_CHUNK_VOXELS", 3 * labeling[0].size)
+    assert meshgenerator.label_bounding_boxes(labeling, [1, 2, 3]) == expected
+    monkeypatch.setattr(meshgenerator, "BBOX_CHUNK_VOXELS", 1)
+    assert meshgenerator.label_bounding_boxes(labeling, [1, 2, 3]) == expected
+
+
+def _triangles(vertices, faces):
+    return np.sort(vertices[faces].reshape(-1, 9), axis=0)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_cropped_meshes_match_full_volume(labeling, parallel):
+    with ThreadPoolExecutor(2) as executor:
+        meshes = dict(meshgenerator.labeling_to_mesh(labeling, [1, 2, 3, 7], executor if parallel else None))
+
+    assert sorted(meshes) == [1, 2, 3]
+    for label, mesh in meshes.items():
+        vertices, _, faces = meshgenerator.march(np.where(labeling == label, 2, 0).astype(int).T, 3)
+        np.testing.assert_allclose(_triangles(mesh.vertexes(), mesh.faces()), _triangles(vertices, faces))
+
+
+def test_meshes_of_a_crop_are_placed_at_its_origin(labeling):
+    (mesh,) = dict(meshgenerator.labeling_to_mesh(labeling, [1])).values()
+    crop = labeling[1:11, 4:21, 2:10].copy()
+    (cropped,) = dict(meshgenerator.labeling_to_mesh(crop, [1], origin=(1, 4, 2))).values()
+    np.testing.assert_allclose(
+        _triangles(cropped.vertexes(), cropped.faces()), _triangles(mesh.vertexes(), mesh.faces())
+    )
+
+
+def test_levels_of_detail(labeling):
+    lod_levels = ((1, 10000), (2, 200), (4, 50))
+    meshes = dict(meshgenerator.labeling_to_mesh(labeling, [1, 3], lod_levels=lod_levels))
+
+    for label, levels in meshes.items():
+        assert len(levels) == 3
+        counts = [len(level.faces()) for level in levels]
+        assert counts[1] <= 200 and counts[2] <= 50
+        bbox = meshgenerator.label_bounding_boxes(labeling, [label])[label]
+        lower = np.array([s.start for s in bbox][::-1]) - 1
+        upper = np.array([s.stop for s in bbox][::-1])
+        for level in levels:
+            assert (level.vertexes() >= lower - 4).all() and (level.vertexes() <= upper + 4).all()
+            # normals come with every level, pyqtgraph doesn't have to compute them when it is shown
+            assert level._vertexNormals is not None
+            assert level._vertexNormals.shape == level.vertexes().shape
+
+
+def test_export_labeling_to_directory(labeling, tmp_path):
+    paths = meshgenerator.export_labeling(labeling, [1, 2], str(tmp_path), "stl", {1: "one", 2: "two"})
+    assert sorted(paths) == [str(tmp_path / "one.stl"), str(tmp_path / "two.stl")]
+    assert all((tmp_path / name).stat().st_size > 84 for name in ("one.stl", "two.stl"))
+
+
+def test_export_labeling_to_file(labeling, tmp_path):
+    path = str(tmp_path / "labels.obj")
+    assert meshgenerator.export_labeling(labeling, [1, 2, 3], path) == [path]
+    assert sum(line.startswith("o ") for line in open(path)) == 3
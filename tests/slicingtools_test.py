@@ -53,6 +53,15 @@ class SlicingToolsTest(unittest.TestCase):
 
         assert a == c
 
+    def test_stride_slicing(self):
+        assert st.stride_slicing(self.slicing, 1) == self.slicing
+        assert st.stride_slicing(self.slicing, (2, 3)) == (slice(5, 7, 2), slice(10, 18, 3))
+        assert st.stride_slicing((slice(0, 9, 2),), 2) == (slice(0, 9, 4),)
+        with self.assertRaises(ValueError):
+            st.stride_slicing(self.slicing, (2, 2, 2))
+        with self.assertRaises(ValueError):
+            st.normalize_step(0, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
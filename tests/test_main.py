@@ -0,0 +1,90 @@
+import gc
+
+import numpy as np
+import pytest
+
+from volumina.__main__ import create_layer, open_input, parse_args, per_input
+from volumina.layer import ColortableLayer, GrayscaleLayer, RGBALayer
+from volumina.pixelpipeline.datasources import createDataSource
+
+
+@pytest.fixture(autouse=True)
+def collect_qt_objects():
+    yield
+    # the layers and datasources are QObjects: destroy them in the main thread, not in the
+    # worker threads of later tests (e.g. reading an image sequence)
+    gc.collect()
+
+
+def test_parse_args_per_input_options():
+    args = parse_args(["a.npy", "b.h5", "--axistags", "zyx", "--layer-type", "grayscale", "--layer-type", "rgba"])
+    assert per_input(args.axistags, 2) == ["zyx", "zyx"]
+    assert per_input(args.layer_type, 2) == ["grayscale", "rgba"]
+    assert per_input(args.name, 2) == [None, None]
+
+    with pytest.raises(SystemExit):
+        parse_args(["a.npy", "b.h5", "c.h5", "--name", "a", "--name", "b"])
+
+
+def test_open_npy_memory_mapped(tmp_path):
+    path = tmp_path / "image.npy"
+    np.save(path, np.arange(60, dtype=np.uint16).reshape(3, 4, 5))
+    data = open_input(str(path))
+    assert isinstance(data, np.memmap)
+
+    source = createDataSource(data, axistags="zyx")
+    tile = source.request(np.s_[0:1, 1:3, 0:2, 2:3, 0:1]).wait()
+    assert np.shares_memory(tile, data)
+    assert tile.ravel().tolist() == [41, 46, 42, 47]
+
+
+def test_open_h5_dataset(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    with h5py.File(tmp_path / "data.h5", "w") as f:
+        f.create_dataset("volume/raw", data=np.zeros((3, 4, 5)))
+        f.create_dataset("volume/seg", data=np.zeros((3, 4, 5)))
+    with h5py.File(tmp_path / "single.h5", "w") as f:
+        f.create_dataset("volume/raw", data=np.zeros((3, 4, 5)))
+
+    assert open_input(str(tmp_path / "data.h5" / "volume" / "seg")).name == "/volume/seg"
+    assert open_input(str(tmp_path / "single.h5")).name == "/volume/raw"
+    with pytest.raises(ValueError):
+        open_input(str(tmp_path / "data.h5"))
+
+
+def test_open_tiff_stack(tmp_path):
+    tifffile = pytest.importorskip("tifffile")
+    pytest.importorskip("zarr")
+    data = np.arange(2 * 30 * 40, dtype=np.uint16).reshape(2, 30, 40)
+    tifffile.imwrite(tmp_path / "stack.tif", data)
+
+    source = createDataSource(open_input(str(tmp_path / "stack.tif")), axistags="zyx")
+    assert np.array_equal(source.request(np.s_[:, :, :, :, :]).wait()[0, :, :, :, 0], data.transpose())
+
+
+@pytest.mark.parametrize("layer_type, layer_class", [("grayscale", GrayscaleLayer), ("colortable", ColortableLayer)])
+def test_create_layer(layer_type, layer_class):
+    source, shape = createDataSource(np.zeros((4, 5, 1), dtype=np.uint8), True)
+    layer = create_layer(source, shape, layer_type, "name")
+    assert isinstance(layer, layer_class)
+    assert layer.name == "name"
+
+
+def test_create_rgba_layer():
+    source, shape = createDataSource(np.arange(60, dtype=np.uint8).reshape(4, 5, 3), True)
+    layer = create_layer(source, shape, "rgba", "rgb")
+    assert isinstance(layer, RGBALayer)
+    red, green, blue, alpha = layer.datasources
+    assert alpha is None
+    assert blue.request(np.s_[:, 1:2, 2:3, :, :]).wait().ravel().tolist() == [1 * 15 + 2 * 3 + 2]
+
+
+def test_open_image_sequence(tmp_path):
+    tifffile = pytest.importorskip("tifffile")
+    data = np.arange(3 * 6 * 5, dtype=np.uint8).reshape(3, 6, 5)
+    for z, plane in enumerate(data):
+        tifffile.imwrite(str(tmp_path / f"{z}.tif"), plane)
+    for path in (str(tmp_path), str(tmp_path / "*.tif")):
+        source, shape = createDataSource(open_input(path), True)
+        assert shape == (1, 5, 6, 3, 1)
+        np.testing.assert_array_equal(source.request(np.s_[:, :, :, :, :]).wait()[0, ..., 0], data.transpose(2, 1, 0))
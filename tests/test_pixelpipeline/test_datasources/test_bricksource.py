@@ -0,0 +1,79 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from volumina.pixelpipeline.datasources import ArraySource, BrickFetcher
+from volumina.pixelpipeline.imagepump import ImagePump
+from volumina.slicingtools import SliceProjection
+
+
+@pytest.fixture
+def data():
+    return np.random.randint(0, 255, (1, 20, 30, 40, 1)).astype(np.uint8)
+
+
+@pytest.fixture
+def raw(data):
+    src = ArraySource(data)
+    src.request = mock.Mock(wraps=src.request)
+    return src
+
+
+@pytest.fixture
+def fetcher(data):
+    fetcher = BrickFetcher(brickShape=(16, 16, 16))
+    fetcher.setShape(data.shape)
+    fetcher.setPosition((3, 20, 35))
+    return fetcher
+
+
+def test_focus(fetcher):
+    assert fetcher.focus() == ((0, 16), (16, 30), (32, 40))
+
+
+def test_wrap_is_shared(fetcher, raw):
+    assert fetcher.wrap(raw) is fetcher.wrap(raw)
+
+
+def test_orthogonal_planes_share_one_brick(fetcher, raw, data):
+    src = fetcher.wrap(raw)
+    planes = [
+        np.s_[0:1, 3:4, 16:30, 32:40, 0:1],
+        np.s_[0:1, 0:16, 20:21, 32:40, 0:1],
+        np.s_[0:1, 0:16, 16:30, 35:36, 0:1],
+    ]
+    for slicing in planes:
+        assert_array_equal(src.request(slicing).wait(), data[slicing])
+
+    raw.request.assert_called_once_with(np.s_[0:1, 0:16, 16:30, 32:40, 0:1])
+
+
+def test_requests_outside_of_brick_are_forwarded(fetcher, raw, data):
+    src = fetcher.wrap(raw)
+    slicing = np.s_[0:1, 3:4, 0:30, 0:40, 0:1]
+    assert_array_equal(src.request(slicing).wait(), data[slicing])
+    raw.request.assert_called_once_with(slicing)
+
+
+def test_dirty_drops_brick(fetcher, raw, data):
+    src = fetcher.wrap(raw)
+    slicing = np.s_[0:1, 3:4, 16:30, 32:40, 0:1]
+    src.request(slicing).wait()
+
+    data[0, 3, 16, 32, 0] += 1
+    raw.setDirty(np.s_[0:1, 3:4, 16:17, 32:33, 0:1])
+    assert_array_equal(src.request(slicing).wait(), data[slicing])
+    assert raw.request.call_count == 2
+
+
+def test_image_pump_wraps_datasources(fetcher, raw):
+    from volumina.layer import GrayscaleLayer
+    from volumina.layerstack import LayerStackModel
+
+    layerstack = LayerStackModel()
+    layerstack.append(GrayscaleLayer(raw, normalize=False))
+    pump = ImagePump(layerstack, SliceProjection(), brickFetcher=fetcher)
+    (slicesrc,) = pump.layerToPlanarSliceSources(layerstack[0])
+    assert slicesrc._datasource is fetcher.wrap(layerstack[0].datasources[0])
@@ -108,3 +108,79 @@ def test_array_untagged_shape_embedding(make_source, shape, expected_shape):
     array = array[:]
     array.shape = src_array.shape
     assert_array_equal(array, src_array)
+
+
+@pytest.fixture
+def chunked_dataset():
+    h5py = pytest.importorskip("h5py")
+    with h5py.File("chunked", "w", driver="core", backing_store=False) as f:
+        yield f.create_dataset("ds", data=rand(50, 40, 6), chunks=(16, 16, 4))
+
+
+def test_h5py_chunk_shape(chunked_dataset):
+    source = ds.createDataSource(chunked_dataset)
+    assert source.chunkShape == (1, 16, 16, 4, 1)
+
+
+@pytest.mark.parametrize(
+    "slicing",
+    [
+        np.s_[:, :, :, :, :],
+        np.s_[:, 3:37, 10:11, 2:6, :],
+        np.s_[:, 1:50:4, 0:40:3, 5:6, :],
+        np.s_[:, 60:70, :, :, :],
+    ],
+)
+def test_h5py_chunked_request(chunked_dataset, slicing):
+    source = ds.createDataSource(chunked_dataset)
+    expected = chunked_dataset[:][None, ..., None][slicing]
+    assert_array_equal(source.request(slicing).wait(), expected)
+
+
+def test_h5py_chunks_are_decompressed_once(chunked_dataset):
+    reads = []
+
+    class CountingDataset:
+        shape, dtype, chunks = chunked_dataset.shape, chunked_dataset.dtype, chunked_dataset.chunks
+
+        def __getitem__(self, slicing):
+            reads.append(slicing)
+            return chunked_dataset[slicing]
+
+    wrapper = ds.factories.H5pyDset5DWrapper(CountingDataset())
+    # two tiles of the same slice, both straddling the chunk boundaries at 16 and 32
+    wrapper[:, 0:20, 10:30, 3:4, :]
+    wrapper[:, 20:40, 10:30, 3:4, :]
+    assert len(reads) == len(set(map(repr, reads))) == 6
+
+
+@pytest.mark.parametrize(
+    "axistags,shape,expected_shape",
+    [
+        ("xy", (3, 4), (1, 3, 4, 1, 1)),
+        ("yx", (3, 4), (1, 4, 3, 1, 1)),
+        ("zyxc", (2, 3, 4, 5), (1, 4, 3, 2, 5)),
+        ("ctzyx", (5, 6, 2, 3, 4), (6, 4, 3, 2, 5)),
+    ],
+)
+def test_array_axistags(make_source, axistags, shape, expected_shape):
+    array = make_source(shape)
+    source, src_shape = ds.createDataSource(array, True, axistags=axistags)
+    assert src_shape == expected_shape
+
+    expected = np.asarray(array[:])
+    src_array = source.request(np.s_[:, :, :, :, :]).wait()
+    assert src_array.shape == expected_shape
+    index = dict(zip(axistags, (1,) * len(shape)))
+    assert src_array[tuple(index.get(axis, 0) for axis in "txyzc")] == expected[(1,) * len(shape)]
+
+
+def test_array_axistags_are_a_view():
+    array = np.zeros((3, 4))
+    source = ds.createDataSource(array, axistags="yx")
+    assert np.shares_memory(source.request(np.s_[:, :, :, :, :]).wait(), array)
+
+
+def test_array_axistags_mismatch():
+    with pytest.raises(ValueError):
+        ds.createDataSource(np.zeros((3, 4)), axistags="xyz")
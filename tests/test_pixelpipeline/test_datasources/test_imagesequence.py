@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from volumina.pixelpipeline import datasources as ds
+from volumina.pixelpipeline.datasources import imagesequence
+from volumina.pixelpipeline.datasources.imagesequence import ImageSequence, ImageSequenceSource, sequenceFiles
+
+tifffile = pytest.importorskip("tifffile")
+
+
+@pytest.fixture
+def data():
+    return np.random.randint(0, 2**16, size=(12, 40, 30), dtype=np.uint16)
+
+
+@pytest.fixture(params=[None, "zlib"])
+def tiff_dir(request, tmp_path, data):
+    for z, plane in enumerate(data):
+        tifffile.imwrite(str(tmp_path / f"slice_{z}.tif"), plane, compression=request.param, rowsperstrip=8)
+    return tmp_path
+
+
+def test_files_sorted_naturally(tiff_dir):
+    names = [path.rsplit("_", 1)[1] for path in sequenceFiles(tiff_dir)]
+    assert names == [f"{z}.tif" for z in range(12)]
+    assert sequenceFiles(str(tiff_dir / "slice_1*.tif"))[-1].endswith("slice_11.tif")
+
+
+def test_no_images(tmp_path):
+    with pytest.raises(ValueError):
+        ImageSequence(tmp_path)
+
+
+def test_create_datasource(tiff_dir):
+    source, shape = ds.createDataSource(ImageSequence(tiff_dir), True)
+    assert isinstance(source, ImageSequenceSource)
+    assert shape == (1, 30, 40, 12, 1)
+    assert source.dtype() == np.uint16
+
+
+def test_sequence_along_t(tiff_dir, data):
+    source, shape = ds.createDataSource(ImageSequence(tiff_dir, axis="t"), True)
+    assert shape == (12, 30, 40, 1, 1)
+    assert_array_equal(source.request(np.s_[3:5, :, :, :, :]).wait()[..., 0, 0], data[3:5].transpose(0, 2, 1))
+
+
+@pytest.mark.parametrize(
+    "slicing",
+    [
+        np.s_[:, :, :, 4:5, :],  # xy view: one file
+        np.s_[:, 3:20, 7:8, :, :],  # xz view: a row of each file
+        np.s_[:, 11:12, :, 2:10, :],  # yz view: a column of each file
+        np.s_[:, 0:30:4, 1:40:3, 1:12:5, :],
+    ],
+)
+def test_request(tiff_dir, data, slicing):
+    with ThreadPoolExecutor(2) as executor:
+        source = ImageSequenceSource(tiff_dir, executor=executor)
+        expected = data.transpose(2, 1, 0)[None, ..., None]
+        assert_array_equal(source.request(slicing).wait(), expected[slicing])
+
+
+def test_orthogonal_views_read_regions(tiff_dir, data):
+    sequence = ImageSequence(tiff_dir, maxCachedPlanes=4)
+    with mock.patch.object(imagesequence, "readImage", wraps=imagesequence.readImage) as readImage:
+        assert_array_equal(sequence[:, 7:8, :], data[:, 7:8, :])
+        readImage.assert_not_called()
+        assert_array_equal(sequence[5, :, :], data[5])
+        assert_array_equal(sequence[5:6, 2:3, :], data[5:6, 2:3])
+        assert readImage.call_count == 1
+
+
+def test_cache_is_bounded(tiff_dir, data):
+    sequence = ImageSequence(tiff_dir, maxCachedPlanes=2)
+    for z in range(12):
+        assert_array_equal(sequence[z : z + 1], data[z : z + 1])
+    assert list(sequence._planes) == [10, 11]
+
+
+def test_whole_images_read_across_images_are_not_cached(tiff_dir, data):
+    sequence = ImageSequence(tiff_dir, maxCachedPlanes=4)
+    assert_array_equal(sequence[5:6], data[5:6])
+    # e.g. PNG images, which can only be decoded whole
+    with mock.patch.object(imagesequence, "readImageRegion", return_value=None):
+        assert_array_equal(sequence[:, 7:8, :], data[:, 7:8, :])
+    assert list(sequence._planes) == [0, 5]
+
+
+def test_mismatching_image(tiff_dir):
+    tifffile.imwrite(str(tiff_dir / "slice_12.tif"), np.zeros((5, 5), dtype=np.uint16))
+    sequence = ImageSequence(tiff_dir)
+    with pytest.raises(ValueError):
+        sequence[12:13]
+    with mock.patch.object(imagesequence, "readImageRegion", return_value=None):
+        with pytest.raises(ValueError):
+            sequence[:, 0:1, :]
+
+
+def test_png_sequence(tmp_path):
+    iio = pytest.importorskip("imageio.v3")
+    data = np.random.randint(0, 255, size=(3, 20, 10, 3), dtype=np.uint8)
+    for z, plane in enumerate(data):
+        iio.imwrite(str(tmp_path / f"{z}.png"), plane)
+    source, shape = ds.createDataSource(ImageSequence(tmp_path), True)
+    assert shape == (1, 10, 20, 3, 3)
+    assert_array_equal(source.request(np.s_[:, 4:5, :, :, :]).wait()[0, 0], data[:, :, 4].transpose(1, 0, 2))
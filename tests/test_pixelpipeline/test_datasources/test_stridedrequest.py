@@ -0,0 +1,88 @@
+import gc
+from unittest import mock
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from volumina.pixelpipeline.datasources import (
+    ArraySource,
+    ChannelSource,
+    ConstantSource,
+    HaloAdjustedDataSource,
+    MinMaxSource,
+    StridedRequest,
+    requestStrided,
+)
+from volumina.pixelpipeline.datasources.cachesource import CacheSource
+from volumina.utility.cache import KVCache
+
+
+class FullResolutionSource(ArraySource):
+    """A datasource without strided reads (like lazyflow)"""
+
+    supportsStep = False
+
+    def request(self, slicing):
+        return super().request(slicing)
+
+
+@pytest.fixture(autouse=True)
+def collect_datasources():
+    yield
+    # the datasources are QObjects: destroy them in the main thread, not in the
+    # worker threads of later tests
+    gc.collect()
+
+
+@pytest.fixture
+def data():
+    return np.random.randint(0, 255, size=(1, 30, 20, 5, 3), dtype=np.uint8)
+
+
+SLICING = np.s_[0:1, 3:28, 0:20, 1:4, 0:3]
+STEP = (1, 4, 3, 2, 1)
+
+
+def test_native(data):
+    source = ArraySource(data)
+    with mock.patch.object(source, "request", wraps=source.request) as request:
+        result = requestStrided(source, SLICING, STEP).wait()
+    request.assert_called_once_with(SLICING, STEP)
+    assert_array_equal(result, data[0:1, 3:28:4, 0:20:3, 1:4:2, 0:3])
+
+
+def test_fallback(data):
+    source = FullResolutionSource(data)
+    req = requestStrided(source, SLICING, STEP)
+    assert isinstance(req, StridedRequest)
+    assert_array_equal(req.wait(), data[0:1, 3:28:4, 0:20:3, 1:4:2, 0:3])
+    # without step, the request is passed on as is
+    assert_array_equal(requestStrided(source, SLICING, 1).wait(), data[SLICING])
+
+
+@pytest.mark.parametrize("raw", [ArraySource, FullResolutionSource])
+def test_wrappers(data, raw):
+    source = raw(data)
+    channel = ChannelSource(source, 1)
+    assert channel.supportsStep == source.supportsStep
+    assert_array_equal(channel.request(SLICING, STEP).wait(), data[0:1, 3:28:4, 0:20:3, 1:4:2, 1:2])
+
+    minmax = MinMaxSource(source)
+    assert_array_equal(minmax.request(SLICING, STEP).wait(), data[0:1, 3:28:4, 0:20:3, 1:4:2, 0:3])
+
+    halo = HaloAdjustedDataSource(source, halo_start_delta=(0, -1, 0, 0, 0), halo_stop_delta=(0, 1, 0, 0, 0))
+    assert_array_equal(halo.request(SLICING, STEP).wait(), data[0:1, 2:29:4, 0:20:3, 1:4:2, 0:3])
+
+
+def test_constant_source():
+    result = ConstantSource(7).request(SLICING, STEP).wait()
+    assert result.shape == (1, 7, 7, 2, 3)
+    assert (result == 7).all()
+
+
+def test_cache_source_keeps_steps_apart(data):
+    source = CacheSource(FullResolutionSource(data), cache=KVCache(2**20))
+    assert_array_equal(source.request(SLICING).wait(), data[SLICING])
+    assert_array_equal(source.request(SLICING, STEP).wait(), data[0:1, 3:28:4, 0:20:3, 1:4:2, 0:3])
+    assert_array_equal(source.request(SLICING).wait(), data[SLICING])
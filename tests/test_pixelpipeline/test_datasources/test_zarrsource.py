@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from volumina.pixelpipeline import datasources as ds
+
+zarr = pytest.importorskip("zarr")
+from volumina.pixelpipeline.datasources.zarrsource import ZarrSource  # noqa: E402
+
+
+@pytest.fixture
+def data():
+    return np.random.randint(0, 255, size=(2, 50, 40, 6), dtype=np.uint8)
+
+
+@pytest.fixture
+def zarr_path(tmp_path, data):
+    path = tmp_path / "volume.zarr"
+    array = zarr.open(str(path), mode="w", shape=data.shape, chunks=(1, 16, 16, 4), dtype=data.dtype)
+    array[:] = data
+    return path
+
+
+def test_create_from_zarr_array(zarr_path):
+    source, shape = ds.createDataSource(zarr.open(str(zarr_path), mode="r"), True)
+    assert isinstance(source, ZarrSource)
+    assert shape == (1, 2, 50, 40, 6)
+    assert source.chunkShape == (1, 1, 16, 16, 4)
+    assert source.dtype() == np.uint8
+    assert source.numberOfChannels == 6
+
+
+@pytest.mark.parametrize("chunkCacheBytes", [2**20, 0])
+@pytest.mark.parametrize(
+    "slicing",
+    [
+        np.s_[:, :, :, :, :],
+        np.s_[:, 1:2, 3:37, 10:11, 2:6],
+        np.s_[:, :, 1:50:4, 0:40:3, 5:6],
+    ],
+)
+def test_request(zarr_path, data, chunkCacheBytes, slicing):
+    with ThreadPoolExecutor(2) as executor:
+        source = ZarrSource(zarr_path, chunkCacheBytes=chunkCacheBytes, executor=executor)
+        assert_array_equal(source.request(slicing).wait(), data[None][slicing])
+
+
+def test_group_is_rejected(tmp_path):
+    zarr.open_group(str(tmp_path / "group.zarr"), mode="w")
+    with pytest.raises(ValueError):
+        ZarrSource(tmp_path / "group.zarr")
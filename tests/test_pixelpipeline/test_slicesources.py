@@ -34,3 +34,27 @@ class PlanarSliceSourceTest(ut.TestCase):
         self.a.setDirty(np.s_[1:2, :, 1:2, 127:128, 2:3])
         self.ss.isDirty.disconnect(check_mock)
         check_mock.assert_called_once_with(np.s_[:, 1:2])
+
+    def testStridedRequest(self):
+        self.ss.setThrough(0, 1)
+        self.ss.setThrough(2, 2)
+        self.ss.setThrough(1, 127)
+        self.assertTrue(self.ss.supportsStep)
+
+        sl = self.ss.request((slice(0, 3), slice(0, 3)), step=2).wait()
+        self.assertEqual(sl.shape, (3, 3))
+        expected = self.raw[1, 0:3:2, 0:3:2, 127, 2].repeat(2, axis=0).repeat(2, axis=1)[:3, :3]
+        np.testing.assert_array_equal(sl, expected)
+
+    def testStepIsPassedToDatasource(self):
+        with mock.patch.object(self.a, "request", wraps=self.a.request) as request:
+            self.ss.request((slice(0, 3), slice(0, 3)), step=4).wait()
+        request.assert_called_once_with(np.s_[0:1, 0:3, 0:3, 0:1, 0:1], (1, 4, 4, 1, 1))
+
+    def testStepIgnoredWithoutSupport(self):
+        with mock.patch.object(ArraySource, "supportsStep", False):
+            self.assertFalse(self.ss.supportsStep)
+            with mock.patch.object(self.a, "request", wraps=self.a.request) as request:
+                sl = self.ss.request((slice(0, 3), slice(0, 3)), step=2).wait()
+        request.assert_called_once_with(np.s_[0:1, 0:3, 0:3, 0:1, 0:1])
+        np.testing.assert_array_equal(sl, self.raw[0, 0:3, 0:3, 0, 0])
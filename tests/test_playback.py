@@ -0,0 +1,125 @@
+from unittest import mock
+
+import pytest
+
+from volumina.playback import TimeSeriesPlayer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePositionModel:
+    def __init__(self, n_times):
+        self.shape5D = (n_times, 10, 10, 10, 1)
+        self.time = 0
+
+
+class FakeScene:
+    def __init__(self):
+        self.ready = set()
+        self.readAheadTimes = []
+
+    def views(self):
+        return []
+
+    def cacheSize(self):
+        return 50
+
+    def isTimeReady(self, t):
+        return t in self.ready
+
+    def setReadAheadTimes(self, times):
+        self.readAheadTimes = list(times)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scene():
+    return FakeScene()
+
+
+@pytest.fixture
+def posModel():
+    return FakePositionModel(n_times=20)
+
+
+@pytest.fixture
+def player(qapp, posModel, scene, clock):
+    player = TimeSeriesPlayer(posModel, [scene], clock=clock)
+    player.setBufferSize(4)
+    yield player
+    player.stop()
+
+
+def test_play_reads_ahead(player, scene):
+    player.play(fps=10)
+    assert player.isPlaying()
+    assert scene.readAheadTimes == [1, 2, 3, 4]
+
+
+def test_frames_are_shown_when_due_and_ready(player, scene, posModel, clock):
+    scene.ready = set(range(20))
+    player.play(fps=10)
+
+    clock.now = 0.05
+    player._onTick()
+    assert posModel.time == 0
+
+    clock.now = 0.1
+    player._onTick()
+    assert posModel.time == 1
+    assert scene.readAheadTimes == [2, 3, 4, 5]
+    assert player.droppedFrames() == 0
+    assert player.achievedFps() == pytest.approx(10)
+
+
+def test_frames_are_dropped_when_behind(player, scene, posModel, clock):
+    player.play(fps=10)
+
+    clock.now = 0.1
+    player._onTick()
+    assert posModel.time == 0  # frame 1 isn't ready, wait for it
+
+    scene.ready = {1, 2, 3}
+    clock.now = 0.35
+    player._onTick()
+    assert posModel.time == 3
+    assert player.droppedFrames() == 2
+    assert scene.readAheadTimes == [4, 5, 6, 7]
+
+
+def test_playback_loops(player, scene, posModel, clock):
+    scene.ready = set(range(20))
+    posModel.time = 18
+    player.play(fps=10)
+    assert scene.readAheadTimes == [19, 0, 1, 2]
+
+    clock.now = 0.2
+    player._onTick()
+    assert posModel.time == 0
+
+
+def test_playback_stops_at_end_without_loop(player, scene, posModel, clock):
+    scene.ready = set(range(20))
+    posModel.time = 18
+    player.play(fps=10, loop=False)
+    assert scene.readAheadTimes == [19]
+
+    playing = mock.Mock()
+    player.playingChanged.connect(playing)
+    clock.now = 0.5
+    player._onTick()
+    assert posModel.time == 19
+    player._onTick()
+    assert not player.isPlaying()
+    playing.assert_called_once_with(False)
+    assert scene.readAheadTimes == []
@@ -0,0 +1,112 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+import pytest
+
+from volumina.tiling.bowwave import BowWave, TIME_AXIS, SPACE_AXIS, CHANNEL_AXIS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def bowwave(clock):
+    return BowWave(max_depth=10, min_depth=1, lookahead=0.5, smoothing=0.0, idle_timeout=1.0, clock=clock)
+
+
+def scroll(bowwave, clock, axis, values, dt):
+    reversed_ = []
+    for v in values:
+        clock.now += dt
+        reversed_.append(bowwave.observe(axis, v))
+    return reversed_
+
+
+def test_no_prediction_without_movement(bowwave):
+    bowwave.observe(SPACE_AXIS, 5)
+    assert bowwave.depth() == 0
+    assert bowwave.upcoming(((TIME_AXIS, 0), (SPACE_AXIS, 5)), {TIME_AXIS: 1, SPACE_AXIS: 100}) == []
+
+
+def test_depth_scales_with_velocity(bowwave, clock):
+    scroll(bowwave, clock, SPACE_AXIS, [0, 1, 2], dt=0.5)
+    assert bowwave.velocity == pytest.approx(2.0)
+    assert bowwave.depth() == 1
+
+    scroll(bowwave, clock, SPACE_AXIS, [3, 4, 5], dt=0.05)
+    assert bowwave.velocity == pytest.approx(20.0)
+    assert bowwave.depth() == 10
+
+    assert bowwave.upcoming(((TIME_AXIS, 0), (SPACE_AXIS, 5)), {TIME_AXIS: 1, SPACE_AXIS: 100}) == [
+        (0, s) for s in range(6, 16)
+    ]
+
+
+def test_depth_is_clipped_to_volume(bowwave, clock):
+    scroll(bowwave, clock, SPACE_AXIS, [95, 96, 97], dt=0.05)
+    assert bowwave.upcoming(((TIME_AXIS, 0), (SPACE_AXIS, 97)), {TIME_AXIS: 1, SPACE_AXIS: 100}) == [(0, 98), (0, 99)]
+
+
+def test_idle_falls_back_to_min_depth(bowwave, clock):
+    scroll(bowwave, clock, SPACE_AXIS, [0, 1, 2], dt=0.05)
+    clock.now += 2.0
+    assert bowwave.velocity == 0.0
+    assert bowwave.depth() == 1
+
+
+def test_reversal(bowwave, clock):
+    assert scroll(bowwave, clock, SPACE_AXIS, [10, 11, 12], dt=0.125) == [False, True, False]
+    assert scroll(bowwave, clock, SPACE_AXIS, [11], dt=0.125) == [True]
+    assert bowwave.velocity == pytest.approx(-8.0)
+    assert bowwave.upcoming(((TIME_AXIS, 0), (SPACE_AXIS, 11)), {TIME_AXIS: 1, SPACE_AXIS: 100}) == [
+        (0, 10),
+        (0, 9),
+        (0, 8),
+        (0, 7),
+    ]
+
+
+@pytest.mark.parametrize("axis", [TIME_AXIS, CHANNEL_AXIS])
+def test_other_axes(bowwave, clock, axis):
+    scroll(bowwave, clock, SPACE_AXIS, [0, 1], dt=0.1)
+    assert scroll(bowwave, clock, axis, [0, 1], dt=0.1) == [False, True]
+    assert bowwave.axis == axis
+
+    through = ((TIME_AXIS, 1), (SPACE_AXIS, 1), (CHANNEL_AXIS, 1))
+    extents = {TIME_AXIS: 3, SPACE_AXIS: 100, CHANNEL_AXIS: 3}
+    expected = [1, 1, 1]
+    expected[axis] = 2
+    assert bowwave.upcoming(through, extents) == [tuple(expected)]
+
+
+def test_unsynced_axis_is_not_prefetched(bowwave, clock):
+    scroll(bowwave, clock, CHANNEL_AXIS, [0, 1], dt=0.1)
+    assert bowwave.upcoming(((TIME_AXIS, 0), (SPACE_AXIS, 5)), {TIME_AXIS: 1, SPACE_AXIS: 100, CHANNEL_AXIS: 3}) == []
@@ -22,11 +22,13 @@
 # time to wait (in seconds) for rendering to finish
 import pytest
 
+import time
 import unittest as ut
+from unittest import mock
 
 import numpy as np
 
-from qtpy.QtCore import QRectF, QPoint, QRect
+from qtpy.QtCore import QRectF, QPoint, QPointF, QRect
 from qtpy.QtGui import QTransform
 from qimage2ndarray import byte_view
 
@@ -69,6 +71,27 @@ class TilingTest(ut.TestCase):
         with self.assertRaises(AssertionError):
             t.data2scene = trans
 
+    def testContainsFMatchesRects(self):
+        # transposed, as for a view with swapped axes
+        t = Tiling((250, 130), data2scene=QTransform(0, 1, 1, 0, 0, 0), blockSize=50)
+        for point in [QPointF(0, 0), QPointF(50, 50), QPointF(49.9, 100), QPointF(129, 249.5), QPointF(131, 10)]:
+            expected = next((i for i, rect in enumerate(t.tileRectFs) if rect.contains(point)), None)
+            self.assertEqual(t.containsF(point), expected)
+
+    def testDataRects(self):
+        t = Tiling((250, 130), data2scene=QTransform(0, 1, 1, 0, 0, 0), blockSize=50)
+        for dataRect, imageRect in zip(t.dataRects, t.imageRects):
+            self.assertEqual(dataRect, t.scene2data.mapRect(imageRect))
+
+    def testHugeSliceIsLazy(self):
+        t = Tiling((100000, 100000), blockSize=256)
+        self.assertEqual(len(t), 391 * 391)
+        self.assertEqual(t.tileRects[-1], QRect(390 * 256, 390 * 256, 160, 160))
+
+        t.data2scene = QTransform().rotate(90)
+        self.assertEqual(t.containsF(QPointF(-300, 10)), 391)
+        self.assertEqual(t.imageRects[391], QRect(-512, 0, 256, 256))
+
 
 @pytest.mark.parametrize(
     "shape, trafo_scale, imageRect_shape, expected_tiles",
@@ -162,6 +185,145 @@ class TileProviderTest(ut.TestCase):
             self.assertTrue(np.all(aimg[:, :, 0:3] == self.GRAY2))
             self.assertTrue(np.all(aimg[:, :, 3] == 255))
 
+    def testAddRemoveLayerKeepsOtherTiles(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        rect = QRectF(100, 100, 200, 200)
+        tp.requestRefresh(rect)
+        tp.waitForTiles()
+        tile_no = tiling.intersected(rect)[0]
+        stack_id = self.sims.stackId
+
+        def cached(ims):
+            with tp._cache:
+                return tp._cache.layerTile(stack_id, ims, tile_no)
+
+        ds4 = ConstantSource(250)
+        layer4 = GrayscaleLayer(ds4, normalize=False)
+        ims4 = GrayscaleImageSource(PlanarSliceSource(ds4), layer4)
+        self.lsm.append(layer4)
+        self.sims.register(layer4, ims4)
+        assert cached(self.ims3) is not None
+        assert cached(ims4) is None
+
+        # only the new layer is fetched
+        with mock.patch.object(
+            GrayscaleImageSource, "request", autospec=True, side_effect=GrayscaleImageSource.request
+        ) as request:
+            tp.requestRefresh(rect)
+            tp.waitForTiles()
+        assert {call.args[0] for call in request.call_args_list} == {ims4}
+
+        self.sims.deregister(self.layer3)
+        assert cached(self.ims3) is None
+        assert cached(ims4) is not None
+
+    def testRequestRefreshDeadline(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        rect = QRectF(100, 100, 200, 200)
+        tile_nos = tiling.intersected(rect)
+
+        # an expired deadline still lets one dirty tile through, the rest is skipped
+        skipped = tp.requestRefresh(rect, deadline=0.0)
+        assert skipped == tile_nos[1:]
+
+        # already refreshed tiles don't count (once the fetched layer has been blended in)
+        first = QRectF(tiling.tileRects[tile_nos[0]])
+        tp.waitForTiles(first)
+        tp.requestRefresh(first)
+        tiles = list(tp.getTiles(rect, QRectF(), deadline=0.0))
+        assert [t.id for t in tiles if t.deferred] == tile_nos[2:]
+
+        assert tp.requestRefresh(rect) == []
+        tp.waitForTiles()
+        assert not any(t.deferred for t in tp.getTiles(rect, QRectF(), deadline=0.0))
+
+    def testCappedPrefetch(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        tp.max_prefetch_tasks = 0
+
+        rect = QRectF(100, 100, 200, 200)
+        assert tp.prefetch(rect, (0, 1), capped=True) == tiling.intersected(rect)
+        assert tp.prefetch(rect, (0, 1)) == []
+        # don't leave queued tasks behind for the render pool shutdown
+        timeout = time.time() + 10
+        while tp._prefetch_in_flight and time.time() < timeout:
+            time.sleep(0.01)
+
+    def testCancelPrefetch(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        fetched = []
+
+        stack_id = tp._stackIdAt((0, 1))
+        task = tp._prefetchTask(lambda: fetched.append(1), stack_id, 0)
+        assert tp._prefetch_in_flight == 1
+        assert tp._isPrefetching(stack_id, 0)
+        tp.cancelPrefetch()
+        assert not tp._isPrefetching(stack_id, 0)
+        task()
+        assert fetched == []
+        assert tp._prefetch_in_flight == 0
+
+        tp._prefetchTask(lambda: fetched.append(2), stack_id, 0)()
+        assert fetched == [2]
+        assert not tp._isPrefetching(stack_id, 0)
+
+    def testResumedPrefetchSkipsTilesInFlight(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        tp.max_prefetch_tasks = 2
+        rect = QRectF(100, 100, 200, 200)
+
+        with mock.patch("volumina.tiling.tileprovider.submit_to_threadpool") as submit:
+            skipped = tp.prefetch(rect, (0, 1), capped=True)
+            assert skipped
+            tp.max_prefetch_tasks = 100
+            assert tp.prefetch(rect, (0, 1), capped=True) == []
+
+        submitted = [call.args[4] for call in submit.call_args_list]
+        assert sorted(set(submitted)) == tiling.intersected(rect)
+        # the tiles started by the first call were not submitted again
+        assert len(submitted) == len(set(submitted))
+        for call in submit.call_args_list:
+            call.args[0]()
+        assert tp._prefetch_in_flight == 0
+
+    def testReadAhead(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        rect = QRectF(100, 100, 200, 200)
+
+        assert not tp.isStackReady(rect, (0, 1))
+        tp.setReadAhead(rect, [(0, 1)])
+        timeout = time.time() + 10
+        while not tp.isStackReady(rect, (0, 1)) and time.time() < timeout:
+            time.sleep(0.01)
+        assert tp.isStackReady(rect, (0, 1))
+
+        # stacks that are read ahead already are not prefetched again
+        with mock.patch.object(tp, "prefetch") as prefetch:
+            tp.setReadAhead(rect, [(0, 1), (0, 2)])
+        prefetch.assert_called_once_with(rect, (0, 2))
+
+    def testPrefetchingStacksAreKept(self):
+        tiling = Tiling((900, 400), blockSize=100)
+        tp = TileProvider(tiling, self.sims)
+        rect = QRectF(100, 100, 200, 200)
+
+        tp.setPrefetching([(0, 1), (0, 2)])
+        with mock.patch("volumina.tiling.tileprovider.clear_non_relevant_tasks_from_queue") as clear:
+            list(tp.getTiles(rect, rect))
+        assert sorted(clear.call_args.args[3]) == [tp._stackIdAt((0, 1)), tp._stackIdAt((0, 2))]
+
+        tp.cancelPrefetch()
+        with mock.patch("volumina.tiling.tileprovider.clear_non_relevant_tasks_from_queue") as clear:
+            list(tp.getTiles(rect, rect))
+        assert list(clear.call_args.args[3]) == []
+        tp.waitForTiles()
+
 
 @pytest.mark.usefixtures("qapp", "patch_threadpool")
 class DirtyPropagationTest(ut.TestCase):
@@ -274,5 +436,37 @@ class DirtyPropagationTest(ut.TestCase):
             self.assertTrue(np.any(aimg[:, :, 0:3] == 99))
 
 
+@pytest.mark.usefixtures("qapp", "patch_threadpool")
+class OrientationTest(ut.TestCase):
+    def setUp(self):
+        x, y = np.indices((300, 200))
+        data = ((x + 3 * y) % 256).astype(np.uint8).reshape((1, 300, 200, 1, 1))
+        self.lsm = LayerStackModel()
+        self.lsm.append(GrayscaleLayer(ArraySource(data), normalize=False))
+        self.pump = ImagePump(self.lsm, SliceProjection(), sync_along=(0, 1, 2))
+
+    def _tiles(self, tp):
+        tp.requestRefresh(QRectF())
+        tp.waitForTiles()
+        return {tile.id: byte_view(tile.qimg).copy() for tile in tp.getTiles(QRectF(), QRectF())}
+
+    def testRotateWithoutRefetching(self):
+        # rotated by 90 degrees, as in ImageScene2D.rot90
+        rotated = QTransform().rotate(90) * QTransform.fromTranslate(200, 0)
+
+        tp = TileProvider(Tiling((300, 200), blockSize=100), self.pump.stackedImageSources)
+        self._tiles(tp)
+        tp.tiling.data2scene = rotated
+        with mock.patch.object(GrayscaleImageSource, "request") as request:
+            tp._onOrientationChanged()
+            tiles = self._tiles(tp)
+        request.assert_not_called()
+
+        expected = self._tiles(TileProvider(Tiling((300, 200), rotated, blockSize=100), self.pump.stackedImageSources))
+        assert sorted(tiles) == sorted(expected)
+        for tile_id, img in tiles.items():
+            assert np.array_equal(img, expected[tile_id])
+
+
 if __name__ == "__main__":
     ut.main()
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from volumina.utility.edge_coords import edge_coords_along_axis, group_by_id_pairs
+
+
+def _edge_coords_loop(label_img, axis):
+    """Reference implementation: a Python loop over all pixel pairs"""
+    grouped = defaultdict(list)
+    for coord in np.ndindex(*label_img.shape):
+        neighbor = list(coord)
+        neighbor[axis] += 1
+        if neighbor[axis] >= label_img.shape[axis]:
+            continue
+        a, b = label_img[coord], label_img[tuple(neighbor)]
+        if a != b:
+            grouped[(min(a, b), max(a, b))].append(coord)
+    return grouped
+
+
+@pytest.mark.parametrize("axis", [0, 1, -1])
+def test_edge_coords_along_axis(axis):
+    label_img = np.random.RandomState(0).randint(0, 5, (20, 30)).astype(np.uint32)
+    expected = _edge_coords_loop(label_img, axis % 2)
+
+    grouped = edge_coords_along_axis(label_img, axis)
+    assert sorted(grouped) == sorted(expected)
+    for id_pair, coords in grouped.items():
+        np.testing.assert_array_equal(coords, expected[id_pair])
+
+
+def test_edge_coords_along_flat_axis():
+    assert edge_coords_along_axis(np.zeros((1, 5), dtype=np.uint32), 0) == {}
+
+
+def test_group_by_id_pairs_returns_views():
+    ids = np.array([[2, 3], [1, 2], [2, 3], [1, 2]])
+    values = np.arange(4)
+    grouped = group_by_id_pairs(ids, values)
+    assert list(grouped) == [(1, 2), (2, 3)]
+    np.testing.assert_array_equal(grouped[(1, 2)], [1, 3])
+    np.testing.assert_array_equal(grouped[(2, 3)], [0, 2])
+    assert grouped[(1, 2)].base is grouped[(2, 3)].base
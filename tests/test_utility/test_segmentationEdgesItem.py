@@ -0,0 +1,209 @@
+import threading
+from unittest import mock
+
+import numpy as np
+import pytest
+from qtpy.QtCore import QPointF, QRectF, Qt
+from qtpy.QtGui import QColor, QImage, QPainter, QPen
+from qtpy.QtWidgets import QGraphicsScene, QGraphicsView
+
+from volumina.layer import SegmentationEdgesLayer
+from volumina.pixelpipeline.datasources import ArraySource
+from volumina.pixelpipeline.imagesources import segmentationedges
+from volumina.utility.edge_coords import edge_coords_nd
+from volumina.utility import SignalingDict
+from volumina.utility.segmentationEdgesItem import (
+    BatchedSegmentationEdgesItem,
+    EdgePickingIndex,
+    SegmentationEdgesItem,
+    line_segments_for_labels,
+    line_segments_for_labels_PURE_PYTHON,
+    line_segments_from_edge_coords,
+    path_items_from_line_segments,
+)
+from volumina.utility.thunkEvent import GlobalThunkEventProcessor, MainThreadUnavailable
+
+
+@pytest.fixture
+def labels():
+    labels = np.ones((6, 5), dtype=np.uint32)
+    labels[3:, :] = 2
+    labels[:3, 3:] = 3
+    return labels
+
+
+def test_line_segments_for_labels(labels):
+    segments = line_segments_for_labels(labels)
+    assert sorted(segments) == [(1, 2), (1, 3), (2, 3)]
+    assert segments[(1, 2)].shape == (3, 2, 2)
+    assert segments[(1, 3)].shape == (3, 2, 2)
+    assert segments[(2, 3)].shape == (2, 2, 2)
+
+
+def test_request_builds_geometry_in_worker_thread(qtbot, labels):
+    layer = SegmentationEdgesLayer(ArraySource(labels))
+    arrayreq = mock.Mock()
+    arrayreq.wait.return_value = labels
+    request = segmentationedges.SegmentationEdgesItemRequest(arrayreq, layer, None, None)
+
+    geometry_threads = []
+
+    def recording(label_img):
+        geometry_threads.append(threading.current_thread())
+        return line_segments_for_labels(label_img)
+
+    result = []
+    with mock.patch.object(segmentationedges, "line_segments_for_labels", recording):
+        worker = threading.Thread(target=lambda: result.append(request.wait()))
+        worker.start()
+        qtbot.waitUntil(lambda: bool(result))
+        worker.join()
+
+    assert geometry_threads == [worker]
+    assert isinstance(result[0], SegmentationEdgesItem)
+    assert sorted(result[0].path_items) == [(1, 2), (1, 3), (2, 3)]
+
+
+def test_execute_in_main_thread_fails_when_quitting(qtbot):
+    processor = GlobalThunkEventProcessor()
+    results = []
+
+    def run():
+        try:
+            results.append(processor.execute(lambda: 42))
+            processor._handleAboutToQuit()
+            processor.execute(lambda: 43)
+        except MainThreadUnavailable as e:
+            results.append(e)
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    qtbot.waitUntil(lambda: len(results) == 2)
+    worker.join()
+
+    assert results[0] == 42
+    assert isinstance(results[1], MainThreadUnavailable)
+
+
+def test_line_segments_match_edge_coords():
+    labels = np.random.RandomState(1).randint(0, 4, (16, 16)).astype(np.uint32)
+    x_axis_edge_coords, y_axis_edge_coords = edge_coords_nd(labels)
+    segments = line_segments_for_labels_PURE_PYTHON(labels)
+    assert set(segments) == set(x_axis_edge_coords) | set(y_axis_edge_coords)
+    for id_pair, line_segments in segments.items():
+        expected = line_segments_from_edge_coords(
+            y_axis_edge_coords.get(id_pair, []), x_axis_edge_coords.get(id_pair, [])
+        )
+        assert sorted(map(repr, line_segments.tolist())) == sorted(map(repr, expected.tolist()))
+
+
+def test_picking_index(labels):
+    segments = line_segments_for_labels(labels)
+    index = EdgePickingIndex(labels, segments.keys())
+    assert index.id_at(2.5, 1.5) == (1, 2)
+    assert index.id_at(2.5, 0.5) == (1, 2)
+    assert index.id_at(3.5, 0.5) == (1, 2)
+    assert index.id_at(0.5, 0.5) is None
+    assert index.id_at(-1, 0) is None and index.id_at(0, 100) is None
+    assert index.ids_along(0.5, 0.5, 5.5, 0.5) == [(1, 2)]
+    assert index.ids_along(0.5, 1.5, 0.5, 4.5) == [(1, 3)]
+
+
+def test_batched_item(qtbot, labels):
+    pen_table = SignalingDict(None)
+    default_pen = QPen(Qt.white)
+    segments = line_segments_for_labels(labels)
+    item = BatchedSegmentationEdgesItem(
+        segments, EdgePickingIndex(labels, segments.keys()), pen_table, default_pen, isClickable=True
+    )
+    assert len(item._paths) == 1
+
+    pen_table[(1, 3)] = QPen(Qt.red)
+    assert len(item._paths) == 2
+    assert item._groups[item._pen_key(QPen(Qt.red))] == {(1, 3)}
+
+    clicked = []
+    item.edgeClicked.connect(lambda id_pair, event: clicked.append(id_pair))
+    event = mock.Mock()
+    event.pos.return_value = QPointF(0.5, 2.5)
+    item.mousePressEvent(event)
+    assert clicked == [(1, 3)]
+
+    event.pos.return_value = QPointF(0.5, 0.5)
+    item.mousePressEvent(event)
+    event.ignore.assert_called_once()
+    assert item.contains(QPointF(0.5, 2.5)) and not item.contains(QPointF(0.5, 0.5))
+
+
+def test_batched_item_paints(qtbot, labels):
+    segments = line_segments_for_labels(labels)
+    item = BatchedSegmentationEdgesItem(
+        segments, EdgePickingIndex(labels, segments.keys()), SignalingDict(None), QPen(Qt.red)
+    )
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    image = QImage(60, 50, QImage.Format_ARGB32)
+    image.fill(Qt.black)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(0, 0, 60, 50), QRectF(0, 0, 6, 5))
+    painter.end()
+    assert QColor(image.pixel(30, 5)) == QColor(Qt.red)
+
+
+def test_item_picks_edges_through_index(qtbot, labels):
+    pen_table = SignalingDict(None)
+    segments = line_segments_for_labels(labels)
+    path_items = path_items_from_line_segments(pen_table, QPen(Qt.white), segments, isClickable=True)
+    item = SegmentationEdgesItem(
+        path_items,
+        pen_table,
+        QPen(Qt.white),
+        isClickable=True,
+        picking_index=EdgePickingIndex(labels, segments.keys()),
+    )
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    # the edges are hit-tested by the parent only
+    assert scene.items(QPointF(0.5, 2.5)) == [item]
+    assert scene.items(QPointF(0.5, 0.5)) == []
+
+    clicked, swiped = [], []
+    item.edgeClicked.connect(lambda id_pair, event: clicked.append(id_pair))
+    item.edgeSwiped.connect(lambda id_pair, event: swiped.append(id_pair))
+    event = mock.Mock()
+    event.pos.return_value = QPointF(0.5, 2.5)
+    item.mousePressEvent(event)
+    assert clicked == [(1, 3)]
+
+    event.buttons.return_value = Qt.LeftButton
+    event.lastScenePos.return_value = QPointF(0.5, 0.5)
+    event.scenePos.return_value = QPointF(5.5, 0.5)
+    item.mouseMoveEvent(event)
+    assert swiped == [(1, 2)]
+
+
+def test_picking_index_radius():
+    labels = np.ones((20, 20), dtype=np.uint32)
+    labels[10:, :] = 2
+    segments = line_segments_for_labels(labels)
+    index = EdgePickingIndex(labels, segments.keys())
+    assert index.id_at(5.5, 5.5) is None
+    assert index.id_at(5.5, 5.5, radius=4) == (1, 2)
+    assert index.id_at(5.5, 5.5, radius=3) is None
+    assert index.ids_along(5.5, 0.5, 5.5, 19.5) == []
+    assert index.ids_along(5.5, 0.5, 5.5, 19.5, radius=4) == [(1, 2)]
+
+
+def test_item_picks_within_screen_radius(qtbot, labels):
+    segments = line_segments_for_labels(labels)
+    item = BatchedSegmentationEdgesItem(
+        segments, EdgePickingIndex(labels, segments.keys()), SignalingDict(None), QPen(Qt.white), isClickable=True
+    )
+    assert item._pick_radius() == 0
+
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    view = QGraphicsView(scene)
+    qtbot.addWidget(view)
+    view.scale(0.25, 0.25)
+    assert item._pick_radius() == pytest.approx(item.PICK_RADIUS * 4)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from volumina.utility.simplify_line_segments import (
+    chain_line_segments,
+    douglas_peucker,
+    simplify_grouped_line_segments,
+    simplify_line_segments,
+)
+from volumina.utility.segmentationEdgesItem import line_segments_for_labels_PURE_PYTHON
+
+
+def _segment_set(segments):
+    return {tuple(sorted(map(tuple, segment))) for segment in np.asarray(segments, dtype=float).tolist()}
+
+
+def test_chain_line_segments():
+    # a path 0-1-2-3 branching at 2 to (2, 1), and a separate unit square
+    lines = [((0, 0), (1, 0)), ((2, 0), (1, 0)), ((2, 0), (3, 0)), ((2, 0), (2, 1))]
+    lines += [((5, 5), (6, 5)), ((6, 5), (6, 6)), ((6, 6), (5, 6)), ((5, 6), (5, 5))]
+    lines = np.array(lines)[np.random.RandomState(0).permutation(len(lines))]
+    points, offsets, _ = chain_line_segments(lines)
+
+    chains = [points[start:stop].tolist() for start, stop in zip(offsets[:-1], offsets[1:])]
+    assert len(chains) == 4
+    assert sorted(len(chain) for chain in chains) == [2, 2, 3, 5]
+    loop = next(chain for chain in chains if len(chain) == 5)
+    assert loop[0] == loop[-1]
+    segments = [(chain[i], chain[i + 1]) for chain in chains for i in range(len(chain) - 1)]
+    assert _segment_set(segments) == _segment_set(lines)
+
+
+def test_douglas_peucker():
+    points = np.array([(0, 0), (1, 0), (2, 0), (3, 1), (4, 0), (0, 0), (1, 0.5), (2, 0)], dtype=float)
+    offsets = np.array([0, 5, 8])
+    assert douglas_peucker(points, offsets, 0.0).tolist() == [1, 0, 1, 1, 1, 1, 1, 1]
+    assert douglas_peucker(points, offsets, 1.0).tolist() == [1, 0, 0, 0, 1, 1, 0, 1]
+
+
+def test_simplify_line_segments():
+    lines = [((x, 0), (x + 1, 0)) for x in range(10)] + [((10, 0), (10, 1))]
+    simplified = simplify_line_segments(lines, 0.0)
+    assert len(simplified) == 1
+    assert simplified[0].tolist() in ([[0, 0], [10, 0], [10, 1]], [[10, 1], [10, 0], [0, 0]])
+
+
+def test_groups_are_not_merged():
+    lines = [((x, 0), (x + 1, 0)) for x in range(4)]
+    segments, groups = simplify_grouped_line_segments(lines, [1, 1, 0, 0], 0.0)
+    assert groups.tolist() == [0, 1]
+    assert _segment_set(segments) == _segment_set([((2, 0), (4, 0)), ((0, 0), (2, 0))])
+
+
+def test_simplified_line_segments_for_labels():
+    labels = np.ones((20, 20), dtype=np.uint32)
+    labels[5:15, 5:15] = 2
+    labels[16:, :] = 3
+    segments = line_segments_for_labels_PURE_PYTHON(labels)
+    simplified = line_segments_for_labels_PURE_PYTHON(labels, simplify_with_tolerance=0.0)
+    assert sorted(simplified) == sorted(segments)
+    # the square becomes its sides (the loop may start in the middle of one), the straight edge a single segment
+    square = simplified[(1, 2)]
+    assert len(square) <= 5
+    assert np.linalg.norm(square[:, 1] - square[:, 0], axis=1).sum() == 40
+    assert len(simplified[(1, 3)]) == 1
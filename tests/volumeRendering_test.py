@@ -0,0 +1,112 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+volumeRendering = pytest.importorskip("volumina.view3d.volumeRendering", exc_type=ImportError)
+
+
+@pytest.fixture
+def manager():
+    with mock.patch.object(volumeRendering.RenderingManager, "update"):
+        manager = volumeRendering.RenderingManager(mock.Mock(), mesh_cache=volumeRendering.MeshCache())
+        manager.setup((10, 12, 14))
+        yield manager
+
+
+def _present(manager):
+    return set(np.flatnonzero(manager._label_counts)) - {0}
+
+
+def test_label_index_tracks_full_updates(manager):
+    volume = np.zeros((10, 12, 14), dtype=np.uint8)
+    volume[1:4, 2:5, 3:6] = 1
+    volume[6:9, 6:10, 8:12] = 2
+    manager.volume = (volume, {1: 1, 2: 2})
+
+    assert _present(manager) == {1, 2}
+    assert manager._label_bboxes[1] == np.s_[3:6, 2:5, 1:4]  # transposed
+    assert manager.update.call_count == 1
+
+    volume[1:4, 2:5, 3:6] = 0
+    manager.volume = (volume, {1: 1, 2: 2})
+    assert _present(manager) == {2}
+    assert 1 not in manager._label_bboxes
+
+
+def test_roi_update(manager):
+    volume = np.zeros((10, 12, 14), dtype=np.uint8)
+    volume[1:4, 2:5, 3:6] = 1
+    manager.volume = (volume, {1: 1, 2: 2})
+    key = manager._label_keys[1] = "key of label 1"
+
+    manager.setVolumeRoi(np.s_[6:9, 6:10, 8:12], np.full((3, 4, 4), 2, dtype=np.uint8), {1: 1, 2: 2})
+    assert _present(manager) == {1, 2}
+    assert manager._label_bboxes[2] == np.s_[8:12, 6:10, 6:9]
+    # label 1 is unchanged, its mesh key is kept
+    assert manager._label_keys[1] == key
+
+    # shrink label 1
+    manager.setVolumeRoi(np.s_[1:2, :, :], np.zeros((1, 12, 14), dtype=np.uint8), {1: 1, 2: 2})
+    assert manager._label_bboxes[1] == np.s_[3:6, 2:5, 2:4]
+    assert 1 not in manager._label_keys
+    np.testing.assert_array_equal(manager.volume[1], 0)
+
+
+def test_unchanged_roi_does_not_update(manager):
+    manager.setVolumeRoi(np.s_[0:2, 0:2, 0:2], np.zeros((2, 2, 2), dtype=np.uint8), {})
+    manager.update.assert_not_called()
+
+
+def test_stale_mesh_is_not_cached(manager):
+    volume = np.zeros((10, 12, 14), dtype=np.uint8)
+    volume[1:4, 2:5, 3:6] = 1
+    manager.volume = (volume, {1: 1})
+    manager._label_keys[1] = "new key"
+    manager.setColor(1, (1.0, 0.0, 0.0))
+    mesh = mock.Mock(opts={"meshdata": "mesh"})
+
+    manager._on_mesh_generated(1, mesh, "old key")
+    assert manager._mesh_cache.get("old key") is None
+    manager._overview_scene.add_object.assert_not_called()
+
+    manager._on_mesh_generated(1, mesh, "new key")
+    assert manager._mesh_cache.get("new key") == "mesh"
+    manager._overview_scene.add_object.assert_called_once_with(1, mesh)
+
+
+def test_meshes_are_generated_from_a_snapshot():
+    scene = mock.Mock()
+    scene.get_visible_objects.return_value = set()
+    scene.has_object.return_value = False
+    manager = volumeRendering.RenderingManager(scene, mesh_cache=volumeRendering.MeshCache(), lod_levels=None)
+    manager.setup((10, 12, 14))
+    volume = np.zeros((10, 12, 14), dtype=np.uint8)
+    volume[1:4, 2:5, 3:6] = 1
+
+    with mock.patch.object(volumeRendering, "MeshGenerator") as generator:
+        manager.volume = (volume, {1: 1})
+        first = manager._mesh_thread
+        (_, labeling, labels, _), kwargs = generator.call_args
+        assert labels == [1]
+        assert kwargs["keys"] == {1: manager._label_keys[1]}
+        # the bounding box of label 1 (transposed), padded by one voxel
+        assert kwargs["origin"] == [2, 1, 0]
+        assert labeling.shape == (5, 5, 5)
+        assert not np.shares_memory(labeling, manager._volume)
+
+        volume[1:4, 2:5, 3:6] = 0
+        volume[5, 5, 5] = 1
+        manager.volume = (volume, {1: 1})
+        first.cancel.assert_called_once_with()
+        assert kwargs["keys"] != generator.call_args[1]["keys"]
+
+
+def test_levels_of_detail_are_opt_in(monkeypatch):
+    manager = volumeRendering.RenderingManager(mock.Mock(), mesh_cache=volumeRendering.MeshCache())
+    assert manager._lod_levels is None
+
+    monkeypatch.setenv("VOLUMINA_MESH_LEVELS_OF_DETAIL", "1")
+    monkeypatch.setattr(volumeRendering, "CONFIG", volumeRendering.CONFIG.__class__(volumeRendering.CONFIG._cfg))
+    manager = volumeRendering.RenderingManager(mock.Mock(), mesh_cache=volumeRendering.MeshCache())
+    assert manager._lod_levels == volumeRendering.DEFAULT_LOD_LEVELS
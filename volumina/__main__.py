@@ -1,17 +1,24 @@
 import argparse
 import contextlib
+import os
 import signal
 import sys
 
 import numpy
-import xarray
 from qtpy.QtWidgets import QApplication
 
 from volumina import __version__
 from volumina.api import Viewer
 from volumina.colortables import default16_new
-from volumina.pixelpipeline.datasources import ArraySinkSource, ArraySource
-from volumina.layer import ColortableLayer, GrayscaleLayer
+from volumina.pixelpipeline.datasources import ChannelSource, createDataSource
+from volumina.pixelpipeline.datasources.chunkedarray import ChunkedArray5D
+from volumina.pixelpipeline.datasources.imagesequence import ImageSequence
+from volumina.layer import ColortableLayer, GrayscaleLayer, RGBALayer
+
+LAYER_TYPES = ("grayscale", "colortable", "rgba")
+H5_EXTENSIONS = (".h5", ".hdf5", ".hdf")
+ZARR_EXTENSIONS = (".zarr", ".n5")
+TIFF_EXTENSIONS = (".tif", ".tiff")
 
 
 @contextlib.contextmanager
@@ -42,39 +49,144 @@ def axiorder_type(value):
     return value
 
 
-def parse_args():
+def parse_args(argv=None):
     p = argparse.ArgumentParser(
-        description="",
-        usage="",
-        epilog="",
+        description="Show images in volumina, one layer per input. All inputs are read lazily.",
+        epilog="Options that can be repeated are given either once for all inputs, or once per input.",
+    )
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="input",
+        help="Image to show: .npy file, HDF5 dataset (file.h5/path/to/dataset, the dataset can be omitted "
+        "if it is the only one), zarr array or N5 dataset (volume.zarr/array, volume.n5/dataset) "
+        "TIFF stack (.tif), or sequence of 2D images along z: a directory or a quoted pattern "
+        "('slices/*.png'; --axistags tyx to stack them along t instead)",
+    )
+    p.add_argument(
+        "--axistags",
+        action="append",
+        type=axiorder_type,
+        help="Strings describing axes in image. Valid values: 'tzyxc'. Guessed from the shape if omitted.",
     )
-    p.add_argument("image", help="Path to .npy image")
+    p.add_argument("--layer-type", action="append", choices=LAYER_TYPES, help="Layer to show the input in")
+    p.add_argument("--name", action="append", help="Layer name (default: the input path)")
+    p.add_argument("--cache-size", type=int, help="Number of slices each view keeps rendered")
     p.add_argument(
-        "--axistags", help="Strings describing axes in image. Valid values: 'tzyxc'", type=axiorder_type, required=True
+        "--chunk-cache",
+        type=float,
+        help="Megabytes of decompressed chunks kept per HDF5/zarr/TIFF input "
+        f"(default: {ChunkedArray5D.CHUNK_CACHE_BYTES / 2**20:g})",
     )
+    p.add_argument("--tile-width", type=int, help="Tile width at 100%% zoom")
     p.add_argument("--version", action="version", version=__version__)
 
-    args = p.parse_args()
+    args = p.parse_args(argv)
+    for option in ("axistags", "layer_type", "name"):
+        values = getattr(args, option)
+        if values is not None and len(values) not in (1, len(args.inputs)):
+            p.error(f"--{option.replace('_', '-')} must be given once, or once per input")
     return args
 
 
-def reorder_to_volumina(data, axistags):
-    tagged_data = xarray.DataArray(data, dims=tuple(axistags))
-
-    all_dims = {"t", "x", "y", "z", "c"}
-    add_dims = tuple(all_dims.difference(tagged_data.dims))
-    tagged_data_5d = tagged_data.expand_dims(add_dims).transpose("t", "x", "y", "z", "c")
-    return tagged_data_5d.data
-
-
-def main():
-    args = parse_args()
-    data = numpy.load(args.image)
-    reordered_data = reorder_to_volumina(data, args.axistags)
+def per_input(values, n, default=None):
+    """The value of a repeatable option for each of n inputs"""
+    if values is None:
+        return [default] * n
+    return values * n if len(values) == 1 else values
+
+
+def _split_container_path(path, extensions):
+    """Split path into the container (with one of the extensions) and the path within, or None"""
+    parts = path.rstrip(os.sep).split(os.sep)
+    for i, part in enumerate(parts):
+        if part.lower().endswith(extensions):
+            return os.sep.join(parts[: i + 1]), "/".join(parts[i + 1 :])
+    return None
+
+
+def open_input(path):
+    """
+    Open an image lazily: memory-mapped, or as h5py dataset, zarr array or
+    ImageSequence, which are read on demand.
+    """
+    if path.lower().endswith(".npy"):
+        return numpy.load(path, mmap_mode="r")
+
+    if any(c in path for c in "*?[") or (os.path.isdir(path) and _split_container_path(path, ZARR_EXTENSIONS) is None):
+        return ImageSequence(path)
+
+    if path.lower().endswith(TIFF_EXTENSIONS):
+        import tifffile
+        import zarr
+
+        return zarr.open(tifffile.imread(path, aszarr=True), mode="r")
+
+    if _split_container_path(path, ZARR_EXTENSIONS) is not None:
+        from volumina.pixelpipeline.datasources.zarrsource import openZarrArray
+
+        return openZarrArray(path)
+
+    container = _split_container_path(path, H5_EXTENSIONS)
+    if container is not None:
+        import h5py
+
+        filename, key = container
+        f = h5py.File(filename, "r")
+        if not key:
+            datasets = []
+            f.visititems(lambda name, obj: datasets.append(name) if isinstance(obj, h5py.Dataset) else None)
+            if len(datasets) != 1:
+                raise ValueError(f"Name one of the datasets in {filename}: {', '.join(datasets)}")
+            key = datasets[0]
+        return f[key]
+
+    raise ValueError(f"Don't know how to open {path}")
+
+
+def create_layer(source, shape, layer_type, name):
+    if layer_type == "colortable":
+        layer = ColortableLayer(source, default16_new)
+    elif layer_type == "rgba":
+        channels = [ChannelSource(source, c) if c < shape[-1] else None for c in range(4)]
+        layer = RGBALayer(*channels)
+    else:
+        layer = GrayscaleLayer(source)
+        layer.numberOfChannels = shape[-1]
+    layer.name = name
+    return layer
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.chunk_cache is not None:
+        ChunkedArray5D.CHUNK_CACHE_BYTES = int(args.chunk_cache * 2**20)
+
+    n = len(args.inputs)
+    layers = []
+    shape = None
+    for path, axistags, layer_type, name in zip(
+        args.inputs,
+        per_input(args.axistags, n),
+        per_input(args.layer_type, n, "grayscale"),
+        per_input(args.name, n),
+    ):
+        source, source_shape = createDataSource(open_input(path), True, axistags=axistags)
+        if shape is not None and tuple(source_shape[:-1]) != tuple(shape[:-1]):
+            sys.exit(f"{path} has shape {source_shape}, but {args.inputs[0]} has {shape} (txyzc)")
+        shape = source_shape
+        layers.append(create_layer(source, source_shape, layer_type, name or path))
 
     with volumina_viewer() as v:
-        v.addGrayscaleLayer(reordered_data, name="raw")
-        v.setWindowTitle(f"Volumina - {args.image}-{args.axistags}")
+        v.dataShape = shape
+        if args.tile_width is not None:
+            v.editor.setTileWidth(args.tile_width)
+        if args.cache_size is not None:
+            v.editor.cacheSize = args.cache_size
+        # like the Viewer.add*Layer methods: the last input on top
+        for layer in layers:
+            v.layerstack.append(layer)
+        v.setWindowTitle(f"Volumina - {', '.join(args.inputs)}")
         v.showMaximized()
 
 
@@ -29,6 +29,7 @@ default_config = """
 pixelpipeline_verbose: false
 show_3d_widget: true
 enable_fallback_viewports: false
+mesh_levels_of_detail: false
 """
 
 _cfg = configparser.ConfigParser()
@@ -57,6 +58,16 @@ class _Config:
     def enable_fallback_viewports(self):
         return self._get_boolean("volumina", "enable_fallback_viewports")
 
+    @cached_property
+    def mesh_levels_of_detail(self):
+        """Whether the 3D view meshes objects at several levels of detail (see view3d.lod)"""
+        return self._get_boolean("volumina", "mesh_levels_of_detail")
+
+    @cached_property
+    def mesh_cache_dir(self):
+        """Directory to persist the meshes of the 3D view in, or None"""
+        return self._cfg.get("volumina", "mesh_cache_dir", fallback="") or None
+
     @cached_property
     def cache_size(self):
         return self._cfg.getint("volumina", "cache_size", fallback=_256MB)
@@ -38,13 +38,20 @@ from qtpy.QtWidgets import (
 from qtpy.QtGui import QTransform, QPen, QColor, QBrush, QPolygonF, QPainter, QPainterPath
 
 from volumina.positionModel import PositionModel
-from volumina.tiling import Tiling, TileProvider
+from volumina.tiling import Tiling, TileProvider, adaptiveTileWidth
+from volumina.tiling.bowwave import BowWave, TIME_AXIS, SPACE_AXIS, CHANNEL_AXIS
 from volumina.layerstack import LayerStackModel
 from volumina.pixelpipeline.imagepump import StackedImageSources
 
 import datetime
+import logging
 import threading
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
+
+# Per-frame timings of ImageScene2D.drawBackground are logged here (at DEBUG level),
+# so that they can be enabled independently from the rest of the module's logging.
+frame_logger = logging.getLogger(__name__ + ".frames")
 
 
 # *******************************************************************************
@@ -127,6 +134,23 @@ class ImageScene2D(QGraphicsScene):
 
     axesChanged = Signal(int, bool)
     dirtyChanged = Signal()
+    # emitted with the new currentTileWidth() when re-tiling changes the tile width
+    tileWidthChanged = Signal(int)
+
+    # Default time (in seconds) drawBackground may spend per frame, see setFrameBudget
+    FRAME_BUDGET = 0.008
+
+    # While the user scrolls, upcoming slices are prefetched at this reduced resolution
+    # (every PREVIEW_STEP-th pixel). Full resolution follows once the slicing position settles.
+    PREVIEW_STEP = 4
+
+    # The tile width follows the zoom in steps of 2 (see setTileWidthAdaptive). It only changes when
+    # the zoom is this far (in powers of 2) from the current step, to not re-tile back and forth.
+    ZOOM_HYSTERESIS = 0.75
+
+    # Number of tile providers (with their caches) of other tile widths and steps
+    # that are kept, to zoom back without fetching the tiles again.
+    RETIRED_TILE_PROVIDERS = 2
 
     @property
     def is_swapped(self):
@@ -144,6 +168,8 @@ class ImageScene2D(QGraphicsScene):
     @stackedImageSources.setter
     def stackedImageSources(self, s):
         self._stackedImageSources = s
+        # they draw from the old image sources
+        self._retiredTileProviders.clear()
 
     @property
     def showTileOutlines(self):
@@ -237,7 +263,7 @@ class ImageScene2D(QGraphicsScene):
         self.scene2data, isInvertible = self.data2scene.inverted()
         self._setSceneRect()
         self._tiling.data2scene = self.data2scene
-        self._tileProvider._onSizeChanged()
+        self._tileProvider._onOrientationChanged()
         QGraphicsScene.invalidate(self, self.sceneRect())
 
     @property
@@ -296,37 +322,213 @@ class ImageScene2D(QGraphicsScene):
         self.reset()
 
     def tileWidth(self):
+        """The tile width at 100% zoom (see setTileWidthAdaptive)"""
         return self._tileWidth
 
+    def setTileWidthAdaptive(self, adaptive):
+        """
+        Scale the tile width along with the zoom of the view (in steps of 2), so that
+        tiles keep their size on the screen, and align the tiles to the native chunks
+        of the layers' datasources (see tiling.adaptiveTileWidth).
+        """
+        self._tileWidthAdaptive = adaptive
+        self._zoomLevel = 0
+        self._resetTiling()
+
+    def isTileWidthAdaptive(self):
+        return self._tileWidthAdaptive
+
+    def currentTileWidth(self):
+        """The tile width in use, in data pixels"""
+        return self._tiling.blockSize
+
+    def setZoomSubsampling(self, enabled):
+        """
+        When the view is zoomed out, fetch only every step-th pixel of the layers that
+        support it (see ImageSource.supportsStep), with a step small enough to keep
+        every screen pixel covered (see tileStep).
+        """
+        self._zoomSubsampling = enabled
+        self._resetTiling()
+
+    def zoomSubsampling(self):
+        return self._zoomSubsampling
+
+    def tileStep(self):
+        """The step at which tiles are fetched, 1 unless zoomed out (see setZoomSubsampling)"""
+        # the view is zoomed out by at least 2**(_zoomLevel - ZOOM_HYSTERESIS)
+        if not self._zoomSubsampling or self._zoomLevel < 2:
+            return 1
+        return 2 ** (self._zoomLevel - 1)
+
+    def _preferredTileWidth(self):
+        if not self._tileWidthAdaptive:
+            return self._tileWidth
+        return adaptiveTileWidth(self._tileWidth, self._zoomLevel, self._chunkWidths())
+
+    def _chunkWidths(self):
+        """The extents of the layers' native chunks in the slice plane"""
+        axes = [axis for axis in range(1, 4) if axis not in self._along]
+        widths = set()
+        for layer in self._stackedImageSources.getRegisteredLayers():
+            for datasource in layer.datasources:
+                chunkShape = getattr(datasource, "chunkShape", None)
+                if chunkShape is not None and len(chunkShape) == 5:
+                    widths.update(chunkShape[axis] for axis in axes)
+        return sorted(widths)
+
+    def _updateZoomLevel(self, view):
+        """Re-tile (deferred) if the zoom of the view moved on to another tile width"""
+        scale = math.sqrt(abs(view.transform().determinant()))
+        if scale == 0:
+            return
+        level = -math.log2(scale)
+        if abs(level - self._zoomLevel) > self.ZOOM_HYSTERESIS:
+            self._zoomLevel = round(level)
+            if self._preferredTileWidth() != self._tiling.blockSize or self.tileStep() != self._tileProvider.step:
+                self._retileTimer.start()
+
+    def _onRetileTimer(self):
+        self._resetTiling()
+        self.scheduleRepaint(QRectF())
+
+    def setFrameBudget(self, seconds):
+        """
+        Set the time (in seconds) a single call to drawBackground may spend on
+        refreshing tiles. Work that does not fit is postponed to the next
+        iteration of the event loop. None or 0 disables the budget.
+        """
+        self._frameBudget = seconds
+
+    def frameBudget(self):
+        return self._frameBudget
+
     def setPrefetchingEnabled(self, enable):
         self._prefetching_enabled = enable
 
     def setPreemptiveFetchNumber(self, n):
+        """
+        Maximal number of slices to prefetch. How many slices are actually
+        prefetched depends on how fast the user scrolls (see BowWave).
+        """
         if n > self.cacheSize() - 1:
             self._n_preemptive = self.cacheSize() - 1
         else:
             self._n_preemptive = n
+        self._bowWave.max_depth = self._n_preemptive
 
     def preemptiveFetchNumber(self):
         return self._n_preemptive
 
+    def setReadAheadTimes(self, times):
+        """
+        Fetch the visible tiles at the given time points ahead of time
+        (see TimeSeriesPlayer). While reading ahead, time changes don't
+        drive the bow wave. Pass an empty list to stop.
+
+        Requires the layers to be synced along the time axis.
+        """
+        self._readAheadTimes = list(times)
+        if self._tileProvider is None:
+            return
+        throughs = [self._throughAtTime(t) for t in self._readAheadTimes]
+        self._tileProvider.setReadAhead(self._viewportRect(), [through for through in throughs if through is not None])
+
+    def isTimeReady(self, t):
+        """Whether the visible tiles at time point t can be shown without fetching"""
+        through = self._throughAtTime(t)
+        if self._tileProvider is None or through is None:
+            return True
+        return self._tileProvider.isStackReady(self._viewportRect(), through)
+
+    def _throughAtTime(self, t):
+        through = self._stackedImageSources.stackId[1]
+        if TIME_AXIS not in [axis for axis, _ in through]:
+            return None
+        return tuple(t if axis == TIME_AXIS else value for axis, value in through)
+
+    def _viewportRect(self):
+        if self.views():
+            return self.views()[0].viewportRect()
+        return QRectF()  # all tiles
+
     def invalidateViewports(self, sceneRectF):
         """Call invalidate on the intersection of all observing viewport-rects and rectF."""
         sceneRectF = sceneRectF if sceneRectF.isValid() else self.sceneRect()
         for view in self.views():
             QGraphicsScene.invalidate(self, sceneRectF.intersected(view.viewportRect()))
 
+    def scheduleRepaint(self, sceneRectF):
+        """
+        Like invalidateViewports, but deferred to the next iteration of the event loop.
+        All requests until then are merged into a single invalidation.
+        An invalid sceneRectF means the whole scene.
+        """
+        sceneRectF = sceneRectF if sceneRectF.isValid() else self.sceneRect()
+        if self._pendingRepaintRect is None:
+            self._pendingRepaintRect = QRectF(sceneRectF)
+        else:
+            self._pendingRepaintRect = self._pendingRepaintRect.united(sceneRectF)
+        if not self._repaintTimer.isActive():
+            self._repaintTimer.start()
+
+    def _onRepaintTimer(self):
+        rect, self._pendingRepaintRect = self._pendingRepaintRect, None
+        if rect is not None:
+            self.invalidateViewports(rect)
+
     def reset(self):
         """Reset rotations, tiling, etc. Called when first initialized
         and when the underlying data changes.
 
         """
         self.resetAxes(finish=False)
+        self._resetTiling(reuse=False)
 
-        self._tiling = Tiling(self._dataShape, self.data2scene, name=self.name, blockSize=self.tileWidth())
+    def _resetTiling(self, reuse=True):
+        """
+        (Re)create the tiling and the tile provider for the current data shape and tile width.
 
-        self._tileProvider = TileProvider(self._tiling, self._stackedImageSources)
-        self._tileProvider.sceneRectChanged.connect(self.invalidateViewports)
+        If reuse is set, the previous tile provider is kept for a while (see RETIRED_TILE_PROVIDERS)
+        and reused with its cache when its tile width and step are needed again.
+        Otherwise, all tile providers are replaced.
+        """
+        # the graphics items belong to the tiles of the old tiling
+        for items in self.tile_graphicsitems.values():
+            for item in items:
+                self.removeItem(item)
+        self.tile_graphicsitems.clear()
+        self._pendingGraphicsItems.clear()
+
+        cacheSize = self._tileProvider.cache_size if self._tileProvider is not None else None
+        oldTileWidth = self._tiling.blockSize if self._tileProvider is not None else None
+        if not reuse:
+            self._retiredTileProviders.clear()
+        elif self._tileProvider is not None:
+            self._retireTileProvider(self._tileProvider)
+
+        key = (self._preferredTileWidth(), self.tileStep())
+        tileProvider = self._retiredTileProviders.pop(key, None)
+        if tileProvider is not None:
+            self._tiling = tileProvider.tiling
+            self._tileProvider = tileProvider
+            if self._tiling.data2scene != self.data2scene:
+                # the view was rotated or its axes were swapped in the meantime
+                self._tiling.data2scene = self.data2scene
+                self._tileProvider._onOrientationChanged()
+        else:
+            self._tiling = Tiling(self._dataShape, self.data2scene, name=self.name, blockSize=key[0])
+            self._tileProvider = TileProvider(self._tiling, self._stackedImageSources, step=key[1])
+        if cacheSize is not None:
+            self._tileProvider.set_cache_size(cacheSize)
+        self._tileProvider.axesSwapped = self._swapped
+        self._tileProvider.sceneRectChanged.connect(self.scheduleRepaint)
+        self._tileProvider.prefetchCapacityAvailable.connect(self._onPrefetchCapacityAvailable)
+        self._lastPrefetch = None
+        if self._readAheadTimes:
+            self.setReadAheadTimes(self._readAheadTimes)
+        if self._tiling.blockSize != oldTileWidth:
+            self.tileWidthChanged.emit(self._tiling.blockSize)
 
         if self._dirtyIndicator:
             self.removeItem(self._dirtyIndicator)
@@ -335,6 +537,16 @@ class ImageScene2D(QGraphicsScene):
         self.addItem(self._dirtyIndicator)
         self._dirtyIndicator.setVisible(False)
 
+    def _retireTileProvider(self, tileProvider):
+        """Keep tileProvider (see _resetTiling), without it painting or prefetching for the scene"""
+        tileProvider.sceneRectChanged.disconnect(self.scheduleRepaint)
+        tileProvider.prefetchCapacityAvailable.disconnect(self._onPrefetchCapacityAvailable)
+        tileProvider.cancelPrefetch()
+        tileProvider.setReadAhead(QRectF(), [])
+        self._retiredTileProviders[(tileProvider.tiling.blockSize, tileProvider.step)] = tileProvider
+        while len(self._retiredTileProviders) > self.RETIRED_TILE_PROVIDERS:
+            self._retiredTileProviders.popitem(last=False)
+
     def mouseMoveEvent(self, event):
         """
         Normally our base class (QGraphicsScene) distributes mouse events to the
@@ -413,29 +625,62 @@ class ImageScene2D(QGraphicsScene):
         self._showTileProgress = False
 
         self._tileProvider = None
+        self._retiredTileProviders = OrderedDict()  # (tile width, step) -> TileProvider, see _resetTiling
         self._dirtyIndicator = None
         self._prefetching_enabled = False
 
+        # Frame budget (see drawBackground): repaint requests are coalesced
+        # into a single invalidation per event loop iteration, and work that
+        # does not fit into a frame is carried out in later iterations.
+        self._frameBudget = self.FRAME_BUDGET
+        self._pendingRepaintRect = None  # QRectF or None
+        self._repaintTimer = QTimer(self)
+        self._repaintTimer.setSingleShot(True)
+        self._repaintTimer.setInterval(0)
+        self._repaintTimer.timeout.connect(self._onRepaintTimer)
+
+        self._pendingGraphicsItems = {}  # [Tile.id] -> list(QGraphicsItems)
+        self._pendingPrefetch = []  # list of (sceneRectF, through, preview step)
+        self._lastPrefetch = None  # (stack id, sceneRectF, throughs, preview step) of the last bow wave
+        self._slicingSettled = True
+        self._bowWave = BowWave(max_depth=0)
+        self._readAheadTimes = []  # time points read ahead for a playback (see setReadAheadTimes)
+        self._deferredWorkTimer = QTimer(self)
+        self._deferredWorkTimer.setSingleShot(True)
+        self._deferredWorkTimer.setInterval(0)
+        self._deferredWorkTimer.timeout.connect(self._processDeferredWork)
+
+        # Adaptive tile width (see setTileWidthAdaptive) and subsampling (see setZoomSubsampling):
+        # the view is zoomed out by 2**_zoomLevel
+        self._tileWidthAdaptive = True
+        self._zoomSubsampling = True
+        self._zoomLevel = 0
+        self._retileTimer = QTimer(self)
+        self._retileTimer.setSingleShot(True)
+        self._retileTimer.setInterval(0)
+        self._retileTimer.timeout.connect(self._onRetileTimer)
+
+        # We manually keep track of the tile-wise QGraphicsItems that
+        # we've added to the scene in this dict, otherwise we would need
+        # to use O(N) lookups for every tile by calling QGraphicsScene.items()
+        self.tile_graphicsitems = defaultdict(set)  # [Tile.id] -> set(QGraphicsItems)
+
         self._swappedDefault = swapped_default
         self.reset()
 
         # BowWave preemptive caching
         self.setPreemptiveFetchNumber(preemptive_fetch_number)
-        self._course = (1, 1)  # (along, pos or neg direction)
-        self._time = self._posModel.time
-        self._channel = self._posModel.channel
+        self._bowWave.observe(TIME_AXIS, self._posModel.time)
+        self._bowWave.observe(SPACE_AXIS, self._posModel.slicingPos5D[self._along[1]])
+        self._bowWave.observe(CHANNEL_AXIS, self._posModel.channel)
         self._posModel.timeChanged.connect(self._onTimeChanged)
         self._posModel.channelChanged.connect(self._onChannelChanged)
         self._posModel.slicingPositionChanged.connect(self._onSlicingPositionChanged)
+        self._posModel.slicingPositionSettled.connect(self._onSlicingPositionSettled)
 
         self._allTilesCompleteEvent = threading.Event()
         self.dirty = False
 
-        # We manually keep track of the tile-wise QGraphicsItems that
-        # we've added to the scene in this dict, otherwise we would need
-        # to use O(N) lookups for every tile by calling QGraphicsScene.items()
-        self.tile_graphicsitems = defaultdict(set)  # [Tile.id] -> set(QGraphicsItems)
-
         self.last_drag_pos = None  # See mouseMoveEvent()
 
     def drawForeground(self, painter, rect):
@@ -483,13 +728,21 @@ class ImageScene2D(QGraphicsScene):
         if self.views():
             vp_rectF = self.views()[0].viewportRect()
             sceneRectF = vp_rectF.intersected(sceneRectF)
+            if self._tileWidthAdaptive or self._zoomSubsampling:
+                self._updateZoomLevel(self.views()[0])
 
         if not sceneRectF.isValid():
             return
 
-        tiles = self._tileProvider.getTiles(sceneRectF, vp_rectF)
+        frame_start = time.perf_counter()
+        deadline = frame_start + self._frameBudget if self._frameBudget else None
+
+        tiles = self._tileProvider.getTiles(sceneRectF, vp_rectF, deadline=deadline)
         allComplete = True
+        n_tiles = 0
+        n_deferred = 0
         for tile in tiles:
+            n_tiles += 1
             # We always draw the tile, even though it might not be up-to-date
             # In ilastik's live mode, the user sees the old result while adding
             # new brush strokes on top
@@ -498,17 +751,13 @@ class ImageScene2D(QGraphicsScene):
                 painter.drawImage(tile.rectF, tile.qimg)
 
             # The tile also contains a list of any QGraphicsItems that were produced by the layers.
-            # If there are any new ones, add them to the scene.
-            new_items = set(tile.qgraphicsitems) - self.tile_graphicsitems[tile.id]
-            obsolete_items = self.tile_graphicsitems[tile.id] - set(tile.qgraphicsitems)
-            for g_item in obsolete_items:
-                self.tile_graphicsitems[tile.id].remove(g_item)
-                self.removeItem(g_item)
-            for g_item in new_items:
-                self.tile_graphicsitems[tile.id].add(g_item)
-                self.addItem(g_item)
-
-            if tile.progress < 1.0:
+            # Adding them to (or removing them from) the scene is postponed until after the paint.
+            if set(tile.qgraphicsitems) != self.tile_graphicsitems[tile.id]:
+                self._pendingGraphicsItems[tile.id] = tile.qgraphicsitems
+
+            if tile.deferred:
+                n_deferred += 1
+            if tile.progress < 1.0 or tile.deferred:
                 allComplete = False
             if self._showTileProgress:
                 self._dirtyIndicator.setTileProgress(tile.id, tile.progress)
@@ -524,11 +773,76 @@ class ImageScene2D(QGraphicsScene):
                 self.dirtyChanged.emit()
             self._allTilesCompleteEvent.clear()
 
+        if n_deferred:
+            # Continue refreshing in the next frame
+            self.scheduleRepaint(sceneRectF)
+
         # preemptive fetching
         if self._prefetching_enabled:
-            upcoming_through_slices = self._bowWave(self._n_preemptive)
-            for through in upcoming_through_slices:
-                self._tileProvider.prefetch(sceneRectF, through, layer_indexes=None)
+            self._updatePrefetch(sceneRectF)
+
+        if self._pendingGraphicsItems or self._pendingPrefetch:
+            self._scheduleDeferredWork()
+
+        if frame_logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - frame_start
+            frame_logger.debug(
+                "%s: frame took %.2f ms (budget %s ms), %d tiles, %d deferred%s",
+                self.name,
+                elapsed * 1000.0,
+                "%.1f" % (self._frameBudget * 1000.0) if self._frameBudget else "-",
+                n_tiles,
+                n_deferred,
+                " [OVER BUDGET]" if deadline is not None and frame_start + elapsed > deadline else "",
+            )
+
+    def _scheduleDeferredWork(self):
+        if not self._deferredWorkTimer.isActive():
+            self._deferredWorkTimer.start()
+
+    def _processDeferredWork(self):
+        """
+        Carry out the work postponed by drawBackground (adding/removing the
+        tiles' QGraphicsItems and preemptive fetching), within the frame budget.
+        Whatever does not fit is rescheduled for the next iteration of the event loop.
+        """
+        start = time.perf_counter()
+        deadline = start + self._frameBudget if self._frameBudget else None
+
+        def in_budget():
+            return deadline is None or time.perf_counter() <= deadline
+
+        while self._pendingGraphicsItems and in_budget():
+            tile_id, items = self._pendingGraphicsItems.popitem()
+            self._updateTileGraphicsItems(tile_id, items)
+
+        while self._pendingPrefetch and in_budget() and not self._tileProvider.prefetchSaturated:
+            sceneRectF, through, preview = self._pendingPrefetch[0]
+            if not self._tileProvider.prefetch(sceneRectF, through, deadline=deadline, capped=True, preview=preview):
+                self._pendingPrefetch.pop(0)
+
+        # When the prefetch cap is reached, we wait for prefetchCapacityAvailable instead.
+        if self._pendingGraphicsItems or (self._pendingPrefetch and not self._tileProvider.prefetchSaturated):
+            self._scheduleDeferredWork()
+
+        frame_logger.debug(
+            "%s: deferred work took %.2f ms, %d tiles with graphics items and %d prefetches left",
+            self.name,
+            (time.perf_counter() - start) * 1000.0,
+            len(self._pendingGraphicsItems),
+            len(self._pendingPrefetch),
+        )
+
+    def _updateTileGraphicsItems(self, tile_id, qgraphicsitems):
+        # If there are any new items, add them to the scene.
+        new_items = set(qgraphicsitems) - self.tile_graphicsitems[tile_id]
+        obsolete_items = self.tile_graphicsitems[tile_id] - set(qgraphicsitems)
+        for g_item in obsolete_items:
+            self.tile_graphicsitems[tile_id].remove(g_item)
+            self.removeItem(g_item)
+        for g_item in new_items:
+            self.tile_graphicsitems[tile_id].add(g_item)
+            self.addItem(g_item)
 
     def triggerPrefetch(self, layer_indexes, time_range="current", spatial_axis_range="current", sceneRectF=None):
         """
@@ -600,37 +914,58 @@ class ImageScene2D(QGraphicsScene):
         else:
             self._allTilesCompleteEvent.wait()
 
-    def _bowWave(self, n):
-        through = [self._posModel.slicingPos5D[axis] for axis in self._along[:-1]]
-        t_max = [self._posModel.shape5D[axis] for axis in self._along[:-1]]
+    def _updatePrefetch(self, sceneRectF):
+        """
+        Queue the slices predicted by the bow wave for prefetching,
+        unless they have been queued already.
+        """
+        stack_id = self._stackedImageSources.stackId
+        extents = {axis: self._posModel.shape5D[self._along[axis]] for axis in (TIME_AXIS, SPACE_AXIS, CHANNEL_AXIS)}
+        upcoming = self._bowWave.upcoming(stack_id[1], extents)
 
-        BowWave = []
+        preview = 1 if self._slicingSettled else self.PREVIEW_STEP
 
-        a = self._course[0]
-        for d in range(1, n + 1):
-            m = through[a] + d * self._course[1]
-            if m < t_max[a] and m >= 0:
-                t = list(through)
-                t[a] = m
-                BowWave.append(tuple(t))
-        return BowWave
+        prefetch = (stack_id, sceneRectF.getRect(), tuple(upcoming), preview)
+        if prefetch == self._lastPrefetch:
+            return
+        self._lastPrefetch = prefetch
+        self._pendingPrefetch = [(QRectF(sceneRectF), through, preview) for through in upcoming]
+        # Keep the queued prefetch tasks when the visible tiles change, they are queued only once.
+        self._tileProvider.setPrefetching(upcoming)
+
+    def _cancelPrefetch(self):
+        self._pendingPrefetch = []
+        self._lastPrefetch = None
+        if self._tileProvider is not None:
+            self._tileProvider.cancelPrefetch()
+
+    def _onPrefetchCapacityAvailable(self):
+        if self._pendingPrefetch:
+            self._scheduleDeferredWork()
+
+    def _observeMovement(self, axis, value):
+        if self._bowWave.observe(axis, value):
+            # The user changed direction (or axis), slices in the old direction are not needed anymore.
+            self._cancelPrefetch()
 
     def _onSlicingPositionChanged(self, new, old):
-        if (new[self._along[1] - 1] - old[self._along[1] - 1]) < 0:
-            self._course = (1, -1)
-        else:
-            self._course = (1, 1)
+        spatial = self._along[1] - 1
+        if new[spatial] != old[spatial]:
+            self._observeMovement(SPACE_AXIS, new[spatial])
+
+    def _onSlicingPositionSettled(self, settled):
+        self._slicingSettled = settled
+        if settled and self._prefetching_enabled and self._lastPrefetch is not None:
+            # Refine the previews of the upcoming slices
+            sceneRectF = QRectF(*self._lastPrefetch[1])
+            self._cancelPrefetch()
+            self._updatePrefetch(sceneRectF)
+            if self._pendingPrefetch:
+                self._scheduleDeferredWork()
 
     def _onChannelChanged(self, new):
-        if (new - self._channel) < 0:
-            self._course = (2, -1)
-        else:
-            self._course = (2, 1)
-        self._channel = new
+        self._observeMovement(CHANNEL_AXIS, new)
 
     def _onTimeChanged(self, new):
-        if (new - self._time) < 0:
-            self._course = (0, -1)
-        else:
-            self._course = (0, 1)
-        self._time = new
+        if not self._readAheadTimes:
+            self._observeMovement(TIME_AXIS, new)
@@ -648,11 +648,15 @@ class SegmentationEdgesLayer(Layer):
         *,
         isClickable=False,
         isHoverable=False,
+        batched=False,
         priority: int = 0
     ):
         """
         datasource: A single-channel label image.
         default_pen: The initial pen style for each edge.
+        batched: Draw the edges of each tile as a few paths (one per pen) instead of one item per edge,
+                 and pick edges through a per-tile index (see BatchedSegmentationEdgesItem).
+                 Much faster for dense segmentations.
         """
         super(SegmentationEdgesLayer, self).__init__([datasource], direct=direct, priority=priority)
 
@@ -661,6 +665,7 @@ class SegmentationEdgesLayer(Layer):
         self.default_pen = default_pen
         self._isClickable = isClickable
         self.isHoverable = isHoverable
+        self.batched = batched
 
     def handle_edge_clicked(self, id_pair, event):
         """
@@ -703,6 +708,7 @@ class LabelableSegmentationEdgesLayer(SegmentationEdgesLayer):
         *,
         isClickable=True,
         isHoverable=True,
+        batched=False,
         priority: int = 0
     ):
         # Class 0 (no label) is the default pen
@@ -711,6 +717,7 @@ class LabelableSegmentationEdgesLayer(SegmentationEdgesLayer):
             default_pen=label_class_pens[0],
             isClickable=isClickable,
             isHoverable=isHoverable,
+            batched=batched,
             priority=priority,
         )
         self._delay_ms = delay_ms
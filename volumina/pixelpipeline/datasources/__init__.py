@@ -23,6 +23,10 @@ from .arraysource import ArraySource, ArraySinkSource, RelabelingArraySource
 from .constantsource import ConstantSource
 from .minmaxsource import MinMaxSource
 from .halosource import HaloAdjustedDataSource
+from .channelsource import ChannelSource
+from .bricksource import BrickFetcher, BrickSource
+from .imagesequence import ImageSequence, ImageSequenceSource
+from .stridedrequest import StridedRequest, requestStrided
 
 from .factories import createDataSource
 
@@ -33,6 +37,13 @@ __all__ = [
     "ConstantSource",
     "MinMaxSource",
     "HaloAdjustedDataSource",
+    "ChannelSource",
+    "BrickFetcher",
+    "BrickSource",
+    "ImageSequence",
+    "ImageSequenceSource",
+    "StridedRequest",
+    "requestStrided",
     "createDataSource",
 ]
 
@@ -45,3 +56,10 @@ try:
     __all__ += ["CacheSource"]
 except ImportError:
     pass
+
+try:
+    from .zarrsource import ZarrSource
+
+    __all__ += ["ZarrSource"]
+except ImportError:
+    pass
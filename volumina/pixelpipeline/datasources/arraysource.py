@@ -2,7 +2,7 @@ import numpy as np
 from qtpy.QtCore import QObject, Signal
 
 from volumina.pixelpipeline.interface import DataSourceABC, RequestABC
-from volumina.slicingtools import is_pure_slicing, index2slice
+from volumina.slicingtools import is_pure_slicing, index2slice, stride_slicing
 
 
 class ArrayRequest(RequestABC):
@@ -27,6 +27,9 @@ class ArraySource(QObject, DataSourceABC):
     isDirty = Signal(object)
     numberOfChannelsChanged = Signal(int)  # Never emitted
 
+    # ndarrays and h5py datasets read strided slicings cheaply
+    supportsStep = True
+
     def __init__(self, array):
         super(ArraySource, self).__init__()
         self._array = array
@@ -35,6 +38,14 @@ class ArraySource(QObject, DataSourceABC):
     def numberOfChannels(self):
         return self._array.shape[-1]
 
+    @property
+    def chunkShape(self):
+        """The shape of the native chunks of a chunked array (e.g. an h5py dataset), or None"""
+        chunks = getattr(self._array, "chunks", None)
+        if chunks is None or not all(isinstance(c, (int, np.integer)) for c in chunks):
+            return None
+        return tuple(int(c) for c in chunks)
+
     def clean_up(self):
         self._array = None
 
@@ -43,13 +54,13 @@ class ArraySource(QObject, DataSourceABC):
             return self._array.dtype
         return self._array.dtype.type
 
-    def request(self, slicing):
+    def request(self, slicing, step=1):
         if not is_pure_slicing(slicing):
             raise Exception("ArraySource: slicing is not pure")
         assert len(slicing) == len(
             self._array.shape
         ), "slicing into an array of shape=%r requested, but slicing is %r" % (slicing, self._array.shape)
-        return ArrayRequest(self._array, slicing)
+        return ArrayRequest(self._array, stride_slicing(slicing, step))
 
     def setDirty(self, slicing):
         if not is_pure_slicing(slicing):
@@ -119,13 +130,13 @@ class RelabelingArraySource(ArraySource):
         if setDirty:
             self.setDirty(5 * (slice(None),))
 
-    def request(self, slicing):
+    def request(self, slicing, step=1):
         if not is_pure_slicing(slicing):
             raise Exception("ArraySource: slicing is not pure")
         assert len(slicing) == len(
             self._array.shape
         ), "slicing into an array of shape=%r requested, but slicing is %r" % (self._array.shape, slicing)
-        a = ArrayRequest(self._array, slicing)
+        a = ArrayRequest(self._array, stride_slicing(slicing, step))
         a = a.wait()
 
         # oldDtype = a.dtype
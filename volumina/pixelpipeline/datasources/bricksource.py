@@ -0,0 +1,273 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+import logging
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import numpy
+from qtpy.QtCore import QObject, Signal
+
+from volumina.pixelpipeline.interface import DataSourceABC, RequestABC
+from volumina.slicingtools import is_pure_slicing, normalize_step
+
+from .stridedrequest import requestStrided
+
+logger = logging.getLogger(__name__)
+
+
+class _Brick:
+    """A 3D brick that is being fetched (or has been fetched) from a data source"""
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.data = None
+        self.error = None
+
+    def wait(self):
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self.data
+
+
+class BrickFetcher(object):
+    """
+    Serves the slices of the three orthogonal views from one shared 3D brick.
+
+    With block-chunked backends (lazyflow, chunked h5), the x-y, x-z and y-z views
+    would each trigger separate block reads around the crosshair. Data sources wrapped
+    by a BrickFetcher (see wrap()) instead request one brick of brickShape around the
+    slicing position, and answer all requests that lie within it from the brick.
+    Requests (partially) outside of the brick are forwarded unchanged.
+
+    Bricks are aligned to a grid of brickShape; with brickShape equal to the tile
+    width, the tiles around the crosshair of all three views lie within one brick.
+    """
+
+    BRICK_SHAPE = (256, 256, 256)
+    MAX_BRICKS = 4
+    MAX_BRICK_BYTES = 64 * 2**20
+
+    def __init__(self, brickShape: Sequence[int] = BRICK_SHAPE, maxBricks: int = MAX_BRICKS):
+        self._lock = threading.Lock()
+        self._brickShape = tuple(brickShape)
+        self._maxBricks = maxBricks
+        self._maxBrickBytes = self.MAX_BRICK_BYTES
+        self._shape = None  # 5D shape of the volume
+        self._position = None  # x, y, z
+        self._bricks = OrderedDict()  # (source id, t, c, box) -> _Brick, least recently used first
+        self._sources = []  # weak references to the BrickSources created by wrap()
+
+    def setBrickShape(self, brickShape: Sequence[int]):
+        self._brickShape = tuple(brickShape)
+        self.clear()
+
+    def brickShape(self) -> Tuple[int, int, int]:
+        return self._brickShape
+
+    def setMaxBrickBytes(self, maxBrickBytes: int):
+        """Bricks that would be larger than this are not fetched, requests are forwarded instead."""
+        self._maxBrickBytes = maxBrickBytes
+
+    def maxBrickBytes(self) -> int:
+        return self._maxBrickBytes
+
+    def setShape(self, shape5D: Sequence[int]):
+        self._shape = tuple(shape5D)
+        self.clear()
+
+    def setPosition(self, position: Sequence[int]):
+        """Set the slicing position (x, y, z)"""
+        self._position = tuple(position)
+
+    def clear(self):
+        with self._lock:
+            self._bricks.clear()
+
+    def focus(self) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """(start, stop) along x, y and z of the brick around the slicing position, or None"""
+        if self._shape is None or self._position is None:
+            return None
+        box = []
+        for p, size, n in zip(self._position, self._brickShape, self._shape[1:4]):
+            start = (p // size) * size
+            box.append((start, min(start + size, n)))
+        return tuple(box)
+
+    def wrap(self, source: DataSourceABC) -> "BrickSource":
+        """The BrickSource for source; the same one for all views"""
+        alive = []
+        found = None
+        for ref in self._sources:
+            brickSource = ref()
+            if brickSource is None:
+                continue
+            alive.append(ref)
+            if brickSource._rawSource is source:
+                found = brickSource
+        self._sources = alive
+        if found is None:
+            found = BrickSource(source, self)
+            self._sources.append(weakref.ref(found))
+        return found
+
+    def invalidate(self, sourceId):
+        with self._lock:
+            for key in [key for key in self._bricks if key[0] == sourceId]:
+                del self._bricks[key]
+
+    def _brick(self, source: "BrickSource", key, slicing) -> numpy.ndarray:
+        with self._lock:
+            brick = self._bricks.get(key)
+            owner = brick is None
+            if owner:
+                brick = self._bricks[key] = _Brick()
+                while len(self._bricks) > self._maxBricks:
+                    self._bricks.popitem(last=False)
+            else:
+                self._bricks.move_to_end(key)
+
+        if owner:
+            try:
+                data = source._rawSource.request(slicing).wait()
+                data.setflags(write=False)
+                brick.data = data
+            except Exception as e:
+                brick.error = e
+                with self._lock:
+                    if self._bricks.get(key) is brick:
+                        del self._bricks[key]
+            finally:
+                brick.ready.set()
+        return brick.wait()
+
+
+class BrickRequest(RequestABC):
+    def __init__(self, fetcher: BrickFetcher, source: "BrickSource", key, brickSlicing, slicing):
+        self._fetcher = fetcher
+        self._source = source
+        self._key = key
+        self._brickSlicing = brickSlicing
+        self._slicing = slicing
+        self._result = None
+
+    def wait(self):
+        if self._result is None:
+            brick = self._fetcher._brick(self._source, self._key, self._brickSlicing)
+            self._result = brick[
+                tuple(slice(s.start - b.start, s.stop - b.start) for s, b in zip(self._slicing, self._brickSlicing))
+            ]
+        return self._result
+
+    def cancel(self):
+        pass
+
+    def submit(self):
+        pass
+
+
+class BrickSource(QObject, DataSourceABC):
+    """
+    A wrapper for other datasources, that answers requests from the shared
+    brick of a BrickFetcher when possible. Create via BrickFetcher.wrap().
+    """
+
+    isDirty = Signal(object)
+    numberOfChannelsChanged = Signal(int)
+
+    def __init__(self, rawSource: DataSourceABC, fetcher: BrickFetcher, parent=None):
+        super(BrickSource, self).__init__(parent)
+        self._rawSource = rawSource
+        self._fetcher = fetcher
+        self._uniqueid = uuid.uuid4()
+        self._rawSource.isDirty.connect(self.setDirty)
+        self._rawSource.numberOfChannelsChanged.connect(self._onNumberOfChannelsChanged)
+
+    @property
+    def numberOfChannels(self):
+        return self._rawSource.numberOfChannels
+
+    @property
+    def supportsStep(self):
+        return getattr(self._rawSource, "supportsStep", False)
+
+    @property
+    def chunkShape(self):
+        return getattr(self._rawSource, "chunkShape", None)
+
+    def clean_up(self):
+        self._fetcher.invalidate(self._uniqueid)
+        self._rawSource.clean_up()
+
+    def dtype(self):
+        return self._rawSource.dtype()
+
+    def request(self, slicing, step=1):
+        if not is_pure_slicing(slicing):
+            raise Exception("BrickSource: slicing is not pure")
+        if any(s != 1 for s in normalize_step(step, len(slicing))):
+            # downsampled reads are cheap already, they don't need the bricks
+            return requestStrided(self._rawSource, slicing, step)
+        brickSlicing = self._brickSlicing(slicing)
+        if brickSlicing is None:
+            return self._rawSource.request(slicing)
+        key = (self._uniqueid,) + tuple((s.start, s.stop) for s in brickSlicing)
+        return BrickRequest(self._fetcher, self, key, brickSlicing, slicing)
+
+    def setDirty(self, slicing):
+        self._fetcher.invalidate(self._uniqueid)
+        self.isDirty.emit(slicing)
+
+    def __getattr__(self, attr):
+        return getattr(self._rawSource, attr)
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        return isinstance(other, type(self)) and self._rawSource == other._rawSource
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def _onNumberOfChannelsChanged(self, n):
+        self._fetcher.invalidate(self._uniqueid)
+        self.numberOfChannelsChanged.emit(n)
+
+    def _brickSlicing(self, slicing):
+        """The 5D slicing of the brick that contains slicing, or None"""
+        box = self._fetcher.focus()
+        if box is None or len(slicing) != 5:
+            return None
+        if any(s.start is None or s.stop is None or s.step not in (None, 1) for s in slicing):
+            return None
+        spatial = slicing[1:4]
+        if not all(start <= s.start and s.stop <= stop for s, (start, stop) in zip(spatial, box)):
+            return None
+
+        brickSlicing = (slicing[0],) + tuple(slice(start, stop) for start, stop in box) + (slicing[4],)
+        size = numpy.prod([s.stop - s.start for s in brickSlicing]) * numpy.dtype(self.dtype()).itemsize
+        if size > self._fetcher.maxBrickBytes():
+            return None
+        return brickSlicing
@@ -7,10 +7,12 @@ from typing import Union
 from qtpy.QtCore import QObject, Signal
 
 from volumina.pixelpipeline.interface import DataSourceABC
-from volumina.slicingtools import is_pure_slicing
+from volumina.slicingtools import is_pure_slicing, normalize_step
 from volumina.utility.cache import KVCache
 from volumina.config import CONFIG
 
+from .stridedrequest import requestStrided
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,12 +20,12 @@ ARRAY_CACHE = KVCache(CONFIG.cache_size, getsizeof=sys.getsizeof)
 
 
 class _Request:
-    def __init__(self, cached_source: "CacheSource", slicing, key):
+    def __init__(self, cached_source: "CacheSource", slicing, key, step=1):
         self._cached_source = cached_source
         self._slicing = slicing
         self._key = key
         self._result = None
-        self._rq = self._cached_source._source.request(self._slicing)
+        self._rq = requestStrided(self._cached_source._source, self._slicing, step)
 
     def wait(self):
         if self._result is not None:
@@ -86,17 +88,21 @@ class CacheSource(QObject, DataSourceABC):
         self._cache.clear()
         self._req.clear()
 
-    def __cache_key(self, slicing):
+    def __cache_key(self, slicing, step=1):
         parts = [self._uniqueid]
 
         for el in slicing:
             _, key_part = el.__reduce__()
             parts.append(key_part)
 
+        step = normalize_step(step, len(slicing))
+        if any(s != 1 for s in step):
+            parts.append(step)
+
         return "::".join(str(p) for p in parts)
 
-    def request(self, slicing) -> Union[_CachedRequest, _Request]:
-        key = self.__cache_key(slicing)
+    def request(self, slicing, step=1) -> Union[_CachedRequest, _Request]:
+        key = self.__cache_key(slicing, step)
 
         with self._lock:
             result = self._cache.get(key)
@@ -105,7 +111,7 @@ class CacheSource(QObject, DataSourceABC):
 
             else:
                 if key not in self._req:
-                    self._req[key] = _Request(self, slicing, key)
+                    self._req[key] = _Request(self, slicing, key, step)
 
                 return self._req[key]
 
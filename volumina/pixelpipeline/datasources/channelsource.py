@@ -0,0 +1,66 @@
+from qtpy.QtCore import QObject, Signal
+
+from volumina.pixelpipeline.interface import DataSourceABC
+
+from .stridedrequest import requestStrided
+
+
+class ChannelSource(QObject, DataSourceABC):
+    """
+    A wrapper for other datasources.
+    Serves a single channel of the underlying datasource, e.g. one
+    color of an RGBALayer out of a multichannel image.
+    """
+
+    isDirty = Signal(object)
+    numberOfChannelsChanged = Signal(int)  # Never emitted
+
+    def __init__(self, rawSource, channel, parent=None):
+        """
+        rawSource: The original (multichannel) datasource
+        channel: The channel to serve
+        """
+        super(ChannelSource, self).__init__(parent)
+        self._rawSource = rawSource
+        self._channel = channel
+        self._rawSource.isDirty.connect(self.setDirty)
+
+    @property
+    def channel(self):
+        return self._channel
+
+    @property
+    def numberOfChannels(self):
+        return 1
+
+    @property
+    def supportsStep(self):
+        return getattr(self._rawSource, "supportsStep", False)
+
+    @property
+    def chunkShape(self):
+        chunkShape = getattr(self._rawSource, "chunkShape", None)
+        return chunkShape[:-1] + (1,) if chunkShape is not None else None
+
+    def clean_up(self):
+        self._rawSource.clean_up()
+
+    def dtype(self):
+        return self._rawSource.dtype()
+
+    def request(self, slicing, step=1):
+        return requestStrided(self._rawSource, tuple(slicing[:-1]) + (slice(self._channel, self._channel + 1),), step)
+
+    def setDirty(self, slicing):
+        self.isDirty.emit(tuple(slicing[:-1]) + (slice(None),))
+
+    def __eq__(self, other):
+        if other is None:
+            return False
+        return isinstance(other, type(self)) and self._channel == other._channel and self._rawSource == other._rawSource
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return hash((id(self._rawSource), self._channel))
@@ -0,0 +1,247 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Array-likes presented in volumina's 5D axis order (txyzc), read chunk by chunk.
+"""
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+# threads fetching chunks, shared by all chunked sources
+MAX_CHUNK_WORKERS = 8
+
+_executor = None
+_executorLock = threading.Lock()
+
+
+def chunkExecutor():
+    """The thread pool that fetches the chunks of all chunked sources (zarr arrays, image sequences)"""
+    global _executor
+    with _executorLock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_CHUNK_WORKERS, thread_name_prefix="ChunkFetcher")
+    return _executor
+
+
+def normalize_shape(shape):
+    """
+    :returns: Normalized shape and position of real axes to "txyzc" axes order
+    """
+    # xy
+    if len(shape) == 2:
+        return (1, shape[0], shape[1], 1, 1), (1, 2)
+
+    # xyc shape[2] <= 4 implies that it's a channel dimension
+    elif len(shape) == 3 and shape[2] <= 4:
+        return (1, shape[0], shape[1], 1, shape[2]), (1, 2, 4)
+
+    # xyz
+    elif len(shape) == 3:
+        return (1, shape[0], shape[1], shape[2], 1), (1, 2, 3)
+
+    # xyzc
+    elif len(shape) == 4:
+        return (1, shape[0], shape[1], shape[2], shape[3]), (1, 2, 3, 4)
+
+    # txyzc
+    elif len(shape) == 5:
+        return shape, (0, 1, 2, 3, 4)
+
+    raise ValueError("Can process only shapes with ndims <= 5")
+
+
+def axes_positions(axistags, ndim):
+    """
+    :param str axistags: the axes of an array with ndim dimensions, e.g. "zyx" (any order of "txyzc")
+    :returns: the position of each of its axes in the "txyzc" axis order
+    """
+    if len(axistags) != ndim:
+        raise ValueError(f"Got {len(axistags)} axistags '{axistags}' for data with {ndim} dimensions")
+    if len(set(axistags)) != len(axistags) or not set(axistags) <= set("txyzc"):
+        raise ValueError(f"Invalid axistags '{axistags}', expected distinct axes out of 'txyzc'")
+    return tuple("txyzc".index(axis) for axis in axistags)
+
+
+def reorder_to_txyzc(data, axistags):
+    """
+    View data with the given axes in volumina's axis order (txyzc).
+
+    Missing axes are added as singletons. The result is a view, no data is copied,
+    so memory-mapped arrays stay memory-mapped.
+    """
+    positions = axes_positions(axistags, data.ndim)
+    missing = [axis for axis in range(5) if axis not in positions]
+    data = data.reshape(data.shape + (1,) * len(missing))
+    order = list(positions) + missing
+    return data.transpose([order.index(axis) for axis in range(5)])
+
+
+class ChunkedArray5D(object):
+    """
+    Presents an array-like (h5py dataset, zarr array, ...) with up to 5 dimensions
+    as txyzc, for ArraySource. The axes are given by axistags, or guessed from the
+    shape (see normalize_shape).
+
+    The chunk shape of chunked arrays is exposed as chunks (txyzc), so that the
+    tiling can be aligned to it (see ArraySource.chunkShape). Reads are split at the
+    chunk boundaries:
+    * with a chunk cache (chunkCacheBytes > 0), whole chunks are read and the most
+      recently used ones are kept decompressed: tiles that straddle chunk boundaries,
+      and the views sharing a chunk, decompress it only once;
+    * with an executor, the chunks of one read are fetched in parallel.
+    """
+
+    # default maximal size of the decompressed chunks kept per array
+    CHUNK_CACHE_BYTES = 64 * 2**20
+
+    def __init__(self, array, chunkCacheBytes=None, executor=None, axistags=None):
+        """
+        chunkCacheBytes -- size of the chunk cache (default: CHUNK_CACHE_BYTES), 0 disables it
+        executor        -- fetches the chunks of one read in parallel (default: read serially)
+        axistags        -- the axes of the array, e.g. "zyx" (default: guessed from the shape)
+        """
+        if axistags is None:
+            self.shape, self.real_axes = normalize_shape(array.shape)
+        else:
+            self.real_axes = axes_positions(axistags, len(array.shape))
+            shape = [1] * 5
+            for axis, extent in zip(self.real_axes, array.shape):
+                shape[axis] = extent
+            self.shape = tuple(shape)
+        # the axes of the array, sorted by their position in txyzc
+        self._order = tuple(sorted(range(len(self.real_axes)), key=self.real_axes.__getitem__))
+        self.array = array
+        self.dtype = array.dtype
+
+        self.chunks = None
+        if array.chunks is not None:
+            chunks = [1] * 5
+            for axis, extent in zip(self.real_axes, array.chunks):
+                chunks[axis] = extent
+            self.chunks = tuple(chunks)
+
+        self._executor = executor
+        self._chunkCacheBytes = self.CHUNK_CACHE_BYTES if chunkCacheBytes is None else chunkCacheBytes
+        self._chunkCache = OrderedDict()  # chunk index -> array, least recently used first
+        self._chunkCacheUsed = 0
+        self._lock = threading.Lock()
+
+    def __getitem__(self, slicing_5d):
+        real_slicing = tuple(slicing_5d[i] for i in self.real_axes)
+        if self._readsByChunk(real_slicing):
+            data = self._readChunks(real_slicing)
+        else:
+            data = self.array[real_slicing]
+        data = data.transpose(self._order)
+        expanded_slicing = [None] * 5
+        for axis in self.real_axes:
+            expanded_slicing[axis] = slice(None)
+        return data[tuple(expanded_slicing)]
+
+    def clearChunkCache(self):
+        with self._lock:
+            self._chunkCache.clear()
+            self._chunkCacheUsed = 0
+
+    def _cachesChunks(self):
+        chunkBytes = numpy.prod(self.array.chunks) * self.dtype.itemsize
+        return chunkBytes * 4 <= self._chunkCacheBytes
+
+    def _readsByChunk(self, real_slicing):
+        if self.array.chunks is None or (self._executor is None and not self._cachesChunks()):
+            return False
+        return all(isinstance(s, slice) and (s.step or 1) > 0 for s in real_slicing)
+
+    def _readChunks(self, real_slicing):
+        ranges = [s.indices(n) for s, n in zip(real_slicing, self.array.shape)]
+        data = numpy.empty([len(range(*r)) for r in ranges], dtype=self.dtype)
+        if data.size == 0:
+            return data
+
+        pieces = list(itertools.product(*[_chunkPieces(r, c) for r, c in zip(ranges, self.array.chunks)]))
+        if self._cachesChunks():
+
+            def read(piece):
+                return self._chunk(tuple(index for index, _, _ in piece))[tuple(src for _, src, _ in piece)]
+
+        else:
+
+            def read(piece):
+                return self.array[
+                    tuple(
+                        slice(index * c + src.start, index * c + src.stop, src.step)
+                        for (index, src, _), c in zip(piece, self.array.chunks)
+                    )
+                ]
+
+        if self._executor is not None and len(pieces) > 1:
+            results = self._executor.map(read, pieces)
+        else:
+            results = map(read, pieces)
+        for piece, result in zip(pieces, results):
+            data[tuple(dst for _, _, dst in piece)] = result
+        return data
+
+    def _chunk(self, index):
+        """The (decompressed) chunk with the given grid index"""
+        with self._lock:
+            chunk = self._chunkCache.get(index)
+            if chunk is not None:
+                self._chunkCache.move_to_end(index)
+                return chunk
+
+        chunk = self.array[
+            tuple(slice(i * c, min((i + 1) * c, n)) for i, c, n in zip(index, self.array.chunks, self.array.shape))
+        ]
+
+        with self._lock:
+            if index not in self._chunkCache:
+                self._chunkCache[index] = chunk
+                self._chunkCacheUsed += chunk.nbytes
+                while self._chunkCacheUsed > self._chunkCacheBytes:
+                    _, dropped = self._chunkCache.popitem(last=False)
+                    self._chunkCacheUsed -= dropped.nbytes
+        return chunk
+
+
+def _chunkPieces(range_, extent):
+    """
+    Split the indices range(*range_) along one axis at the chunk boundaries.
+
+    :returns: for each chunk hit: its index, the slicing into the chunk and
+              the slicing into the result
+    """
+    start, stop, step = range_
+    count = len(range(start, stop, step))
+    last = start + (count - 1) * step
+    pieces = []
+    for index in range(start // extent, last // extent + 1):
+        chunkStart = index * extent
+        first = max(0, -(-(chunkStart - start) // step))
+        end = min(count, -(-(chunkStart + extent - start) // step))
+        if first < end:
+            src = slice(start + first * step - chunkStart, start + (end - 1) * step - chunkStart + 1, step)
+            pieces.append((index, src, slice(first, end)))
+    return pieces
@@ -1,7 +1,7 @@
 import numpy as np
 from qtpy.QtCore import QObject, Signal
 
-from volumina.slicingtools import is_pure_slicing, slicing2shape, is_bounded, sl
+from volumina.slicingtools import is_pure_slicing, is_bounded, normalize_step, sl
 from volumina.pixelpipeline.interface import DataSourceABC, RequestABC
 
 
@@ -26,6 +26,8 @@ class ConstantSource(QObject, DataSourceABC):
     isDirty = Signal(object)
     numberOfChannelsChanged = Signal(int)  # Never emitted
 
+    supportsStep = True
+
     @property
     def constant(self):
         return self._constant
@@ -51,10 +53,13 @@ class ConstantSource(QObject, DataSourceABC):
     def id(self):
         return id(self)
 
-    def request(self, slicing):
+    def request(self, slicing, step=1):
         assert is_pure_slicing(slicing)
         assert is_bounded(slicing)
-        shape = slicing2shape(slicing)
+        shape = tuple(
+            len(range(s.start or 0, s.stop, (s.step or 1) * n))
+            for s, n in zip(slicing, normalize_step(step, len(slicing)))
+        )
         key = (shape, self._constant, self._dtype)
 
         if key not in self._cache:
@@ -26,6 +26,8 @@ import numpy
 
 from .arraysource import ArraySource
 from .cachesource import CacheSource
+from .chunkedarray import ChunkedArray5D, normalize_shape, reorder_to_txyzc
+from .imagesequence import ImageSequence, ImageSequenceSource
 
 hasLazyflow = True
 try:
@@ -48,45 +50,36 @@ try:
 except ImportError:
     hasVigra = False
 
+try:
+    import zarr
+    from .zarrsource import ZarrSource
+
+    hasZarr = True
+except ImportError:
+    hasZarr = False
+
 
 @singledispatch
-def createDataSource(source, withShape=False):
+def createDataSource(source, withShape=False, axistags=None):
     """
     Creates datasource based on type of supplied argument
     Resulting souce will have following dimensions: txyzc
-    """
-    raise NotImplementedError(f"createDataSource for {type(source)}")
-
 
-def normalize_shape(shape):
+    axistags -- the axes of an untagged array, e.g. "zyx" (default: guessed from the shape,
+                see normalize_shape); sources with axistags of their own don't take them
     """
-    :returns: Normalized shape and position of real axes to "txyzc" axes order
-    """
-    # xy
-    if len(shape) == 2:
-        return (1, shape[0], shape[1], 1, 1), (1, 2)
-
-    # xyc shape[2] <= 4 implies that it's a channel dimension
-    elif len(shape) == 3 and shape[2] <= 4:
-        return (1, shape[0], shape[1], 1, shape[2]), (1, 2, 4)
-
-    # xyz
-    elif len(shape) == 3:
-        return (1, shape[0], shape[1], shape[2], 1), (1, 2, 3)
-
-    # xyzc
-    elif len(shape) == 4:
-        return (1, shape[0], shape[1], shape[2], shape[3]), (1, 2, 3, 4)
+    raise NotImplementedError(f"createDataSource for {type(source)}")
 
-    # txyzc
-    elif len(shape) == 5:
-        return shape, (0, 1, 2, 3, 4)
 
-    raise ValueError("Can process only shapes with ndims <= 5")
+def _checkNoAxistags(source, axistags):
+    if axistags is not None:
+        raise ValueError(f"{type(source).__name__} has axistags of its own, got '{axistags}'")
 
 
-def _createArrayDataSource(source, withShape=False):
+def _createArrayDataSource(source, withShape=False, axistags=None):
     # has to handle NumpyArray
+    if axistags is not None:
+        source = reorder_to_txyzc(source, axistags)
     # check if the array is 5d, if not so embed it in a canonical way
     new_shp, _ = normalize_shape(source.shape)
     if new_shp != source.shape:
@@ -100,8 +93,17 @@ def _createArrayDataSource(source, withShape=False):
 
 
 @createDataSource.register(numpy.ndarray)
-def _numpy_ds(source, withShape=False):
-    return _createArrayDataSource(source, withShape)
+def _numpy_ds(source, withShape=False, axistags=None):
+    return _createArrayDataSource(source, withShape, axistags)
+
+
+@createDataSource.register(ImageSequence)
+def _image_sequence_ds(sequence, withShape=False, axistags=None):
+    src = ImageSequenceSource(sequence, axistags=axistags)
+    if withShape:
+        return src, src.shape
+    else:
+        return src
 
 
 if hasLazyflow:
@@ -116,7 +118,8 @@ if hasLazyflow:
             return src
 
     @createDataSource.register(lazyflow.graph.OutputSlot)
-    def _lazyflow_out(slot, withShape=False) -> Union[Tuple[CacheSource, Tuple[int, ...]], CacheSource]:
+    def _lazyflow_out(slot, withShape=False, axistags=None) -> Union[Tuple[CacheSource, Tuple[int, ...]], CacheSource]:
+        _checkNoAxistags(slot, axistags)
         if withShape:
             src, shape = _createDataSourceLazyflow(slot, withShape)
             return CacheSource(src), shape
@@ -125,29 +128,27 @@ if hasLazyflow:
             return CacheSource(src)
 
     @createDataSource.register(lazyflow.graph.InputSlot)
-    def _lazyflow_in(source, withShape=False):
+    def _lazyflow_in(source, withShape=False, axistags=None):
+        _checkNoAxistags(source, axistags)
         return _createDataSourceLazyflow(source, withShape)
 
 
 if hasH5py:
 
-    class H5pyDset5DWrapper(object):
-        def __init__(self, dset):
-            self.shape, self.real_axes = normalize_shape(dset.shape)
-            self.dset = dset
-            self.dtype = dset.dtype
+    class H5pyDset5DWrapper(ChunkedArray5D):
+        """
+        Presents an h5py dataset as txyzc, reading chunked datasets through a cache of
+        decompressed chunks (see ChunkedArray5D). Reads are not parallelized, since
+        HDF5 serializes them anyway.
+        """
 
-        def __getitem__(self, slicing_5d):
-            real_slicing = tuple(slicing_5d[i] for i in self.real_axes)
-            data = self.dset[real_slicing]
-            expanded_slicing = [None] * 5
-            for axis in self.real_axes:
-                expanded_slicing[axis] = slice(None)
-            return data[tuple(expanded_slicing)]
+        def __init__(self, dset, chunkCacheBytes=None, axistags=None):
+            super(H5pyDset5DWrapper, self).__init__(dset, chunkCacheBytes, axistags=axistags)
+            self.dset = dset
 
     @createDataSource.register(h5py.Dataset)
-    def _h5py_ds(dset, withShape=False):
-        dset_5d = H5pyDset5DWrapper(dset)
+    def _h5py_ds(dset, withShape=False, axistags=None):
+        dset_5d = H5pyDset5DWrapper(dset, axistags=axistags)
         src = ArraySource(dset_5d)
         if withShape:
             return src, dset_5d.shape
@@ -158,6 +159,18 @@ if hasH5py:
 if hasVigra:
 
     @createDataSource.register(vigra.VigraArray)
-    def _vigra_ds(source, withShape=False):
+    def _vigra_ds(source, withShape=False, axistags=None):
+        _checkNoAxistags(source, axistags)
         source = source.withAxes(*"txyzc").view(numpy.ndarray)
         return _createArrayDataSource(source, withShape)
+
+
+if hasZarr:
+
+    @createDataSource.register(zarr.Array)
+    def _zarr_ds(array, withShape=False, axistags=None):
+        src = ZarrSource(array, axistags=axistags)
+        if withShape:
+            return src, src.shape
+        else:
+            return src
@@ -2,6 +2,8 @@ from qtpy.QtCore import QObject, Signal
 
 from volumina.pixelpipeline.interface import DataSourceABC
 
+from .stridedrequest import requestStrided
+
 
 class HaloAdjustedDataSource(QObject, DataSourceABC):
     """
@@ -35,6 +37,14 @@ class HaloAdjustedDataSource(QObject, DataSourceABC):
     def numberOfChannels(self):
         return self._rawSource.numberOfChannels
 
+    @property
+    def supportsStep(self):
+        return getattr(self._rawSource, "supportsStep", False)
+
+    @property
+    def chunkShape(self):
+        return getattr(self._rawSource, "chunkShape", None)
+
     def clean_up(self):
         self._rawSource.clean_up()
 
@@ -48,9 +58,9 @@ class HaloAdjustedDataSource(QObject, DataSourceABC):
     def dtype(self):
         return self._rawSource.dtype()
 
-    def request(self, slicing):
+    def request(self, slicing, step=1):
         slicing_with_halo = self._expand_slicing_with_halo(slicing)
-        return self._rawSource.request(slicing_with_halo)
+        return requestStrided(self._rawSource, slicing_with_halo, step)
 
     def setDirty(self, slicing):
         # FIXME: This assumes the halo is symmetric
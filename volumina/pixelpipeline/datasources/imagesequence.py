@@ -0,0 +1,245 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Datasource for directories of 2D images (TIFF/PNG/... sequences), one file per z or t slice.
+"""
+import glob
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy
+
+from .arraysource import ArraySource
+from .chunkedarray import ChunkedArray5D, chunkExecutor
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+try:
+    import imageio.v3 as iio
+except ImportError:
+    iio = None
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+TIFF_EXTENSIONS = (".tif", ".tiff")
+IMAGE_EXTENSIONS = TIFF_EXTENSIONS + (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def _naturalKey(path):
+    """Sort "slice_2.png" before "slice_10.png" """
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", path)]
+
+
+def sequenceFiles(files):
+    """
+    The files of an image sequence, in order.
+
+    files -- a directory (all images in it), a glob pattern (e.g. "slices/*.tif"),
+             both sorted naturally, or a sequence of paths (in the given order)
+    """
+    if isinstance(files, (str, os.PathLike)):
+        files = os.fspath(files)
+        if os.path.isdir(files):
+            paths = [os.path.join(files, name) for name in os.listdir(files) if name.lower().endswith(IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(files)
+        paths = sorted(paths, key=_naturalKey)
+    else:
+        paths = [os.fspath(path) for path in files]
+    if not paths:
+        raise ValueError(f"No images found in {files}")
+    return paths
+
+
+def _isTiff(path):
+    return path.lower().endswith(TIFF_EXTENSIONS)
+
+
+def readImage(path):
+    """Decode the whole image at path"""
+    if _isTiff(path):
+        if tifffile is None:
+            raise ImportError(f"Reading {path} requires tifffile")
+        return tifffile.imread(path)
+    if iio is None:
+        raise ImportError(f"Reading {path} requires imageio")
+    return numpy.asarray(iio.imread(path))
+
+
+def readImageRegion(path, region):
+    """
+    Read region (a tuple of slices) of the image at path, or None if the format
+    doesn't allow to read parts of the image.
+
+    Uncompressed TIFFs are memory-mapped, compressed (tiled or striped) TIFFs
+    decode only the tiles/strips the region touches.
+    """
+    if not _isTiff(path) or tifffile is None:
+        return None
+    try:
+        image = tifffile.memmap(path, mode="r")
+    except ValueError:
+        pass
+    else:
+        data = numpy.array(image[region])
+        del image
+        return data
+    if zarr is None:
+        return None
+    with tifffile.imread(path, aszarr=True) as store:
+        return numpy.asarray(zarr.open(store, mode="r")[region])
+
+
+class ImageSequence(object):
+    """
+    A stack of 2D images, one file each, as read-only array-like (axis, y, x[, c]).
+
+    Only the files a read touches are decoded, in parallel on the executor:
+    * reads within one image (e.g. the xy view of a z-stack) decode it whole, and
+      the most recently used maxCachedPlanes images are kept;
+    * reads across images (the orthogonal views) read only the rows/columns they
+      need where the format allows it (see readImageRegion), and don't fill the cache.
+    """
+
+    # default number of decoded images kept
+    MAX_CACHED_PLANES = 32
+
+    def __init__(self, files, axis="z", executor=None, maxCachedPlanes=None):
+        """
+        files           -- the images, see sequenceFiles
+        axis            -- the axis along the files: "z" or "t"
+        executor        -- reads the files (default: see chunkExecutor)
+        maxCachedPlanes -- the number of decoded images kept (default: MAX_CACHED_PLANES)
+        """
+        if axis not in ("z", "t"):
+            raise ValueError(f"Images are stacked along 'z' or 't', got '{axis}'")
+        self.files = sequenceFiles(files)
+        self._executor = executor or chunkExecutor()
+        self._maxCachedPlanes = self.MAX_CACHED_PLANES if maxCachedPlanes is None else maxCachedPlanes
+        self._planes = OrderedDict()  # file index -> image, least recently used first
+        self._lock = threading.Lock()
+
+        first = readImage(self.files[0])
+        if first.ndim not in (2, 3):
+            raise ValueError(f"Expected 2D images, {self.files[0]} has shape {first.shape}")
+        self.shape = (len(self.files),) + first.shape
+        self.dtype = first.dtype
+        self.axistags = axis + "yx" + ("c" if first.ndim == 3 else "")
+        self.chunks = None
+        self._remember(0, first)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, slicing):
+        if not isinstance(slicing, tuple):
+            slicing = (slicing,)
+        region = tuple(slicing[1:])
+        if isinstance(slicing[0], slice):
+            indices = range(*slicing[0].indices(len(self.files)))
+        else:
+            indices = [range(len(self.files))[slicing[0]]]
+
+        if len(indices) == 1:
+            planes = [self._plane(indices[0])[region]]
+        else:
+            planes = list(self._executor.map(lambda index: self._region(index, region), indices))
+
+        if not isinstance(slicing[0], slice):
+            return planes[0]
+        regionShape = numpy.broadcast_to(numpy.empty((), self.dtype), self.shape[1:])[region].shape
+        data = numpy.empty((len(planes),) + regionShape, dtype=self.dtype)
+        for i, plane in enumerate(planes):
+            data[i] = plane
+        return data
+
+    def clearCache(self):
+        with self._lock:
+            self._planes.clear()
+
+    def _plane(self, index):
+        """The whole decoded image of file index"""
+        with self._lock:
+            plane = self._planes.get(index)
+            if plane is not None:
+                self._planes.move_to_end(index)
+                return plane
+
+        plane = self._read(index)
+        self._remember(index, plane)
+        return plane
+
+    def _region(self, index, region):
+        with self._lock:
+            plane = self._planes.get(index)
+        if plane is not None:
+            return plane[region]
+        data = readImageRegion(self.files[index], region)
+        if data is None:
+            # decoded whole, but not remembered: this would evict the planes of the other views
+            return self._read(index)[region]
+        return data
+
+    def _read(self, index):
+        """Decode the whole image of file index (bypassing the cache)"""
+        plane = readImage(self.files[index])
+        if plane.shape != self.shape[1:]:
+            raise ValueError(f"{self.files[index]} has shape {plane.shape}, expected {self.shape[1:]}")
+        return plane
+
+    def _remember(self, index, plane):
+        with self._lock:
+            self._planes[index] = plane
+            self._planes.move_to_end(index)
+            while len(self._planes) > self._maxCachedPlanes:
+                self._planes.popitem(last=False)
+
+
+class ImageSequenceSource(ArraySource):
+    """
+    Serves a sequence of 2D images (see ImageSequence) in txyzc, the files
+    along z (or t).
+    """
+
+    def __init__(self, files, axis="z", executor=None, maxCachedPlanes=None, axistags=None):
+        """
+        files    -- an ImageSequence, or the images (see sequenceFiles)
+        axistags -- the axes of the sequence (default: ImageSequence.axistags, e.g. "zyx")
+        """
+        if not isinstance(files, ImageSequence):
+            files = ImageSequence(files, axis, executor, maxCachedPlanes)
+        self.sequence = files
+        super(ImageSequenceSource, self).__init__(
+            ChunkedArray5D(files, chunkCacheBytes=0, axistags=axistags or files.axistags)
+        )
+
+    @property
+    def shape(self):
+        return self._array.shape
@@ -11,9 +11,11 @@ from lazyflow.operators import opReorderAxes
 from lazyflow.roi import sliceToRoi, roiToSlice
 
 from volumina.pixelpipeline.interface import DataSourceABC, RequestABC, IndeterminateRequestError
-from volumina.slicingtools import is_pure_slicing, slicing2shape, make_bounded
+from volumina.slicingtools import is_pure_slicing, slicing2shape, make_bounded, normalize_step
 from volumina.config import CONFIG
 
+from .stridedrequest import StridedRequest
+
 try:
     _has_vigra = True
     import vigra
@@ -124,6 +126,14 @@ class LazyflowSource(QObject, DataSourceABC):
     def numberOfChannels(self):
         return self._shape[-1]
 
+    @property
+    def chunkShape(self):
+        """The ideal block shape (txyzc) of the slot, or None (0 along axes without preference)"""
+        if self._op5 is None or not self._op5.Output.ready():
+            return None
+        blockshape = self._op5.Output.meta.ideal_blockshape
+        return tuple(blockshape) if blockshape is not None else None
+
     def _checkForNumChannelsChanged(self, *args):
         if self._op5 and self._op5.Output.ready() and self._shape[-1] != self._op5.Output.meta.shape[-1]:
             self._shape = tuple(self._op5.Output.meta.shape)
@@ -143,7 +153,7 @@ class LazyflowSource(QObject, DataSourceABC):
         return dtype
 
     @translate_lf_exceptions
-    def request(self, slicing):
+    def request(self, slicing, step=1):
         if CONFIG.verbose_pixelpipeline:
             logger.info("%s '%s' requests %s'", type(self).__name__, self.objectName(), strSlicing(slicing))
 
@@ -156,7 +166,11 @@ class LazyflowSource(QObject, DataSourceABC):
         start, stop = sliceToRoi(slicing, self._op5.Output.meta.shape)
         clipped_roi = np.maximum(start, (0, 0, 0, 0, 0)), np.minimum(stop, self._op5.Output.meta.shape)
         clipped_slicing = roiToSlice(*clipped_roi)
-        return LazyflowRequest(self._op5, clipped_slicing, self._priority, objectName=self.objectName())
+        request = LazyflowRequest(self._op5, clipped_slicing, self._priority, objectName=self.objectName())
+        if any(s != 1 for s in normalize_step(step, len(slicing))):
+            # lazyflow computes whole blocks anyway: subsample the full resolution result
+            return StridedRequest(request, step)
+        return request
 
     def _setDirtyLF(self, slot, roi):
         clipped_roi = np.maximum(roi.start, (0, 0, 0, 0, 0)), np.minimum(roi.stop, self._op5.Output.meta.shape)
@@ -6,6 +6,8 @@ from qtpy.QtCore import QObject, Signal, QTimer
 from volumina.pixelpipeline.interface import DataSourceABC, RequestABC
 from volumina.slicingtools import sl
 
+from .stridedrequest import requestStrided
+
 
 class MinMaxUpdateRequest(RequestABC):
     def __init__(self, rawRequest, update_func):
@@ -61,6 +63,14 @@ class MinMaxSource(QObject, DataSourceABC):
     def numberOfChannels(self):
         return self._rawSource.numberOfChannels
 
+    @property
+    def supportsStep(self):
+        return getattr(self._rawSource, "supportsStep", False)
+
+    @property
+    def chunkShape(self):
+        return getattr(self._rawSource, "chunkShape", None)
+
     def clean_up(self):
         self._rawSource.clean_up()
 
@@ -74,8 +84,8 @@ class MinMaxSource(QObject, DataSourceABC):
     def dtype(self):
         return self._rawSource.dtype()
 
-    def request(self, slicing):
-        rawRequest = self._rawSource.request(slicing)
+    def request(self, slicing, step=1):
+        rawRequest = requestStrided(self._rawSource, slicing, step)
         return MinMaxUpdateRequest(rawRequest, self._getMinMax)
 
     def setDirty(self, slicing):
@@ -0,0 +1,72 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Strided (downsampled) requests for datasources that can't subsample cheaply.
+"""
+from volumina.pixelpipeline.interface import RequestABC
+from volumina.slicingtools import normalize_step
+
+
+class StridedRequest(RequestABC):
+    """
+    Subsamples the result of a full resolution request: the generic fallback for
+    DataSourceABC.request(slicing, step) of datasources without supportsStep.
+    """
+
+    def __init__(self, request, step):
+        """
+        request -- the request of the full resolution slicing
+        step    -- the step per axis (see slicingtools.normalize_step)
+        """
+        self._request = request
+        self._step = step
+
+    def wait(self):
+        result = self._request.wait()
+        return result[tuple(slice(None, None, s) for s in normalize_step(self._step, result.ndim))]
+
+    def cancel(self):
+        self._request.cancel()
+
+    def submit(self):
+        self._request.submit()
+        return self
+
+    def adjustPriority(self, delta):
+        self._request.adjustPriority(delta)
+        return self
+
+
+def requestStrided(datasource, slicing, step):
+    """
+    Request slicing from datasource, reading every step-th element (see DataSourceABC.request):
+    natively if the datasource supports it, else at full resolution, subsampled.
+
+    step is only passed on when needed, for compatibility with datasources whose
+    request() doesn't take it.
+    """
+    step = normalize_step(step, len(slicing))
+    if all(s == 1 for s in step):
+        return datasource.request(slicing)
+    if getattr(datasource, "supportsStep", False):
+        return datasource.request(slicing, step)
+    return StridedRequest(datasource.request(slicing), step)
@@ -0,0 +1,79 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Datasource for zarr arrays (local directories, remote stores, N5 containers), without lazyflow.
+"""
+import os
+
+import zarr
+
+from .arraysource import ArraySource
+from .chunkedarray import ChunkedArray5D, chunkExecutor
+
+
+def openZarrArray(path):
+    """
+    Open the zarr array at path read-only.
+
+    N5 datasets are given as path to the dataset within the container (e.g. "volume.n5/raw")
+    and need a zarr version that supports N5 (zarr < 3).
+    """
+    path = os.fspath(path)
+    parts = path.rstrip(os.sep).split(os.sep)
+    n5 = [i for i, part in enumerate(parts) if part.lower().endswith(".n5")]
+    if n5:
+        if not hasattr(zarr, "n5"):
+            raise ValueError(f"Cannot open {path}: N5 is not supported by zarr {zarr.__version__}")
+        container = os.sep.join(parts[: n5[0] + 1])
+        key = "/".join(parts[n5[0] + 1 :])
+        array = zarr.open(zarr.n5.N5FSStore(container), mode="r", path=key)
+    else:
+        array = zarr.open(path, mode="r")
+    if not isinstance(array, zarr.Array):
+        raise ValueError(f"{path} is a zarr group, not an array: give the path to one of its arrays")
+    return array
+
+
+class ZarrSource(ArraySource):
+    """
+    Serves a zarr array in txyzc (see normalize_shape).
+
+    The chunks of each request are fetched in parallel, and the most recently used
+    chunks are kept decompressed (see ChunkedArray5D); chunkCacheBytes=0 disables that cache.
+    """
+
+    def __init__(self, array, chunkCacheBytes=None, executor=None, axistags=None):
+        """
+        array           -- a zarr array, or the path to one (see openZarrArray)
+        chunkCacheBytes -- size of the decompressed chunk cache (see ChunkedArray5D)
+        executor        -- fetches the chunks (default: see chunkExecutor)
+        axistags        -- the axes of the array, e.g. "zyx" (default: guessed from the shape)
+        """
+        if isinstance(array, (str, os.PathLike)):
+            array = openZarrArray(array)
+        super(ZarrSource, self).__init__(
+            ChunkedArray5D(array, chunkCacheBytes, executor or chunkExecutor(), axistags=axistags)
+        )
+
+    @property
+    def shape(self):
+        return self._array.shape
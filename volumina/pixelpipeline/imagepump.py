@@ -331,10 +331,16 @@ class ImagePump(object):
     def stackedImageSources(self):
         return self._stackedImageSources
 
-    def __init__(self, layerStackModel, sliceProjection, sync_along=(0, 1, 2)):
+    def __init__(self, layerStackModel, sliceProjection, sync_along=(0, 1, 2), brickFetcher=None):
+        """
+        brickFetcher -- optional BrickFetcher shared with the image pumps of the other
+                        orthogonal views; requests are then served from one shared 3D brick
+                        around the slicing position where possible
+        """
         super(ImagePump, self).__init__()
         self._layerStackModel = layerStackModel
         self._projection = sliceProjection
+        self._brickFetcher = brickFetcher
         self._layerToSliceSrcs = {}  # non-injective mapping
         self._sliceSrcToImageSrc = {}  # injective mapping
 
@@ -404,6 +410,8 @@ class ImagePump(object):
     def _createSources(self, layer):
         def sliceSrcOrNone(datasrc):
             if datasrc:
+                if self._brickFetcher is not None:
+                    datasrc = self._brickFetcher.wrap(datasrc)
                 return PlanarSliceSource(datasrc, self._projection)
             return None
 
@@ -47,9 +47,19 @@ class ImageSource(QObject, ImageSourceABC):
         """
         return QImage
 
-    def request(self, rect, along_through=None):
+    def request(self, rect, along_through=None, step=1):
+        """
+        step -- request a low resolution preview, or the tile of a zoomed out view, reading
+                only every step-th pixel (see PlanarSliceSource.request()).
+                Only meaningful if supportsStep is True.
+        """
         raise NotImplementedError
 
+    @property
+    def supportsStep(self):
+        """Whether low resolution (strided) tiles are cheaper to request than full resolution ones"""
+        return False
+
     def setDirty(self, slicing):
         """Mark a region of the image as dirty.
 
@@ -79,6 +89,22 @@ class ImageSource(QObject, ImageSourceABC):
         return self._opaque
 
 
+def supports_step(*slice_sources) -> bool:
+    """Whether all slice_sources can produce low resolution previews cheaply (see PlanarSliceSource.request())"""
+    return all(getattr(src, "supportsStep", False) for src in slice_sources)
+
+
+def request_slice(slice_source, slicing, along_through=None, step=1):
+    """
+    Request slicing from slice_source, as a low resolution preview if step > 1.
+    (step is only passed on when needed, for compatibility with PlanarSliceSourceABC
+    implementations that don't support it.)
+    """
+    if step > 1:
+        return slice_source.request(slicing, along_through, step)
+    return slice_source.request(slicing, along_through)
+
+
 def log_request(logger):
     def _log_request(func):
         @functools.wraps(func)
@@ -10,7 +10,7 @@ from qimage2ndarray import array2qimage, byte_view
 from volumina.pixelpipeline.interface import PlanarSliceSourceABC, RequestABC
 from volumina.slicingtools import rect2slicing
 
-from ._base import ImageSource, log_request
+from ._base import ImageSource, log_request, request_slice, supports_step
 
 _has_vigra = True
 try:
@@ -34,11 +34,15 @@ class AlphaModulatedImageSource(ImageSource):
 
         self._arraySource2D.isDirty.connect(self.setDirty)
 
+    @property
+    def supportsStep(self):
+        return supports_step(self._arraySource2D)
+
     @log_request(logger)
-    def request(self, qrect, along_through=None):
+    def request(self, qrect, along_through=None, step=1):
         assert isinstance(qrect, QRect)
         s = rect2slicing(qrect)
-        req = self._arraySource2D.request(s, along_through)
+        req = request_slice(self._arraySource2D, s, along_through, step)
         return AlphaModulatedImageRequest(req, self._layer.tintColor, self._layer.normalize[0])
 
 
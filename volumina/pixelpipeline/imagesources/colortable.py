@@ -12,7 +12,7 @@ from qimage2ndarray import array2qimage, byte_view
 from volumina.pixelpipeline.interface import PlanarSliceSourceABC, RequestABC
 from volumina.slicingtools import rect2slicing
 
-from ._base import ImageSource, log_request
+from ._base import ImageSource, log_request, request_slice, supports_step
 
 _has_vigra = True
 try:
@@ -64,11 +64,15 @@ class ColortableImageSource(ImageSource):
 
         self.isDirty.emit(QRect())  # empty rect == everything is dirty
 
+    @property
+    def supportsStep(self):
+        return supports_step(self._arraySource2D)
+
     @log_request(logger)
-    def request(self, qrect, along_through=None):
+    def request(self, qrect, along_through=None, step=1):
         assert isinstance(qrect, QRect)
         s = rect2slicing(qrect)
-        req = self._arraySource2D.request(s, along_through)
+        req = request_slice(self._arraySource2D, s, along_through, step)
         return ColortableImageRequest(req, self._colorTable, self._layer.normalize[0], self.direct)
 
 
@@ -11,7 +11,7 @@ from qimage2ndarray import byte_view, gray2qimage
 from volumina.pixelpipeline.interface import PlanarSliceSourceABC, RequestABC
 from volumina.slicingtools import rect2slicing
 
-from ._base import ImageSource, log_request
+from ._base import ImageSource, log_request, request_slice, supports_step
 
 _has_vigra = True
 try:
@@ -43,11 +43,15 @@ class GrayscaleImageSource(ImageSource):
         if hasattr(self._layer, "normalizeChanged"):
             self._layer.normalizeChanged.connect(lambda: self.setDirty((slice(None, None), slice(None, None))))
 
+    @property
+    def supportsStep(self):
+        return supports_step(self._arraySource2D)
+
     @log_request(logger)
-    def request(self, qrect, along_through=None):
+    def request(self, qrect, along_through=None, step=1):
         assert isinstance(qrect, QRect)
         s = rect2slicing(qrect)
-        req = self._arraySource2D.request(s, along_through)
+        req = request_slice(self._arraySource2D, s, along_through, step)
         return GrayscaleImageRequest(req, self._layer.normalize[0], direct=self.direct)
 
 
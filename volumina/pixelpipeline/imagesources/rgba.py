@@ -9,7 +9,7 @@ from qimage2ndarray import array2qimage
 from volumina.pixelpipeline.interface import PlanarSliceSourceABC, RequestABC
 from volumina.slicingtools import rect2slicing, slicing2shape
 
-from ._base import ImageSource, log_request
+from ._base import ImageSource, log_request, request_slice, supports_step
 
 _has_vigra = True
 try:
@@ -45,14 +45,15 @@ class RGBAImageSource(ImageSource):
         for arraySource in self._channels:
             arraySource.isDirty.connect(self.setDirty)
 
+    @property
+    def supportsStep(self):
+        return supports_step(*self._channels)
+
     @log_request(logger)
-    def request(self, qrect, along_through=None):
+    def request(self, qrect, along_through=None, step=1):
         assert isinstance(qrect, QRect)
         s = rect2slicing(qrect)
-        r = self._channels[0].request(s, along_through)
-        g = self._channels[1].request(s, along_through)
-        b = self._channels[2].request(s, along_through)
-        a = self._channels[3].request(s, along_through)
+        r, g, b, a = (request_slice(channel, s, along_through, step) for channel in self._channels)
         shape = list(slicing2shape(s))
         assert len(shape) == 2
         assert all([x > 0 for x in shape])
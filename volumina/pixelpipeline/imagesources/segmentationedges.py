@@ -27,7 +27,13 @@ from qtpy.QtCore import QRect
 from volumina.pixelpipeline.interface import RequestABC
 from volumina.slicingtools import rect2slicing
 from volumina.utility import execute_in_main_thread
-from volumina.utility.segmentationEdgesItem import SegmentationEdgesItem, generate_path_items_for_labels
+from volumina.utility.segmentationEdgesItem import (
+    BatchedSegmentationEdgesItem,
+    EdgePickingIndex,
+    SegmentationEdgesItem,
+    line_segments_for_labels,
+    path_items_from_line_segments,
+)
 
 from ._base import ImageSource
 
@@ -58,7 +64,7 @@ class SegmentationEdgesItemSource(ImageSource):
         return SegmentationEdgesItemRequest(arrayreq, self._layer, qrect, self._hoverIdChanged)
 
     def image_type(self):
-        return SegmentationEdgesItem
+        return BatchedSegmentationEdgesItem if self._layer.batched else SegmentationEdgesItem
 
 
 class SegmentationEdgesItemRequest(RequestABC):
@@ -75,24 +81,39 @@ class SegmentationEdgesItemRequest(RequestABC):
         # with a halo so that the QGraphicsItem can display edges on tile borders.
         # assert array_data.shape == (self.rect.width(), self.rect.height())
 
-        def create():
-            # Construct the path items
-            # This *could* be done outside of this create() function (and thus outside of the main thread),
-            # but (1) that seems to cause crashes on shutdown,
-            # and (2) performance gets worse, not better.
-            path_items = generate_path_items_for_labels(
-                self._layer.pen_table, self._layer.default_pen, array_data, None, isClickable=self._layer._isClickable
-            )
+        # The geometry (edge coordinates and line segments) is computed here, in the worker thread,
+        # into plain arrays. Only wrapping it into QGraphicsItems is left for the main thread.
+        line_segments = line_segments_for_labels(array_data)
+        batched = self._layer.batched
+        # Interactive edges are picked through a per-tile index rather than by hit-testing each edge's shape.
+        picking_index = None
+        if batched or self._layer._isClickable or self._hoverIdChanged:
+            picking_index = EdgePickingIndex(array_data, line_segments.keys())
 
+        def create():
             # All SegmentationEdgesItem(s) associated with this layer will share a common pen table.
             # They react immediately when the pen table is updated.
-            graphics_item = SegmentationEdgesItem(
-                path_items,
-                self._layer.pen_table,
-                self._layer.default_pen,
-                hoverIdChanged=self._hoverIdChanged,
-                isClickable=self._layer._isClickable,
-            )
+            if batched:
+                graphics_item = BatchedSegmentationEdgesItem(
+                    line_segments,
+                    picking_index,
+                    self._layer.pen_table,
+                    self._layer.default_pen,
+                    hoverIdChanged=self._hoverIdChanged,
+                    isClickable=self._layer._isClickable,
+                )
+            else:
+                path_items = path_items_from_line_segments(
+                    self._layer.pen_table, self._layer.default_pen, line_segments, isClickable=self._layer._isClickable
+                )
+                graphics_item = SegmentationEdgesItem(
+                    path_items,
+                    self._layer.pen_table,
+                    self._layer.default_pen,
+                    hoverIdChanged=self._hoverIdChanged,
+                    isClickable=self._layer._isClickable,
+                    picking_index=picking_index,
+                )
 
             # When the item is clicked, the layer is notified.
             graphics_item.edgeClicked.connect(self._layer.handle_edge_clicked)
@@ -101,5 +122,5 @@ class SegmentationEdgesItemRequest(RequestABC):
 
         # We're probably running in a non-main thread right now,
         # but we're only allowed to create QGraphicsItemObjects in the main thread.
-
+        # (Raises MainThreadUnavailable if the application quits in the meantime.)
         return execute_in_main_thread(create)
@@ -44,7 +44,7 @@ class ImageSourceABC(QABC):
     isDirty = abstractsignal(object)
 
     @abstractmethod
-    def request(self, slicing, along_through=None):
+    def request(self, slicing, along_through=None, step=1):
         pass
 
     @abstractmethod
@@ -64,7 +64,7 @@ class PlanarSliceSourceABC(QABC):
     isDirty = abstractsignal(object)
 
     @abstractmethod
-    def request(self, slicing, along_through=None):
+    def request(self, slicing, along_through=None, step=1):
         pass
 
     @abstractmethod
@@ -88,12 +88,23 @@ class DataSourceABC(QABC):
     isDirty = abstractsignal(object)
     numberOfChannelsChanged = abstractsignal(int)
 
+    # True if request() reads strided slicings cheaply, e.g. by strided reads or from a
+    # pyramid. Otherwise a step makes the datasource read at full resolution and
+    # subsample (see datasources.StridedRequest), which only saves transfer, not I/O.
+    supportsStep = False
+
     @property
     @abstractmethod
     def numberOfChannels(self) -> int: ...
 
     @abstractmethod
-    def request(self, slicing) -> RequestABC: ...
+    def request(self, slicing, step=1) -> RequestABC:
+        """
+        Request the data of slicing, reading only every step-th element along each axis
+        (a downsampled view, e.g. for a zoomed out viewer).
+
+        step -- an int for all axes, or one int per axis (see slicingtools.normalize_step)
+        """
 
     @abstractmethod
     def dtype(self): ...
@@ -22,6 +22,7 @@
 import logging
 from typing import Tuple, Optional, Set
 
+import numpy
 from qtpy.QtCore import QObject, Signal
 
 from volumina.config import CONFIG
@@ -40,12 +41,24 @@ logger = logging.getLogger(__name__)
 
 
 class PlanarSliceRequest(RequestABC):
-    def __init__(self, domainArrayRequest, sliceProjection):
+    def __init__(self, domainArrayRequest, sliceProjection, step=1, shape=None):
+        """
+        step  -- if > 1, domainArrayRequest is strided along abscissa and ordinate
+                 and its result is scaled up (nearest neighbor) to shape
+        shape -- shape of the domain array at full resolution (None for unbounded axes)
+        """
         self._ar = domainArrayRequest
         self._sp = sliceProjection
+        self._step = step
+        self._shape = shape
 
     def wait(self):
-        return self._sp(self._ar.wait())
+        a = self._ar.wait()
+        if self._step > 1:
+            for axis in (self._sp.abscissa, self._sp.ordinate):
+                a = numpy.repeat(a, self._step, axis=axis)
+            a = a[tuple(slice(None, n) for n in self._shape)]
+        return self._sp(a)
 
     def cancel(self):
         self._ar.cancel()
@@ -110,7 +123,12 @@ class PlanarSliceSource(QObject, PlanarSliceSourceABC):
         through[index] = value
         self.through = through
 
-    def request(self, slicing2D, along_through=None):
+    @property
+    def supportsStep(self):
+        """Whether the datasource reads strided slicings faster than full ones (see request())"""
+        return getattr(self._datasource, "supportsStep", False)
+
+    def request(self, slicing2D, along_through=None, step=1):
         """Return a SliceRequest for a subregion of the slice.
 
         By default the currently set through value is used for
@@ -122,6 +140,10 @@ class PlanarSliceSource(QObject, PlanarSliceSourceABC):
         slicing2D    -- pair of 'slice' objects: abscissa, ordinate
         along_trough -- sequence of pairs or None;
                         pair is '(along axis, through value)'
+        step         -- read only every step-th pixel along abscissa and ordinate
+                        (a low resolution preview, or a zoomed out view), see
+                        DataSourceABC.request(); the result has the full size nevertheless.
+                        Ignored if the datasource can't subsample cheaply (see supportsStep).
 
         Returns: a SliceRequest for a 2d array
 
@@ -139,9 +161,19 @@ class PlanarSliceSource(QObject, PlanarSliceSourceABC):
 
         if CONFIG.verbose_pixelpipeline:
             logger.info(
-                "PlanarSliceSource requests '%r' from data source '%s'", slicing, type(self._datasource).__qualname__
+                "PlanarSliceSource requests '%r' (step %d) from data source '%s'",
+                slicing,
+                step,
+                type(self._datasource).__qualname__,
             )
 
+        if step > 1 and self.supportsStep:
+            shape = tuple(None if sl.stop is None else sl.stop - (sl.start or 0) for sl in slicing)
+            steps = tuple(
+                step if axis in (self.sliceProjection.abscissa, self.sliceProjection.ordinate) else 1
+                for axis in range(len(slicing))
+            )
+            return PlanarSliceRequest(self._datasource.request(slicing, steps), self.sliceProjection, step, shape)
         return PlanarSliceRequest(self._datasource.request(slicing), self.sliceProjection)
 
     def setDirty(self, slicing):
@@ -0,0 +1,183 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+import logging
+import time
+from collections import deque
+
+from qtpy.QtCore import QObject, Qt, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class TimeSeriesPlayer(QObject):
+    """
+    Plays back the time axis at a target frame rate.
+
+    The next bufferSize() time points are read ahead through the render pool
+    into the tile caches of the image scenes (one cached stack per time point).
+    Frames are shown according to the wall clock: a frame that is not ready
+    when it is due is dropped in favour of the most recent ready one, so that
+    slow backends lower the achieved frame rate instead of slowing down the movie.
+
+    Signals:
+    playingChanged     -- playback was started (True) or stopped (False)
+    achievedFpsChanged -- the measured frame rate over the last FPS_WINDOW seconds
+    """
+
+    playingChanged = Signal(bool)
+    achievedFpsChanged = Signal(float)
+
+    BUFFER_SIZE = 10
+    FPS_WINDOW = 1.0  # seconds
+
+    def __init__(self, posModel, imageScenes, parent=None, clock=time.perf_counter):
+        super(TimeSeriesPlayer, self).__init__(parent)
+        self._posModel = posModel
+        self._imageScenes = imageScenes
+        self._clock = clock
+        self._bufferSize = self.BUFFER_SIZE
+
+        self._fps = 0.0
+        self._loop = True
+        self._startTime = 0.0
+        self._startFrame = 0
+        self._current = 0  # number of the shown frame, counted from the start of the playback
+        self._dropped = 0
+        self._shownAt = deque()  # timestamps of the recently shown frames
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._onTick)
+
+    def setBufferSize(self, n):
+        """Number of upcoming time points to read ahead. Limited by the cache size of the scenes."""
+        self._bufferSize = n
+
+    def bufferSize(self):
+        return self._bufferSize
+
+    def isPlaying(self):
+        return self._timer.isActive()
+
+    def targetFps(self):
+        return self._fps
+
+    def achievedFps(self):
+        if len(self._shownAt) < 2:
+            return 0.0
+        return (len(self._shownAt) - 1) / max(self._shownAt[-1] - self._shownAt[0], 1e-6)
+
+    def droppedFrames(self):
+        """Number of frames skipped since the playback was started"""
+        return self._dropped
+
+    def play(self, fps, loop=True):
+        """
+        Start playing from the current time point.
+
+        fps  -- target frame rate
+        loop -- restart from the first time point after the last one
+                (otherwise the playback stops at the last time point)
+        """
+        assert fps > 0, "fps must be positive"
+        shape = self._posModel.shape5D
+        if shape is None or shape[0] < 2:
+            return
+
+        self._fps = float(fps)
+        self._loop = loop
+        self._startTime = self._clock()
+        self._startFrame = self._posModel.time
+        self._current = 0
+        self._dropped = 0
+        self._shownAt = deque([self._startTime])
+
+        # Tick twice per frame, so that frames that become ready late are shown soon.
+        self._timer.start(max(1, int(500 / self._fps)))
+        self._readAhead(1)
+        self.playingChanged.emit(True)
+
+    def stop(self):
+        if not self.isPlaying():
+            return
+        self._timer.stop()
+        for scene in self._imageScenes:
+            scene.setReadAheadTimes([])
+        self.playingChanged.emit(False)
+
+    def _timeAt(self, n):
+        """Time point of frame n, or None after the last time point (if not looping)"""
+        t = self._startFrame + n
+        n_times = self._posModel.shape5D[0]
+        if self._loop:
+            return t % n_times
+        return t if t < n_times else None
+
+    def _visibleScenes(self):
+        return [scene for scene in self._imageScenes if not scene.views() or scene.views()[0].isVisible()]
+
+    def _isReady(self, t):
+        return all(scene.isTimeReady(t) for scene in self._visibleScenes())
+
+    def _onTick(self):
+        now = self._clock()
+        due = int((now - self._startTime) * self._fps)
+        if not self._loop:
+            last = self._posModel.shape5D[0] - 1 - self._startFrame
+            if self._current >= last:
+                self.stop()
+                return
+            due = min(due, last)
+
+        # Show the most recent frame that is ready, dropping the ones before it.
+        for n in range(due, self._current, -1):
+            t = self._timeAt(n)
+            if self._isReady(t):
+                self._dropped += n - self._current - 1
+                self._current = n
+                self._show(t, now)
+                break
+
+        self._readAhead(max(self._current + 1, due))
+
+    def _show(self, t, now):
+        self._posModel.time = t
+        self._shownAt.append(now)
+        while self._shownAt[0] < now - self.FPS_WINDOW:
+            self._shownAt.popleft()
+        self.achievedFpsChanged.emit(self.achievedFps())
+
+    def _readAhead(self, first):
+        """Read ahead the ring buffer of bufferSize() frames starting at frame first"""
+        scenes = self._visibleScenes()
+        n = self._bufferSize
+        if scenes:
+            # Don't evict the buffered frames (and the shown one) from the tile caches.
+            n = max(0, min(n, min(scene.cacheSize() for scene in scenes) - 2))
+        times = []
+        for i in range(first, first + n):
+            t = self._timeAt(i)
+            if t is None or t in times:
+                break
+            times.append(t)
+        for scene in scenes:
+            scene.setReadAheadTimes(times)
@@ -144,6 +144,36 @@ def slicing2shape(slicing):
     return tuple(shape)
 
 
+def normalize_step(step, ndim):
+    """The step per axis of an ndim-dimensional slicing.
+
+    step is an int (the same for all axes) or a sequence of ndim ints.
+
+    >>> normalize_step(2, 3)
+    (2, 2, 2)
+
+    """
+    if isinstance(step, (int, np.integer)):
+        step = (step,) * ndim
+    step = tuple(int(s) for s in step)
+    if len(step) != ndim or any(s < 1 for s in step):
+        raise ValueError("Expected a positive step for each of %d axes, got %r" % (ndim, step))
+    return step
+
+
+def stride_slicing(slicing, step):
+    """Read only every step-th element along each axis of slicing (see normalize_step).
+
+    >>> stride_slicing((slice(0, 10), slice(4, 8)), (2, 1))
+    (slice(0, 10, 2), slice(4, 8, None))
+
+    """
+    return tuple(
+        sl if s == 1 else slice(sl.start, sl.stop, (sl.step or 1) * s)
+        for sl, s in zip(slicing, normalize_step(step, len(slicing)))
+    )
+
+
 def index2slice(slicing):
     """Convert integer indices to proper slice instances.
 
@@ -19,5 +19,5 @@
 # This information is also available on the ilastik web site at:
 #          http://ilastik.org/license/
 ###############################################################################
-from .tiling import Tiling
+from .tiling import Tiling, adaptiveTileWidth
 from .tileprovider import TileProvider
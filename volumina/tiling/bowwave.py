@@ -0,0 +1,158 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Axes of a stack id (see SyncedSliceSources.id)
+TIME_AXIS = 0
+SPACE_AXIS = 1
+CHANNEL_AXIS = 2
+
+
+class BowWave:
+    """
+    Predicts the slices the user is going to look at next, for preemptive fetching.
+
+    The scrolling velocity (in slices per second) is estimated from the timing
+    of the position changes reported via observe(). The faster the user scrolls,
+    the further ahead slices are prefetched: the bow wave covers the slices
+    the user will reach within `lookahead` seconds, but at least `min_depth`
+    and at most `max_depth` slices.
+
+    Only the axis (time, space or channel) that was moved last is considered.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 5,
+        min_depth: int = 1,
+        lookahead: float = 0.5,
+        smoothing: float = 0.5,
+        idle_timeout: float = 1.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args:
+            max_depth    -- maximal number of slices to prefetch
+            min_depth    -- number of slices to prefetch when the user is not scrolling (anymore)
+            lookahead    -- time span (in seconds) to prefetch slices for, at the current velocity
+            smoothing    -- weight of the previous velocity estimate, in [0, 1)
+            idle_timeout -- time (in seconds) without movement after which the user is considered idle
+            clock        -- returns the current time in seconds
+        """
+        assert 0 <= smoothing < 1
+        self.max_depth = max_depth
+        self.min_depth = min_depth
+        self.lookahead = lookahead
+        self.smoothing = smoothing
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+
+        self._axis: Optional[int] = None
+        self._velocity = 0.0  # slices per second, signed
+        self._last_position: Dict[int, Tuple[int, float]] = {}  # axis -> (value, timestamp)
+
+    @property
+    def axis(self) -> Optional[int]:
+        """The axis that was moved last, or None"""
+        return self._axis
+
+    @property
+    def velocity(self) -> float:
+        """The estimated velocity along axis, in slices per second (0 when idle)"""
+        if self._axis is None or self._isIdle():
+            return 0.0
+        return self._velocity
+
+    def reset(self):
+        self._axis = None
+        self._velocity = 0.0
+        self._last_position.clear()
+
+    def observe(self, axis: int, value: int) -> bool:
+        """
+        Report that the position along axis has changed to value.
+
+        Returns True if the user reversed the direction of movement (or switched
+        to a different axis), i.e. previously predicted slices are obsolete.
+        """
+        now = self._clock()
+        last = self._last_position.get(axis)
+        self._last_position[axis] = (value, now)
+        if last is None or last[0] == value:
+            return False
+
+        last_value, last_time = last
+        step = value - last_value
+        # Don't estimate from a single step after an idle phase (the velocity would be tiny).
+        dt = min(max(now - last_time, 1e-3), self.idle_timeout)
+        velocity = step / dt
+
+        changed_course = axis != self._axis or (velocity > 0) != (self._velocity > 0)
+        if changed_course:
+            self._velocity = velocity
+        else:
+            self._velocity = self.smoothing * self._velocity + (1 - self.smoothing) * velocity
+        self._axis = axis
+        return changed_course
+
+    def depth(self) -> int:
+        """Number of slices to prefetch"""
+        if self._axis is None or self.max_depth <= 0:
+            return 0
+        if self._isIdle():
+            return min(self.min_depth, self.max_depth)
+        depth = math.ceil(abs(self._velocity) * self.lookahead)
+        return max(self.min_depth, min(depth, self.max_depth))
+
+    def upcoming(self, through: Sequence[Tuple[int, int]], extents: Dict[int, int]) -> List[Tuple[int, ...]]:
+        """
+        Predict the next slices, ordered by the time the user is expected to reach them.
+
+        Args:
+            through -- the current position as (axis, value) pairs, see SyncedSliceSources.id
+            extents -- the number of slices along each axis
+
+        Returns: a list of positions with the same axes as through (values only)
+        """
+        axes = [axis for axis, _ in through]
+        if self._axis not in axes:
+            return []
+
+        i = axes.index(self._axis)
+        values = [value for _, value in through]
+        direction = 1 if self._velocity >= 0 else -1
+
+        result = []
+        for d in range(1, self.depth() + 1):
+            m = values[i] + d * direction
+            if not 0 <= m < extents[self._axis]:
+                break
+            upcoming = list(values)
+            upcoming[i] = m
+            result.append(tuple(upcoming))
+        return result
+
+    def _isIdle(self) -> bool:
+        _, last_time = self._last_position[self._axis]
+        return self._clock() - last_time > self.idle_timeout
@@ -119,6 +119,8 @@ class TilesCache:
 
         layerCacheDirty: A cache of dirty bits for all layers in layerCache
         layerCacheTimestamp: A cache of timestamps to track how recently each layer was needed.
+        layerCacheOrientation: The view orientation each layer in layerCache was rendered for
+                               (see TileProvider), so that it can be re-oriented instead of re-fetched.
 
         tileCacheDirty: A cache of dirty bits for the composite tiles
                         (i.e. for a given patch, if a single layer in the patch
@@ -153,6 +155,10 @@ class TilesCache:
         self._layerCacheTimestamp = MultiCache(default_factory=float, **kwargs)
         self._layerCacheTimestamp.add(first_stack_id)
 
+        # [stack_id][(ims, tile_id)] -> orientation (or None)
+        self._layerCacheOrientation = MultiCache(**kwargs)
+        self._layerCacheOrientation.add(first_stack_id)
+
     @property
     def maxstacks(self):
         return self._maxstacks
@@ -241,6 +247,30 @@ class TilesCache:
         assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
         return self._layerCache[stack_id][(layer_id, tile_id)]
 
+    def layerTileOrientation(self, stack_id, layer_id, tile_id):
+        assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
+        return self._layerCacheOrientation[stack_id][(layer_id, tile_id)]
+
+    def reorientLayerTile(self, stack_id, layer_id, tile_id, old_img, img, orientation):
+        """
+        Replace a layer tile by a re-oriented version of it (without touching its dirty bit or timestamp),
+        unless the tile was replaced by a newer fetch in the meantime.
+        """
+        assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
+        if self._layerCache[stack_id][(layer_id, tile_id)] is old_img:
+            self._layerCache[stack_id][(layer_id, tile_id)] = img
+            self._layerCacheOrientation[stack_id][(layer_id, tile_id)] = orientation
+
+    def layerTiles(self):
+        """
+        Iterate over all layer tiles in the cache, as (stack_id, layer_id, tile_id, img)
+        """
+        assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
+        for stack_id in self._layerCache:
+            for (layer_id, tile_id), img in list(self._layerCache[stack_id].items()):
+                if img is not None:
+                    yield stack_id, layer_id, tile_id, img
+
     def layerTileDirty(self, stack_id, layer_id, tile_id):
         assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
         return self._layerCacheDirty[stack_id][(layer_id, tile_id)]
@@ -268,6 +298,19 @@ class TilesCache:
             for entry in dirty_entries:
                 del self._layerCacheDirty[stack_id][entry]
 
+    def retainLayers(self, layer_ids):
+        """
+        Drop the tiles of all layers except the given ones, in all stacks (e.g. after a layer was removed).
+        Layers that are new to the cache need no entries: missing tiles are empty and dirty.
+        """
+        assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
+        layer_ids = set(layer_ids)
+        for cache in (self._layerCache, self._layerCacheDirty, self._layerCacheTimestamp, self._layerCacheOrientation):
+            for stack_id in cache:
+                entries = cache[stack_id]
+                for entry in [entry for entry in entries if entry[0] not in layer_ids]:
+                    del entries[entry]
+
     def layerTileTimestamp(self, stack_id, layer_id, tile_id):
         assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
         return self._layerCacheTimestamp[stack_id][(layer_id, tile_id)]
@@ -279,6 +322,7 @@ class TilesCache:
         self._layerCache.add(stack_id)
         self._layerCacheDirty.add(stack_id)
         self._layerCacheTimestamp.add(stack_id)
+        self._layerCacheOrientation.add(stack_id)
 
     def touchStack(self, stack_id):
         assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
@@ -287,11 +331,28 @@ class TilesCache:
         self._layerCache.touch(stack_id)
         self._layerCacheDirty.touch(stack_id)
         self._layerCacheTimestamp.touch(stack_id)
+        self._layerCacheOrientation.touch(stack_id)
+
+    def setLayerTilePreview(self, stack_id, layer_id, tile_id, img, orientation=None):
+        """
+        Store a low resolution stand-in for a layer tile that has not been fetched yet.
+        The layer tile stays dirty (so that it is fetched at full resolution when needed),
+        and the preview is discarded if the tile has been fetched in the meantime.
+        """
+        assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
+        if (
+            self._layerCacheDirty[stack_id][(layer_id, tile_id)]
+            and self._layerCache[stack_id][(layer_id, tile_id)] is None
+        ):
+            self._layerCache[stack_id][(layer_id, tile_id)] = img
+            self._layerCacheOrientation[stack_id][(layer_id, tile_id)] = orientation
+            self._tileCacheDirty[stack_id][tile_id] = True
 
-    def updateTileIfNecessary(self, stack_id, layer_id, tile_id, req_timestamp, img):
+    def updateTileIfNecessary(self, stack_id, layer_id, tile_id, req_timestamp, img, orientation=None):
         assert self._lock.locked(), "You must claim the _TileCache via a context manager before calling this function."
         if req_timestamp > self._layerCacheTimestamp[stack_id][(layer_id, tile_id)]:
             self._layerCache[stack_id][(layer_id, tile_id)] = img
+            self._layerCacheOrientation[stack_id][(layer_id, tile_id)] = orientation
             self._layerCacheDirty[stack_id][(layer_id, tile_id)] = False
             self._layerCacheTimestamp[stack_id][(layer_id, tile_id)] = req_timestamp
 
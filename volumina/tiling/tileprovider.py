@@ -26,7 +26,7 @@ import time
 from contextlib import contextmanager
 from functools import partial
 
-from typing import Callable, Optional
+from typing import Callable, Collection, Optional, Sequence, Tuple
 from qtpy.QtCore import QObject, QRect, QRectF, Signal
 from qtpy.QtGui import QImage, QPainter, QTransform
 from qtpy.QtWidgets import QGraphicsItem
@@ -58,8 +58,10 @@ if USE_LAZYFLOW_THREADPOOL:
 
     renderer_pool = LazyflowRequestBuffer(Request.global_thread_pool.num_workers)
 
-    def clear_non_relevant_tasks_from_queue(vp: "TileProvider", stack_id: StackId, keep_tiles: list[int]):
-        renderer_pool.clear_non_relevant_tasks_from_queue(vp, stack_id, keep_tiles)
+    def clear_non_relevant_tasks_from_queue(
+        vp: "TileProvider", stack_id: StackId, keep_tiles: list[int], keep_stacks: Collection[StackId] = ()
+    ):
+        renderer_pool.clear_non_relevant_tasks_from_queue(vp, stack_id, keep_tiles, keep_stacks)
 
     def submit_to_threadpool(
         fn: Callable[[], None],
@@ -129,12 +131,19 @@ class TileProvider(QObject):
             "qimg",  # composited tile as a QImage
             "qgraphicsitems",  # list of QGraphicsItems to be displayed over the tile
             "rectF",  # The patch dimensions (see Tiling class, above)
-            "progress",
+            "progress",  # How 'complete' the composite tile is
+            # (depending on how many layers are still dirty)
+            "deferred",  # Whether the refresh of this tile was postponed (frame budget exceeded)
         ],
-    )  # How 'complete' the composite tile is
-    # (depending on how many layers are still dirty)
+        defaults=(False,),
+    )
 
     sceneRectChanged = Signal(QRectF)
+    prefetchCapacityAvailable = Signal()
+
+    # Maximal number of prefetch tasks that may be queued or running in the render pool at once.
+    # Keeps the prefetching from occupying the workers needed for the visible tiles.
+    MAX_PREFETCH_TASKS = 2
 
     @property
     def axesSwapped(self):
@@ -144,12 +153,17 @@ class TileProvider(QObject):
     def axesSwapped(self, value):
         self._axesSwapped = value
 
-    def __init__(self, tiling: Tiling, stackedImageSources: StackedImageSources, cache_size: int = 100) -> None:
+    def __init__(
+        self, tiling: Tiling, stackedImageSources: StackedImageSources, cache_size: int = 100, step: int = 1
+    ) -> None:
         """
         Keyword Arguments:
         cache_size                -- maximal number of encountered stacks
                                      to cache, i.e. slices if the imagesources
                                      draw from slicesources (default 10)
+        step                      -- fetch only every step-th pixel of the layers
+                                     that support it (see ImageSource.supportsStep),
+                                     e.g. for a zoomed out view
         parent                    -- QObject
 
         """
@@ -157,12 +171,26 @@ class TileProvider(QObject):
         QObject.__init__(self, parent=None)
 
         self.tiling = tiling
+        self.step = step
         self.axesSwapped = False
         self._sims = stackedImageSources
 
         self._current_stack_id = self._sims.stackId
         self._cache = TilesCache(self._current_stack_id, self._sims, maxstacks=cache_size)
 
+        self.max_prefetch_tasks = self.MAX_PREFETCH_TASKS
+        self._prefetch_lock = RLock()
+        self._prefetch_in_flight = 0
+        self._prefetch_generation = 0
+        # number of prefetch tasks in the render pool per (stack id, tile number)
+        self._prefetch_tiles = collections.defaultdict(int)
+
+        # stacks kept fetched ahead of time (see setReadAhead())
+        self._read_ahead = set()
+        self._read_ahead_generation = 0
+        # stacks prefetched ahead of the slicing position (see setPrefetching())
+        self._prefetching = set()
+
         self._sims.layerDirty.connect(self._onLayerDirty)
         self._sims.visibleChanged.connect(self._onVisibleChanged)
         self._sims.opacityChanged.connect(self._onOpacityChanged)
@@ -177,7 +205,7 @@ class TileProvider(QObject):
     def set_cache_size(self, new_size):
         self._cache.set_maxstacks(new_size)
 
-    def getTiles(self, rectF: QRectF, vp_rectF: QRectF):
+    def getTiles(self, rectF: QRectF, vp_rectF: QRectF, deadline: Optional[float] = None):
         """Get tiles in rect and request a refresh.
 
         Returns tiles intersecting with rectF immediately and requests
@@ -185,18 +213,25 @@ class TileProvider(QObject):
         tiles may be already (partially) updated. If you want to wait
         until the rendering is fully complete, call join().
 
+        If a deadline (in time.perf_counter() seconds) is given, tiles that
+        could not be refreshed before it are returned with deferred=True.
         """
         tile_nos = self.tiling.intersected(rectF)
         stack_id = self._current_stack_id
         keep_tiles = self.tiling.intersected(vp_rectF)
-        clear_non_relevant_tasks_from_queue(self, stack_id, keep_tiles)
-        self.requestRefresh(rectF)
+        keep_throughs = self._read_ahead | self._prefetching
+        clear_non_relevant_tasks_from_queue(
+            self, stack_id, keep_tiles, [self._stackIdAt(through) for through in keep_throughs]
+        )
+        deferred = set(self.requestRefresh(rectF, deadline=deadline))
 
         for tile_no in tile_nos:
             with self._cache:
                 qimg, progress = self._cache.tile(stack_id, tile_no)
                 qgraphicsitems = self._cache.graphicsitem_layers(stack_id, tile_no)
-            yield TileProvider.Tile(tile_no, qimg, qgraphicsitems, QRectF(self.tiling.imageRects[tile_no]), progress)
+            yield TileProvider.Tile(
+                tile_no, qimg, qgraphicsitems, QRectF(self.tiling.imageRects[tile_no]), progress, tile_no in deferred
+            )
 
     def waitForTiles(self, rectF=QRectF(), sceneRectF=QRectF()):
         """
@@ -210,20 +245,55 @@ class TileProvider(QObject):
             for tile in tiles:
                 finished &= tile.progress >= 1.0
 
-    def requestRefresh(self, rectF: QRectF, stack_id: Optional[StackId] = None, prefetch=False, layer_indexes=None):
+    def requestRefresh(
+        self,
+        rectF: QRectF,
+        stack_id: Optional[StackId] = None,
+        prefetch=False,
+        layer_indexes=None,
+        deadline: Optional[float] = None,
+        capped: bool = False,
+        preview: int = 1,
+    ) -> list[int]:
         """Requests tiles to be refreshed.
 
         Returns immediately. Call join() to wait for
         the end of the rendering.
 
+        Refreshing a tile may involve synchronous work on the calling thread
+        (blending, fetching 'direct' layers). If a deadline (in
+        time.perf_counter() seconds) is given, no new tile is started after it
+        has passed. At least one dirty tile is always refreshed.
+        If capped is set, no new tile is started while the render pool already
+        holds max_prefetch_tasks prefetch tasks.
+        When prefetching, tiles that still have prefetch tasks in the render pool
+        are not submitted again, so that resumed prefetches only start the remaining tiles.
+
+        Returns the numbers of the tiles that were skipped because of the deadline or the cap.
         """
         stack_id = stack_id or self._current_stack_id
         tile_nos = self.tiling.intersected(rectF)
 
-        for tile_no in tile_nos:
-            self._refreshTile(stack_id, tile_no, prefetch, layer_indexes)
-
-    def prefetch(self, rectF, through, layer_indexes=None):
+        refreshed_any = False
+        for i, tile_no in enumerate(tile_nos):
+            if deadline is not None and refreshed_any and time.perf_counter() > deadline:
+                return tile_nos[i:]
+            if capped and self.prefetchSaturated:
+                return tile_nos[i:]
+            if prefetch and self._isPrefetching(stack_id, tile_no):
+                continue
+            refreshed_any |= self._refreshTile(stack_id, tile_no, prefetch, layer_indexes, preview)
+        return []
+
+    def prefetch(
+        self,
+        rectF,
+        through,
+        layer_indexes=None,
+        deadline: Optional[float] = None,
+        capped: bool = False,
+        preview: int = 1,
+    ) -> list[int]:
         """Request fetching of tiles in advance.
 
         Returns immediately. Prefetch will commence after all regular
@@ -232,21 +302,150 @@ class TileProvider(QObject):
         changes. Several calls to prefetch are handeled in Fifo
         order.
 
+        through -- the values along the synced axes of the current stack id
+        preview -- if > 1, only fetch low resolution previews, reading every preview-th pixel,
+                   of the layers that support it (see ImageSource.supportsStep).
+                   The tiles are still fetched at full resolution when they are shown.
+
+        Returns the numbers of the tiles that were skipped, because of the deadline
+        or because the render pool already holds max_prefetch_tasks prefetch tasks
+        (only if capped is set).
         """
         if self.cache_size == 0:
-            return
+            return []
 
-        stack_id = (self._current_stack_id[0], tuple(enumerate(through)))
+        stack_id = self._stackIdAt(through)
         with self._cache:
             if stack_id not in self._cache:
                 self._cache.addStack(stack_id)
                 self._cache.touchStack(self._current_stack_id)
 
-        self.requestRefresh(rectF, stack_id, prefetch=True, layer_indexes=layer_indexes)
+        return self.requestRefresh(
+            rectF,
+            stack_id,
+            prefetch=True,
+            layer_indexes=layer_indexes,
+            deadline=deadline,
+            capped=capped,
+            preview=preview,
+        )
+
+    def setReadAhead(self, rectF: QRectF, throughs: Sequence[Tuple[int, ...]]):
+        """
+        Keep the stacks at throughs (values along the synced axes, see prefetch())
+        fetched ahead of time, e.g. the upcoming frames of a time series playback.
+
+        Stacks that were not read ahead before are prefetched. Their tasks are not
+        removed from the render pool when the visible tiles change. Pass an empty
+        list to stop reading ahead.
+        """
+        throughs = [tuple(through) for through in throughs]
+        with self._prefetch_lock:
+            generation = self._prefetch_generation
+        if generation != self._read_ahead_generation:
+            # cancelPrefetch() was called in the meantime, start over
+            self._read_ahead = set()
+            self._read_ahead_generation = generation
+        new = [through for through in throughs if through not in self._read_ahead]
+        self._read_ahead = set(throughs)
+        for through in new:
+            self.prefetch(rectF, through)
+
+    def setPrefetching(self, throughs: Sequence[Tuple[int, ...]]):
+        """
+        Mark the stacks at throughs (see prefetch()) as prefetched ahead of the
+        slicing position, e.g. the upcoming slices of the bow wave in ImageScene2D.
+
+        Like those of read-ahead stacks, their tasks are not removed from the render pool
+        when the visible tiles change, since they would not be prefetched again.
+        Cleared by cancelPrefetch().
+        """
+        self._prefetching = set(tuple(through) for through in throughs)
+
+    def isStackReady(self, rectF: QRectF, through: Tuple[int, ...]) -> bool:
+        """Whether the visible layers of the tiles in rectF are fetched for the stack at through"""
+        stack_id = self._stackIdAt(through)
+        layers = [
+            ims
+            for ims, visible, occluded in zip(
+                self._sims.viewImageSources(), self._sims.viewVisible(), self._sims.viewOccluded()
+            )
+            if visible and not occluded
+        ]
+        with self._cache:
+            if stack_id not in self._cache:
+                return False
+            return not any(
+                self._cache.layerTileDirty(stack_id, ims, tile_no)
+                for tile_no in self.tiling.intersected(rectF)
+                for ims in layers
+            )
+
+    def _stackIdAt(self, through: Tuple[int, ...]) -> StackId:
+        """The stack id with the values along the synced axes replaced by through"""
+        along = [axis for axis, _ in self._current_stack_id[1]] or range(len(through))
+        return (self._current_stack_id[0], tuple(zip(along, through)))
+
+    @property
+    def prefetchSaturated(self) -> bool:
+        """Whether the render pool holds the maximal number of prefetch tasks"""
+        with self._prefetch_lock:
+            return self._prefetch_in_flight >= self.max_prefetch_tasks
+
+    def cancelPrefetch(self):
+        """
+        Drop all prefetch tasks that have not started yet
+        (e.g. because the user reversed the scrolling direction).
+        """
+        with self._prefetch_lock:
+            self._prefetch_generation += 1
+            # The dropped tasks don't fetch anything, so their tiles may be prefetched again.
+            self._prefetch_tiles.clear()
+        self._prefetching = set()
+
+    def _isPrefetching(self, stack_id: StackId, tile_no: int) -> bool:
+        """Whether the render pool holds prefetch tasks for the tile"""
+        with self._prefetch_lock:
+            return self._prefetch_tiles.get((stack_id, tile_no), 0) > 0
+
+    def _prefetchTask(self, fetch_fn: Callable[[], None], stack_id: StackId, tile_no: int) -> Callable[[], None]:
+        """
+        Wrap fetch_fn for submission as a prefetch task, so that it counts
+        towards max_prefetch_tasks and is skipped after cancelPrefetch().
+        """
+        with self._prefetch_lock:
+            self._prefetch_in_flight += 1
+            self._prefetch_tiles[(stack_id, tile_no)] += 1
+            generation = self._prefetch_generation
+
+        def prefetch_fn():
+            try:
+                if generation == self._prefetch_generation:
+                    fetch_fn()
+            finally:
+                self.prefetchTaskDone(stack_id, tile_no)
+
+        return prefetch_fn
+
+    def prefetchTaskDone(self, stack_id: StackId, tile_no: int):
+        """
+        Called when a prefetch task of the tile has finished, or was removed from
+        the render pool without running (see LazyflowRequestBuffer).
+        """
+        with self._prefetch_lock:
+            self._prefetch_in_flight -= 1
+            key = (stack_id, tile_no)
+            if self._prefetch_tiles.get(key, 0) > 1:
+                self._prefetch_tiles[key] -= 1
+            else:
+                # Also covers tasks submitted before cancelPrefetch()
+                self._prefetch_tiles.pop(key, None)
+        self.prefetchCapacityAvailable.emit()
 
-    def _refreshTile(self, stack_id: StackId, tile_no: int, prefetch=False, layer_indexes=None):
+    def _refreshTile(self, stack_id: StackId, tile_no: int, prefetch=False, layer_indexes=None, preview=1) -> bool:
         """
         Trigger a refresh of a particular tile.
+        Returns False if the tile was up-to-date, i.e. there was nothing to do.
 
         In the common case**, this function does the following:
 
@@ -263,6 +462,10 @@ class TileProvider(QObject):
 
         **Less common cases:
              - In 'prefetch' mode: don't bother rendering composite tile, just fetch the layers.
+             - In 'preview' mode (prefetch only): fetch low resolution versions of the layers
+               that don't have any image in the cache yet.
+             - With a step (zoomed out views), layers that support it are fetched at that
+               step, and previews at preview * step.
              - For 'direct' layers, don't submit the request to the threadpool,
                just execute it immediately.
         """
@@ -270,17 +473,12 @@ class TileProvider(QObject):
         if layer_indexes:
             layers = [layers[i] for i in layer_indexes]
 
-        if not self.axesSwapped:
-            # Who came up with this transform?
-            transform = QTransform(0, 1, 0, 1, 0, 0, 1, 1, 1)
-        else:
-            transform = QTransform().rotate(90).scale(1, -1)
-        transform *= self.tiling.data2scene
+        orientation = self._orientation()
 
         try:
             with self._cache:
                 if not self._cache.tileDirty(stack_id, tile_no):
-                    return
+                    return False
 
             if not prefetch:
                 with self._cache:
@@ -303,12 +501,23 @@ class TileProvider(QObject):
                 if not (layer_dirty and not self._sims.isOccluded(ims) and self._sims.isVisible(ims)):
                     continue
 
-                rect = self.tiling.imageRects[tile_no]
-                dataRect = self.tiling.scene2data.mapRect(rect)
+                if preview > 1:
+                    with self._cache:
+                        has_image = self._cache.layerTile(stack_id, ims, tile_no) is not None
+                    if has_image or not ims.supportsStep:
+                        continue
+
+                dataRect = self._tileDataRect(tile_no)
+                step = preview * self.step
+                if step > 1 and not ims.supportsStep:
+                    step = 1
 
                 try:
                     # Create the request object right now, from the main thread.
-                    ims_req = ims.request(dataRect, stack_id[1])
+                    if step > 1:
+                        ims_req = ims.request(dataRect, stack_id[1], step=step)
+                    else:
+                        ims_req = ims.request(dataRect, stack_id[1])
                 except IndeterminateRequestError:
                     # In ilastik, the viewer is still churning even as the user might be changing settings in the UI.
                     # Settings changes can cause 'slot not ready' errors during graph setup.
@@ -319,7 +528,15 @@ class TileProvider(QObject):
 
                 timestamp = _Counter.inc()
                 fetch_fn = partial(
-                    self._fetch_layer_tile, timestamp, ims, transform, tile_no, stack_id, ims_req, self._cache
+                    self._fetch_layer_tile,
+                    timestamp,
+                    ims,
+                    orientation,
+                    tile_no,
+                    stack_id,
+                    ims_req,
+                    self._cache,
+                    preview=preview > 1,
                 )
 
                 if ims.direct and not prefetch:
@@ -334,6 +551,8 @@ class TileProvider(QObject):
                     # and then more recent tasks to take priority (more recent -> process first)
                     layer_priority = ims.priority
                     priority: Priority = (prefetch, -layer_priority, -timestamp)
+                    if prefetch:
+                        fetch_fn = self._prefetchTask(fetch_fn, stack_id, tile_no)
                     submit_to_threadpool(fetch_fn, priority, self, stack_id, tile_no)
 
             if need_reblend:
@@ -346,6 +565,7 @@ class TileProvider(QObject):
                     )
         except KeyError:
             pass
+        return True
 
     def setTileDirty(self, stack_id, tile_no):
         with self._cache:
@@ -364,8 +584,7 @@ class TileProvider(QObject):
                 # Don't blend QGraphicsItem into the final tile.
                 # (The ImageScene will just draw it on top of everything.)
                 # But this is a convenient place to update the opacity/visible state.
-                with self._cache:
-                    patch = self._cache.layerTile(stack_id, layerImageSource, tile_nr)
+                patch = self._orientedLayerTile(stack_id, layerImageSource, tile_nr)
                 if patch is not None:
                     assert isinstance(
                         patch, image_type
@@ -383,8 +602,7 @@ class TileProvider(QObject):
             if not visible or layerOpacity == 0.0:
                 continue
 
-            with self._cache:
-                patch = self._cache.layerTile(stack_id, layerImageSource, tile_nr)
+            patch = self._orientedLayerTile(stack_id, layerImageSource, tile_nr)
 
             if patch is not None:
                 assert isinstance(
@@ -403,7 +621,61 @@ class TileProvider(QObject):
 
         return qimg
 
-    def _fetch_layer_tile(self, timestamp, ims, transform, tile_nr, stack_id, ims_req, cache):
+    def _orientation(self):
+        """
+        The current view orientation: layer tiles are rendered for it, and re-oriented
+        when they are blended after the view was rotated or its axes swapped.
+        """
+        return QTransform(self.tiling.data2scene), self.axesSwapped
+
+    @staticmethod
+    def _imageTransform(orientation):
+        """The transform from a QImage produced by an ImageSource to the tile in the given orientation"""
+        data2scene, axesSwapped = orientation
+        if not axesSwapped:
+            # Who came up with this transform?
+            transform = QTransform(0, 1, 0, 1, 0, 0, 1, 1, 1)
+        else:
+            transform = QTransform().rotate(90).scale(1, -1)
+        return transform * data2scene
+
+    def _tileDataRect(self, tile_nr):
+        """The rect of the given tile in data coordinates (the same in every orientation)"""
+        return self.tiling.dataRects[tile_nr]
+
+    def _itemTransform(self, orientation, tile_nr):
+        """The transform that places a QGraphicsItem produced by an ImageSource on its tile"""
+        data_rect = self._tileDataRect(tile_nr)
+        return QTransform.fromTranslate(data_rect.left(), data_rect.top()) * orientation[0]
+
+    def _orientedLayerTile(self, stack_id, ims, tile_nr):
+        """
+        The cached layer tile, brought into the current orientation
+        if it was rendered for another one (instead of fetching it again).
+        """
+        orientation = self._orientation()
+        with self._cache:
+            patch = self._cache.layerTile(stack_id, ims, tile_nr)
+            patch_orientation = self._cache.layerTileOrientation(stack_id, ims, tile_nr)
+        if patch is None or patch_orientation is None or patch_orientation == orientation:
+            return patch
+
+        if isinstance(patch, QImage):
+            oriented = patch.transformed(
+                self._imageTransform(patch_orientation).inverted()[0] * self._imageTransform(orientation)
+            )
+        else:
+            oriented = patch
+            patch.setTransform(
+                patch.transform()
+                * self._itemTransform(patch_orientation, tile_nr).inverted()[0]
+                * self._itemTransform(orientation, tile_nr)
+            )
+        with self._cache:
+            self._cache.reorientLayerTile(stack_id, ims, tile_nr, patch, oriented, orientation)
+        return oriented
+
+    def _fetch_layer_tile(self, timestamp, ims, orientation, tile_nr, stack_id, ims_req, cache, preview=False):
         """
         Fetch a single tile from a layer (ImageSource).
 
@@ -413,8 +685,9 @@ class TileProvider(QObject):
             The timestamp at which ims_req was created
         ims
             The layer (image source) we're fetching from
-        transform
-            The transform to apply to the fetched data, before storing it in the cache
+        orientation
+            The view orientation to render the fetched data for, before storing it in the cache
+            (see _orientation())
         tile_nr
             The ID of the fetched tile
         stack_id
@@ -424,7 +697,8 @@ class TileProvider(QObject):
             the appropriate type for the layer (i.e. either a QImage or a QGraphicsItem)
         cache
             The value of self._cache at the time the ims_req was created.
-            (The cache can be replaced occasionally. See TileProvider._onSizeChanged().)
+        preview
+            Whether ims_req produces a low resolution preview, which must not replace the actual layer tile.
         """
         try:
             try:
@@ -439,20 +713,23 @@ class TileProvider(QObject):
             if timestamp > layerTimestamp:
                 img = ims_req.wait()
                 if isinstance(img, QImage):
-                    img = img.transformed(transform)
+                    img = img.transformed(self._imageTransform(orientation))
                 elif isinstance(img, QGraphicsItem):
-                    # FIXME: It *seems* like applying the same transform to QImages and QGraphicsItems
-                    #        makes sense here, but for some strange reason it isn't right.
-                    #        For QGraphicsItems, it seems obvious that this is the correct transform.
-                    #        I do not understand the formula that produces 'transform', which is used for QImage tiles.
-                    img.setTransform(QTransform.fromTranslate(tile_rect.left(), tile_rect.top()), combine=True)
-                    img.setTransform(self.tiling.data2scene, combine=True)
+                    # QImages are produced with their own axis order (see _imageTransform()),
+                    # QGraphicsItems in data coordinates of the tile.
+                    img.setTransform(self._itemTransform(orientation, tile_nr), combine=True)
                 else:
                     assert False, "Unexpected image type: {}".format(type(img))
 
                 with cache:
                     try:
-                        cache.updateTileIfNecessary(stack_id, ims, tile_nr, timestamp, img)
+                        if ims not in self._sims.viewImageSources():
+                            # The layer was removed in the meantime (see _onSizeChanged())
+                            return
+                        if preview:
+                            cache.setLayerTilePreview(stack_id, ims, tile_nr, img, orientation)
+                        else:
+                            cache.updateTileIfNecessary(stack_id, ims, tile_nr, timestamp, img, orientation)
                     except KeyError:
                         pass
 
@@ -542,12 +819,31 @@ class TileProvider(QObject):
         if self._sims.isVisible(ims) and not self._sims.isOccluded(ims):
             self.sceneRectChanged.emit(QRectF())
 
+    def _onOrientationChanged(self):
+        """
+        Called when the view was rotated or its axes were swapped (i.e. tiling.data2scene changed).
+        The layer tiles are kept, as they cover the same data in every orientation:
+        QImages are re-oriented when they are blended again, QGraphicsItems (which are
+        in the scene already) are moved right away. Only the composite tiles are re-rendered.
+        """
+        with self._cache:
+            layer_tiles = list(self._cache.layerTiles())
+        for stack_id, ims, tile_nr, img in layer_tiles:
+            if isinstance(img, QGraphicsItem):
+                self._orientedLayerTile(stack_id, ims, tile_nr)
+        with self._cache:
+            self._cache.setAllTilesDirty()
+        self.sceneRectChanged.emit(QRectF())
+
     def _onSizeChanged(self):
         """
-        Called when the StackedImageSources object we depend on has changed it's size.
-        This is rare, but it means that the entire tile cache is obsolete.
+        Called when an ImageSource was added to or removed from the StackedImageSources we depend on.
+        Only the layer tiles of removed sources are dropped (new sources start without tiles),
+        the composite tiles all need to be re-rendered.
         """
-        self._cache = TilesCache(self._current_stack_id, self._sims, maxstacks=self.cache_size)
+        with self._cache:
+            self._cache.retainLayers(self._sims.viewImageSources())
+            self._cache.setAllTilesDirty()
         self.sceneRectChanged.emit(QRectF())
 
     def _onOrderChanged(self):
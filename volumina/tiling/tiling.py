@@ -20,8 +20,10 @@
 # 		   http://ilastik.org/license/
 ###############################################################################
 import logging
+import math
+from collections.abc import Sequence
 
-from qtpy.QtCore import QRect, QRectF
+from qtpy.QtCore import QPointF, QRect, QRectF
 from qtpy.QtGui import QTransform
 
 # volumina
@@ -29,11 +31,92 @@ from volumina.patchAccessor import PatchAccessor
 
 logger = logging.getLogger(__name__)
 
+# bounds of the tile widths chosen by adaptiveTileWidth
+MIN_TILE_WIDTH = 64
+MAX_TILE_WIDTH = 2048
+
+
+def adaptiveTileWidth(baseWidth: int, zoomLevel: int = 0, chunkWidths=()) -> int:
+    """
+    The tile width (in data pixels) for a view.
+
+    Args:
+        baseWidth   -- tile width at 100% zoom
+        zoomLevel   -- the view is zoomed out by 2**zoomLevel (zoomed in if negative);
+                       the tile width is scaled along, so that tiles keep their size on the screen
+        chunkWidths -- extents of the native chunks of the datasources in the slice plane;
+                       the width becomes a multiple or a divisor of their least common multiple,
+                       so that tiles are aligned to the chunks
+    """
+    # the bounds only limit the scaling, a base width beyond them is kept at 100% zoom
+    lower, upper = min(MIN_TILE_WIDTH, baseWidth), max(MAX_TILE_WIDTH, baseWidth)
+    width = min(max(baseWidth * 2.0**zoomLevel, lower), upper)
+
+    unit = 1
+    for chunk in chunkWidths:
+        if chunk > 0:
+            lcm = unit * chunk // math.gcd(unit, chunk)
+            # chunk grids that don't fit into one tile together can't all be aligned to
+            if lcm <= upper:
+                unit = lcm
+
+    if width >= unit:
+        candidates = [unit * n for n in {max(1, math.floor(width / unit)), math.ceil(width / unit)}]
+        candidates = [c for c in candidates if c <= upper] or [unit]
+    else:
+        candidates = [d for d in range(lower, unit + 1) if unit % d == 0] or [unit]
+    return int(min(candidates, key=lambda c: abs(math.log2(c / width))))
+
+
+class TileRects(Sequence):
+    """
+    The rects of all tiles of a Tiling, computed on access.
+
+    Behaves like a (read-only) list, but costs nothing to set up,
+    no matter how many tiles there are.
+    """
+
+    def __init__(self, rect, count):
+        """
+        Args:
+            rect  -- function returning the rect of the given tile
+            count -- number of tiles
+        """
+        self._rect = rect
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._rect(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("tile index out of range")
+        return self._rect(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, TileRects)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "TileRects({} tiles)".format(self._count)
+
+
+def _roundedRect(rectF):
+    return QRect(round(rectF.x()), round(rectF.y()), round(rectF.width()), round(rectF.height()))
+
 
 class Tiling(object):
     """
     Describes the geometry of a tiling, for easy access
     to patch rects, overall shape, tile size, and data2scene transform.
+
+    The patch rects are computed on demand from the patch grid (see PatchAccessor),
+    so creating a tiling or changing its data2scene transform takes constant time.
     """
 
     def __init__(
@@ -62,12 +145,13 @@ class Tiling(object):
 
         numPatches = self._patchAccessor.patchCount
 
-        self.imageRectFs = [None] * numPatches
-        self.dataRectFs = [None] * numPatches
-        self.tileRectFs = [None] * numPatches
-        self.imageRects = [None] * numPatches
-        self.dataRects = [None] * numPatches
-        self.tileRects = [None] * numPatches
+        # the image rectangle includes an overlap margin, the tile (patch) rectangle has per default no overlap
+        self.imageRectFs = TileRects(self.imageRectF, numPatches)
+        self.dataRectFs = self.imageRectFs
+        self.tileRectFs = TileRects(self.tileRectF, numPatches)
+        self.imageRects = TileRects(self.imageRect, numPatches)
+        self.dataRects = TileRects(self.dataRect, numPatches)
+        self.tileRects = TileRects(self.tileRect, numPatches)
         self.sliceShape = sliceShape
         self.name = name
         self.data2scene = data2scene
@@ -82,44 +166,43 @@ class Tiling(object):
         self.scene2data, isInvertible = data2scene.inverted()
         assert isInvertible
 
-        for patchNr in range(self._patchAccessor.patchCount):
-            # the patch accessor uses the data coordinate system.
-            # because the patch is drawn on the screen, its holds coordinates
-            # corresponding to Qt's QGraphicsScene's system, which need to be
-            # converted to scene coordinates
-
-            # the image rectangle includes an overlap margin
-            imageRectF = data2scene.mapRect(self._patchAccessor.patchRectF(patchNr, self.overlap))
-
-            # the patch rectangle has per default no overlap
-            patchRectF = data2scene.mapRect(self._patchAccessor.patchRectF(patchNr, 0))
-
-            # add a little overlap when the overlap_draw setting is
-            # activated
-            if self._overlap_draw != 0:
-                patchRectF = QRectF(
-                    patchRectF.x() - self._overlap_draw,
-                    patchRectF.y() - self._overlap_draw,
-                    patchRectF.width() + 2 * self._overlap_draw,
-                    patchRectF.height() + 2 * self._overlap_draw,
-                )
-
-            patchRect = QRect(
-                round(patchRectF.x()), round(patchRectF.y()), round(patchRectF.width()), round(patchRectF.height())
+    # the patch accessor uses the data coordinate system.
+    # because the patch is drawn on the screen, its holds coordinates
+    # corresponding to Qt's QGraphicsScene's system, which need to be
+    # converted to scene coordinates
+
+    def dataRect(self, patchNr) -> QRect:
+        """The rect of the given patch in data coordinates, including the overlap margin"""
+        startx, endx, starty, endy = self._patchAccessor.getPatchBounds(patchNr, self.overlap)
+        return QRect(startx, starty, endx - startx, endy - starty)
+
+    def imageRectF(self, patchNr) -> QRectF:
+        """The rect of the given patch in scene coordinates, including the overlap margin"""
+        return self.data2scene.mapRect(self._patchAccessor.patchRectF(patchNr, self.overlap))
+
+    def imageRect(self, patchNr) -> QRect:
+        # the image rectangles of neighboring patches can overlap
+        # slightly, to account for inaccuracies in sub-pixel
+        # rendering of many ImagePatch objects
+        return _roundedRect(self.imageRectF(patchNr))
+
+    def tileRectF(self, patchNr) -> QRectF:
+        """The rect of the given patch in scene coordinates, without overlap"""
+        patchRectF = self.data2scene.mapRect(self._patchAccessor.patchRectF(patchNr, 0))
+
+        # add a little overlap when the overlap_draw setting is
+        # activated
+        if self._overlap_draw != 0:
+            patchRectF = QRectF(
+                patchRectF.x() - self._overlap_draw,
+                patchRectF.y() - self._overlap_draw,
+                patchRectF.width() + 2 * self._overlap_draw,
+                patchRectF.height() + 2 * self._overlap_draw,
             )
+        return patchRectF
 
-            # the image rectangles of neighboring patches can overlap
-            # slightly, to account for inaccuracies in sub-pixel
-            # rendering of many ImagePatch objects
-            imageRect = QRect(
-                round(imageRectF.x()), round(imageRectF.y()), round(imageRectF.width()), round(imageRectF.height())
-            )
-
-            self.imageRectFs[patchNr] = imageRectF
-            self.dataRectFs[patchNr] = imageRectF
-            self.tileRectFs[patchNr] = patchRectF
-            self.imageRects[patchNr] = imageRect
-            self.tileRects[patchNr] = patchRect
+    def tileRect(self, patchNr) -> QRect:
+        return _roundedRect(self.tileRectF(patchNr))
 
     def boundingRectF(self) -> QRectF:
         if self.tileRectFs:
@@ -130,16 +213,28 @@ class Tiling(object):
         return br
 
     def containsF(self, point):
-        for i, p in enumerate(self.tileRectFs):
-            if p.contains(point):
+        """The (lowest) number of the tile whose tileRectF contains the given scene point, or None"""
+        if not len(self):
+            return None
+        # Only the patches around the point in data coordinates can contain it
+        # (tile rects are widened by overlap_draw, in scene coordinates).
+        data_point = self.scene2data.map(QPointF(point))
+        margin = self.scene2data.mapRect(QRectF(0, 0, self._overlap_draw, self._overlap_draw))
+        margin = max(margin.width(), margin.height())
+        candidates = self._patchAccessor.getPatchesForRect(
+            data_point.x() - margin, data_point.y() - margin, data_point.x() + margin, data_point.y() + margin
+        )
+        for i in sorted(candidates):
+            if self.tileRectF(i).contains(QPointF(point)):
                 return i
+        return None
 
     def intersected(self, sceneRect):
         if not sceneRect.isValid():
             return list(range(len(self.tileRects)))
 
         # Patch accessor uses data coordinates
-        rect = self.data2scene.inverted()[0].mapRect(sceneRect)
+        rect = self.scene2data.mapRect(QRectF(sceneRect))
         patchNumbers = self._patchAccessor.getPatchesForRect(
             rect.topLeft().x(), rect.topLeft().y(), rect.bottomRight().x(), rect.bottomRight().y()
         )
@@ -2,7 +2,6 @@ from __future__ import print_function
 from builtins import range
 import numpy as np
 import warnings
-from collections import defaultdict
 
 
 try:
@@ -58,26 +57,20 @@ def edge_ids(label_img, axes=None):
         return set(map(tuple, unique_edge_ids))
 
 
-def edge_coords_along_axis(label_img, axis):
+def edges_along_axis(label_img, axis):
     """
-    Find the edges between label segments along a particular axis
-    Return all edges as keys in a dict, along with the list of coordinates that belong to the edge.
-
-    Returns a dict of edges -> coordinate lists
-    That is: { (id1, id2) : [coord, coord, coord, coord...] }
-
-    For all edge ids (id1, id2), id1 < id2.
+    Find the edges between label segments along a particular axis.
 
-    Where:
-        - id1 is always less than id2
-        - for each 'coord', len(coord) == label_img.ndim
-        - the edge lies just to the RIGHT (or down, or whatever) of the coordinate
+    Returns two arrays, in raster order of the edges:
+        - edge_ids: (N, 2) the segment ids (id1, id2) on both sides of each edge, id1 <= id2
+        - edge_coords: (N, label_img.ndim) the coordinate just LEFT (or up, or whatever) of each edge
     """
     if axis < 0:
         axis += label_img.ndim
     assert label_img.ndim > axis
     if label_img.shape[axis] == 1:
-        return {}  # No edges
+        # No edges
+        return np.zeros((0, 2), dtype=np.uint32), np.zeros((0, label_img.ndim), dtype=np.intp)
 
     up_slicing = ((slice(None),) * axis) + (np.s_[:-1],)
     down_slicing = ((slice(None),) * axis) + (np.s_[1:],)
@@ -89,26 +82,55 @@ def edge_coords_along_axis(label_img, axis):
     # tuple have a common base, and it's exactly what we want.
     # edge_coords = np.transpose(np.nonzero(edge_mask))
     edge_coords = np.nonzero(edge_mask)[0].base
-    assert edge_coords.shape[1] == label_img.ndim
+    if edge_coords is None or edge_coords.shape != (np.count_nonzero(edge_mask), label_img.ndim):
+        edge_coords = np.transpose(np.nonzero(edge_mask))
 
     edge_ids = np.ndarray(shape=(len(edge_coords), 2), dtype=np.uint32)
     edge_ids[:, 0] = label_img[up_slicing][edge_mask]
     edge_ids[:, 1] = label_img[down_slicing][edge_mask]
     edge_ids.sort(axis=1)
+    return edge_ids, edge_coords
+
+
+def group_by_id_pairs(edge_ids, values):
+    """
+    Group the rows of values by the corresponding rows of edge_ids.
+
+    Sorts once by id pair (stable, so each group keeps the order of values)
+    and splits at the boundaries between the pairs.
+
+    Returns a dict { (id1, id2) : values of that pair }, the values are views into one sorted array.
+    """
+    if len(edge_ids) == 0:
+        return {}
+    order = np.lexsort((edge_ids[:, 1], edge_ids[:, 0]))
+    edge_ids = edge_ids[order]
+    values = values[order]
 
-    # FIXME: This doesn't work any more...
-    #     # pandas can do groupby 3x faster than pure-python,
-    #     # but pure-python is faster on tiny data (e.g. a couple 256*256 tiles)
-    #     if _pandas_available and len(edge_ids) > 10000:
-    #         df = pd.DataFrame({ 'id1' : edge_ids[:,0],
-    #                             'id2' : edge_ids[:,1],
-    #                             'coords' : NpIter(edge_coords) }) # This is much faster than list(edge_coords)
-    #         return df.groupby(['id1', 'id2'])['coords'].apply(np.asarray).to_dict()
-    #     else:
-    grouped_coords = defaultdict(list)
-    for id_pair, coords in zip(edge_ids, edge_coords):
-        grouped_coords[tuple(id_pair)].append(coords)
-    return grouped_coords
+    starts = np.flatnonzero(np.any(edge_ids[1:] != edge_ids[:-1], axis=1)) + 1
+    starts = np.concatenate(([0], starts))
+    stops = np.concatenate((starts[1:], [len(edge_ids)]))
+    keys = map(tuple, edge_ids[starts].tolist())
+    return {key: values[start:stop] for key, start, stop in zip(keys, starts.tolist(), stops.tolist())}
+
+
+def edge_coords_along_axis(label_img, axis):
+    """
+    Find the edges between label segments along a particular axis
+    Return all edges as keys in a dict, along with the coordinates that belong to the edge.
+
+    Returns a dict of edges -> coordinate arrays
+    That is: { (id1, id2) : array([coord, coord, coord, coord...]) }
+
+    For all edge ids (id1, id2), id1 < id2.
+
+    Where:
+        - id1 is always less than id2
+        - for each 'coord', len(coord) == label_img.ndim
+        - the edge lies just to the RIGHT (or down, or whatever) of the coordinate
+    """
+    edge_ids, edge_coords = edges_along_axis(label_img, axis)
+    return group_by_id_pairs(edge_ids, edge_coords)
 
 
 class NpIter(object):
@@ -22,7 +22,7 @@ import logging
 import heapq
 from itertools import chain
 from threading import Lock
-from typing import TYPE_CHECKING, Callable, Final, List, Tuple
+from typing import TYPE_CHECKING, Callable, Collection, Final, List, Tuple
 
 from lazyflow.request import Request
 
@@ -77,6 +77,9 @@ class PrioTask:
         finally:
             if set_dirty:
                 self.vp.setTileDirty(self.stack_id, self.tile_no)
+            # the first priority entry is the prefetch flag, see TileProvider._refreshTile
+            if self._prio[0]:
+                self.vp.prefetchTaskDone(self.stack_id, self.tile_no)
 
 
 class LazyflowRequestBuffer:
@@ -152,7 +155,13 @@ class LazyflowRequestBuffer:
                 self._cleared_tasks += 1
             self._queue = []
 
-    def clear_non_relevant_tasks_from_queue(self, viewport: "TileProvider", stack_id: StackId, keep_tiles: list[int]):
+    def clear_non_relevant_tasks_from_queue(
+        self,
+        viewport: "TileProvider",
+        stack_id: StackId,
+        keep_tiles: list[int],
+        keep_stacks: Collection[StackId] = (),
+    ):
         """Remove waiting tiles no longer visible or outdated for the current viewport
 
         Cancellation criteria are:
@@ -164,13 +173,14 @@ class LazyflowRequestBuffer:
           viewport: The viewport that requests new tiles to be rendered
           stack_id: corresponding to the slice requested by the viewport
           keep_tiles: list of all tiles in the current view
+          keep_stacks: stacks that are fetched ahead of time (see TileProvider.setReadAhead), their tasks are kept
         """
         tmp_queue: dict[Tuple[StackId, int], PrioTask] = {}
         tmp_queue_other_vp: List[PrioTask] = []
         with self._lock:
             for task in self._queue:
                 # don't touch tasks outside the current viewport
-                if task.vp != viewport:
+                if task.vp != viewport or task.stack_id in keep_stacks:
                     tmp_queue_other_vp.append(task)
                     continue
 
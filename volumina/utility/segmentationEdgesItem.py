@@ -10,20 +10,94 @@ from qtpy.QtCore import Qt, QObject, QRectF, QPointF, QPoint
 from qtpy.QtWidgets import QApplication, QGraphicsObject, QGraphicsPathItem, QGraphicsSceneHoverEvent
 from qtpy.QtGui import QPainterPath, QPen, QColor, QPainterPathStroker, QPainter
 
-from volumina.utility import SignalingDict, edge_coords_nd, simplify_line_segments
+from volumina.utility import SignalingDict
+from volumina.utility.simplify_line_segments import simplify_grouped_line_segments
+from volumina.utility.edge_coords import edges_along_axis, group_by_id_pairs
 
 logger = logging.getLogger(__name__)
 
 
-class SegmentationEdgesItem(QGraphicsObject):
+class _EdgePickingMixin(object):
+    """
+    Hover, click and swipe handling for an item that picks its edges through an EdgePickingIndex
+    (self.picking_index), instead of letting Qt hit-test the shape of each edge.
+
+    Positions are picked within PICK_RADIUS screen pixels of an edge, whatever the zoom level.
+    """
+
+    PICK_RADIUS = 1.5
+
+    def _pick_radius(self):
+        """PICK_RADIUS in item coordinates, for the first view of the scene"""
+        scene = self.scene()
+        if scene is None or not scene.views():
+            return 0
+        transform = self.deviceTransform(scene.views()[0].viewportTransform())
+        scale = min(np.hypot(transform.m11(), transform.m12()), np.hypot(transform.m21(), transform.m22()))
+        return self.PICK_RADIUS / scale if scale > 0 else 0
+
+    def contains(self, point):
+        if self.picking_index is None:
+            return super().contains(point)
+        return self.picking_index.id_at(point.x(), point.y(), self._pick_radius()) is not None
+
+    def hoverMoveEvent(self, event: QGraphicsSceneHoverEvent):
+        id_pair = self.picking_index.id_at(event.pos().x(), event.pos().y(), self._pick_radius())
+        if self.isClickable:
+            if id_pair is None:
+                self.unsetCursor()
+            else:
+                self.setCursor(Qt.PointingHandCursor)
+        if self.hoverIdChanged and id_pair != self._hover_id:
+            self.hoverIdChanged.emit(id_pair)
+
+    def hoverLeaveEvent(self, event: QGraphicsSceneHoverEvent):
+        self.unsetCursor()
+        if self.hoverIdChanged and self._hover_id in self.path_ids:
+            self.hoverIdChanged.emit(None)
+
+    def mousePressEvent(self, event):
+        id_pair = self.picking_index.id_at(event.pos().x(), event.pos().y(), self._pick_radius())
+        if id_pair is None:
+            event.ignore()
+        else:
+            self.edgeClicked.emit(id_pair, event)
+
+    def mouseMoveEvent(self, event):
+        """
+        Note: ImageScene2D has special behavior to send us mouseMoveEvents that we would otherwise not receive.
+              In such cases, the event.pos() may be invalid, so the scene positions are used.
+        """
+        if event.buttons() != Qt.NoButton:
+            start = self.mapFromScene(event.lastScenePos())
+            end = self.mapFromScene(event.scenePos())
+            radius = self._pick_radius()
+            for id_pair in self.picking_index.ids_along(start.x(), start.y(), end.x(), end.y(), radius):
+                self.edgeSwiped.emit(id_pair, event)
+
+
+class SegmentationEdgesItem(_EdgePickingMixin, QGraphicsObject):
     """
     A parent item for a collection of SingleEdgeItems.
+
+    If a picking_index is given, the edges are picked by this item through the index,
+    and the SingleEdgeItems only draw.
     """
 
     edgeClicked = Signal(tuple, object)  # id_pair, QGraphicsSceneMouseEvent
     edgeSwiped = Signal(tuple, object)  # id_pair, QGraphicsSceneMouseEvent
 
-    def __init__(self, path_items, edge_pen_table, default_pen, *, hoverIdChanged=None, parent=None, isClickable=False):
+    def __init__(
+        self,
+        path_items,
+        edge_pen_table,
+        default_pen,
+        *,
+        hoverIdChanged=None,
+        parent=None,
+        isClickable=False,
+        picking_index=None,
+    ):
         """
         path_items: A dict of { edge_id : SingleEdgeItem }
                     Use generate_path_items_for_labels() to produce this dict.
@@ -34,6 +108,8 @@ class SegmentationEdgesItem(QGraphicsObject):
                         (It is assumed that edge_pen_table may be shared among several SegmentationEdgeItems)
 
         default_pen: What pen to use for id_pairs that are not found in the edge_pen_table
+
+        picking_index: An optional EdgePickingIndex for the same tile, to pick the edges in constant time
         """
         assert (
             threading.current_thread().name == "MainThread"
@@ -41,9 +117,18 @@ class SegmentationEdgesItem(QGraphicsObject):
 
         self.hoverIdChanged = hoverIdChanged
         self.isClickable = isClickable
+        self.picking_index = picking_index
+        self._hover_id = None
         super(SegmentationEdgesItem, self).__init__(parent=parent)
         self.setFlag(QGraphicsObject.ItemHasNoContents)
 
+        if picking_index is not None:
+            self.setAcceptHoverEvents(bool(hoverIdChanged or isClickable))
+            if hoverIdChanged:
+                hoverIdChanged.connect(self.handle_id_hover)
+            if not isClickable:
+                self.setAcceptedMouseButtons(Qt.NoButton)
+
         assert isinstance(edge_pen_table, SignalingDict)
         self.edge_pen_table = edge_pen_table
         self.edge_pen_table.updated.connect(self.handle_updated_pen_table)
@@ -59,11 +144,17 @@ class SegmentationEdgesItem(QGraphicsObject):
         self.path_ids = set(path_items.keys())
 
     def boundingRect(self):
+        if self.picking_index is not None:
+            # Nothing is drawn (see QGraphicsObject.ItemHasNoContents), but the whole tile is picked here.
+            width, height = self.picking_index.shape
+            return QRectF(0, 0, width, height)
         # Return an empty rect to indicate 'no content'.
         # This 'item' is merely a parent node for child items.
-        # (See QGraphicsObject.ItemHasNoContents.)
         return QRectF()
 
+    def handle_id_hover(self, id_pair):
+        self._hover_id = id_pair
+
     def handle_edge_clicked(self, id_pair, event):
         self.edgeClicked.emit(id_pair, event)
 
@@ -78,64 +169,76 @@ class SegmentationEdgesItem(QGraphicsObject):
             item.setPen(pen)
 
 
-def painter_paths_for_labels_PURE_PYTHON(label_img, simplify_with_tolerance=None):
+def line_segments_for_labels_PURE_PYTHON(label_img, simplify_with_tolerance=None):
+    """
+    Find the line segments separating the segments of label_img.
+
+    Returns a dict { (id1, id2) : line_segments }, where line_segments is an array of shape (N, 2, 2)
+    holding the end points of each unit-length segment along the edge (or of the simplified lines).
+    """
     # Find edge coordinates.
     # Note: 'x_axis' edges are those found when sweeping along the x axis.
     #       That is, the line separating the two segments will be *vertical*.
     assert label_img.ndim == 2
-    x_axis_edge_coords, y_axis_edge_coords = edge_coords_nd(label_img)
-    # x_axis_edge_coords, y_axis_edge_coords = edgeCoords2D(label_img)
-
-    # Populate the path_items dict.
-    painter_paths = {}
-    for id_pair in set(list(x_axis_edge_coords.keys()) + list(y_axis_edge_coords.keys())):
-        horizontal_edge_coords = vertical_edge_coords = []
-        if id_pair in y_axis_edge_coords:
-            horizontal_edge_coords = y_axis_edge_coords[id_pair]
-        if id_pair in x_axis_edge_coords:
-            vertical_edge_coords = x_axis_edge_coords[id_pair]
-        painter_paths[id_pair] = painter_path_from_edge_coords(
-            horizontal_edge_coords, vertical_edge_coords, simplify_with_tolerance
-        )
+    x_axis_edge_ids, vertical_edge_coords = edges_along_axis(label_img, 0)
+    y_axis_edge_ids, horizontal_edge_coords = edges_along_axis(label_img, 1)
+
+    # The line segments of all edges at once, grouped by id pair with a single sort.
+    line_segments = line_segments_from_edge_coords(horizontal_edge_coords, vertical_edge_coords)
+    grouped = group_by_id_pairs(np.concatenate((y_axis_edge_ids, x_axis_edge_ids)), line_segments)
 
-    return painter_paths
+    if simplify_with_tolerance is not None:
+        grouped = simplified_line_segments_for_edges(grouped, simplify_with_tolerance)
+    return grouped
+
+
+def painter_paths_for_labels_PURE_PYTHON(label_img, simplify_with_tolerance=None):
+    return {
+        id_pair: painter_path_from_line_segments(segments)
+        for id_pair, segments in line_segments_for_labels_PURE_PYTHON(label_img, simplify_with_tolerance).items()
+    }
 
 
 try:
     import vigra
-    from ilastiktools import line_segments_for_labels
+    from ilastiktools import line_segments_for_labels as _line_segments_for_labels
 
-    def painter_paths_for_labels(label_img, simplify_with_tolerance=None):
+    def line_segments_for_labels(label_img, simplify_with_tolerance=None):
+        line_seg_lookup = _line_segments_for_labels(vigra.taggedView(label_img, "xy"))
+        line_segments = {edge_id: segments.reshape(-1, 2, 2) for edge_id, segments in line_seg_lookup.items()}
         if simplify_with_tolerance is not None:
-            return painter_paths_for_labels_PURE_PYTHON(label_img, simplify_with_tolerance)
-        line_seg_lookup = line_segments_for_labels(vigra.taggedView(label_img, "xy"))
-        painter_paths = {}
-        for edge_id, line_segments in list(line_seg_lookup.items()):
-            point_list = line_segments.reshape(-1, 2)
-            painter_paths[edge_id] = arrayToQPath(point_list[:, 0], point_list[:, 1], connect="pairs")
-        return painter_paths
+            line_segments = simplified_line_segments_for_edges(line_segments, simplify_with_tolerance)
+        return line_segments
 
 except ImportError:
-    painter_paths_for_labels = painter_paths_for_labels_PURE_PYTHON
+    line_segments_for_labels = line_segments_for_labels_PURE_PYTHON
 
-try:
-    from ilastiktools import edgeCoords2D
 
-    edge_coords_nd = edgeCoords2D
-except ImportError:
-    pass
+def painter_paths_for_labels(label_img, simplify_with_tolerance=None):
+    return {
+        id_pair: painter_path_from_line_segments(segments)
+        for id_pair, segments in line_segments_for_labels(label_img, simplify_with_tolerance).items()
+    }
 
 
 def generate_path_items_for_labels(
     edge_pen_table, default_pen, label_img, simplify_with_tolerance=None, isClickable=False
 ):
-    painter_paths = painter_paths_for_labels(label_img, simplify_with_tolerance)
+    line_segments = line_segments_for_labels(label_img, simplify_with_tolerance)
+    return path_items_from_line_segments(edge_pen_table, default_pen, line_segments, isClickable)
+
 
+def path_items_from_line_segments(edge_pen_table, default_pen, line_segments, isClickable=False):
+    """
+    Wrap the line segments of each edge (see line_segments_for_labels()) in a SingleEdgeItem.
+
+    Unlike line_segments_for_labels(), this must run in the main thread.
+    """
     path_items = {}
-    for id_pair in list(painter_paths.keys()):
+    for id_pair, segments in line_segments.items():
         path_items[id_pair] = SingleEdgeItem(
             id_pair,
-            painter_paths[id_pair],
+            painter_path_from_line_segments(segments),
             initial_pen=edge_pen_table.get(id_pair, default_pen),
             isClickable=isClickable,
         )
@@ -158,15 +261,8 @@ def line_segments_from_edge_coords(horizontal_edge_coords, vertical_edge_coords,
     #     line_segments.append( ((x+1, y), (x+1, y+1)) )
 
     # Same as above commented-out code, but faster
-    if horizontal_edge_coords:
-        horizontal_edge_coords = np.array(horizontal_edge_coords)
-    else:
-        horizontal_edge_coords = np.ndarray((0, 2), dtype=np.uint32)
-
-    if vertical_edge_coords:
-        vertical_edge_coords = np.array(vertical_edge_coords)
-    else:
-        vertical_edge_coords = np.ndarray((0, 2), dtype=np.uint32)
+    horizontal_edge_coords = np.asarray(horizontal_edge_coords, dtype=np.uint32).reshape((-1, 2))
+    vertical_edge_coords = np.asarray(vertical_edge_coords, dtype=np.uint32).reshape((-1, 2))
 
     num_segments = len(horizontal_edge_coords) + len(vertical_edge_coords)
     line_segments = np.zeros((num_segments, 2, 2), dtype=np.uint32)
@@ -176,24 +272,48 @@ def line_segments_from_edge_coords(horizontal_edge_coords, vertical_edge_coords,
     line_segments[len(horizontal_edge_coords) :, 1, :] = vertical_edge_coords + (1, 1)
 
     if simplify_with_tolerance is not None:
-        sequential_points = simplify_line_segments(line_segments, tolerance=simplify_with_tolerance)
-        line_segments = []
-        for point_list in sequential_points:
-            # Since these points are already in order, doubling the size of the point list like this
-            # is slightly inefficient, but it simplifies things because we can use the same QPath
-            # generation method.
-            line_segments += list(zip(point_list[:-1], point_list[1:]))
-        line_segments = np.array(line_segments)
+        line_segments = simplified_line_segments(line_segments, simplify_with_tolerance)
     return line_segments
 
 
+def simplified_line_segments(line_segments, tolerance):
+    """
+    Simplify the line segments (see simplify_line_segments()) and return
+    the simplified lines as line segments again.
+    """
+    # Since the simplified points are in order, doubling the size of the point list like this
+    # is slightly inefficient, but it simplifies things because we can use the same QPath
+    # generation method.
+    line_segments = np.asarray(line_segments).reshape((-1, 2, 2))
+    segments, _ = simplify_grouped_line_segments(line_segments, np.zeros(len(line_segments), dtype=np.intp), tolerance)
+    return segments
+
+
+def simplified_line_segments_for_edges(line_segments, tolerance):
+    """
+    Simplify the line segments of all edges at once (see simplified_line_segments()).
+
+    line_segments: A dict of { id_pair : line segments }, see line_segments_for_labels()
+    """
+    id_pairs = list(line_segments)
+    if not id_pairs:
+        return {}
+    arrays = [np.asarray(line_segments[id_pair]).reshape((-1, 2, 2)) for id_pair in id_pairs]
+    edge_index = np.repeat(np.arange(len(id_pairs)), [len(segments) for segments in arrays])
+    segments, segment_edges = simplify_grouped_line_segments(np.concatenate(arrays), edge_index, tolerance)
+    return dict(zip(id_pairs, np.split(segments, np.searchsorted(segment_edges, np.arange(1, len(id_pairs))))))
+
+
 def painter_path_from_edge_coords(horizontal_edge_coords, vertical_edge_coords, simplify_with_tolerance=None):
     line_segments = line_segments_from_edge_coords(
         horizontal_edge_coords, vertical_edge_coords, simplify_with_tolerance
     )
-    line_segments = line_segments.reshape((-1, 2))
-    path = arrayToQPath(line_segments[:, 0], line_segments[:, 1], connect="pairs")
-    return path
+    return painter_path_from_line_segments(line_segments)
+
+
+def painter_path_from_line_segments(line_segments):
+    points = line_segments.reshape((-1, 2))
+    return arrayToQPath(points[:, 0], points[:, 1], connect="pairs")
 
 
 class SingleEdgeItem(QGraphicsPathItem):
@@ -221,6 +341,16 @@ class SingleEdgeItem(QGraphicsPathItem):
 
         self._scale = 1
 
+    def _picked_by_parent(self):
+        return self.parent is not None and self.parent.picking_index is not None
+
+    def contains(self, point):
+        # Skip building the stroked shape if the parent picks the edges
+        return False if self._picked_by_parent() else super().contains(point)
+
+    def collidesWithPath(self, path, mode=Qt.IntersectsItemShape):
+        return False if self._picked_by_parent() else super().collidesWithPath(path, mode)
+
     def shape(self):
         # Adjust active area depending on the zoom level
         stroker = QPainterPathStroker()
@@ -257,10 +387,12 @@ class SingleEdgeItem(QGraphicsPathItem):
         self.setParentItem(parent)
         self.parent = parent
         if self.parent.hoverIdChanged:
-            self.setAcceptHoverEvents(True)
+            self.setAcceptHoverEvents(not self._picked_by_parent())
             self.parent.hoverIdChanged.connect(self.handle_id_hover)
-        if not self.parent.isClickable:
+        if not self.parent.isClickable or self._picked_by_parent():
             self.setAcceptedMouseButtons(Qt.NoButton)
+        if self._picked_by_parent():
+            self.unsetCursor()
 
     def paint(self, painter: QPainter, option, widget):
         transform, invertable = painter.worldTransform().inverted()
@@ -280,6 +412,222 @@ class SingleEdgeItem(QGraphicsPathItem):
     #    self.parent.handle_edge_clicked( self.id_pair )
 
 
+def _pair_keys(id_pairs):
+    """Encode (n, 2) id pairs as single uint64 keys (for sorting and searching)"""
+    id_pairs = np.asarray(id_pairs, dtype=np.uint64).reshape((-1, 2))
+    return (id_pairs[:, 0] << np.uint64(32)) | id_pairs[:, 1]
+
+
+class EdgePickingIndex(object):
+    """
+    Maps the pixels of a tile to the edges next to them, to pick edges in constant time.
+
+    Each pixel on either side of an edge maps to the id pair of that edge
+    (where edges meet, one of them wins). Lookups can be widened by a radius,
+    to pick the nearest edge when the view is zoomed out. Consists of plain arrays only,
+    so it can be built in any thread.
+    """
+
+    def __init__(self, label_img, id_pairs):
+        """
+        label_img: The 2D label image of the tile
+        id_pairs: The id pairs of the edges in label_img (e.g. the keys of line_segments_for_labels())
+        """
+        assert label_img.ndim == 2
+        self.id_pairs = list(id_pairs)
+        self._raster = np.full(label_img.shape, -1, dtype=np.int32)
+        if not self.id_pairs:
+            return
+
+        keys = _pair_keys(self.id_pairs)
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        for axis in range(2):
+            edge_ids, edge_coords = edges_along_axis(label_img, axis)
+            if len(edge_ids) == 0:
+                continue
+            positions = np.minimum(np.searchsorted(sorted_keys, _pair_keys(edge_ids)), len(keys) - 1)
+            known = sorted_keys[positions] == _pair_keys(edge_ids)
+            edge_coords, index = edge_coords[known], order[positions[known]]
+            self._raster[tuple(edge_coords.T)] = index
+            edge_coords = edge_coords.copy()
+            edge_coords[:, axis] += 1
+            self._raster[tuple(edge_coords.T)] = index
+
+    @property
+    def shape(self):
+        return self._raster.shape
+
+    def _nearest_index(self, x, y, radius):
+        """The raster index of the edge pixel nearest to (x, y) within radius (a square window), or -1"""
+        if radius < 1:
+            x, y = int(np.floor(x)), int(np.floor(y))
+            if not (0 <= x < self._raster.shape[0] and 0 <= y < self._raster.shape[1]):
+                return -1
+            return self._raster[x, y]
+
+        x0, y0 = max(0, int(np.floor(x - radius))), max(0, int(np.floor(y - radius)))
+        x1 = min(self._raster.shape[0], int(np.floor(x + radius)) + 1)
+        y1 = min(self._raster.shape[1], int(np.floor(y + radius)) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return -1
+        window = self._raster[x0:x1, y0:y1]
+        xs, ys = np.nonzero(window >= 0)
+        if len(xs) == 0:
+            return -1
+        nearest = np.argmin((xs + x0 + 0.5 - x) ** 2 + (ys + y0 + 0.5 - y) ** 2)
+        return window[xs[nearest], ys[nearest]]
+
+    def id_at(self, x, y, radius=0):
+        """
+        The id pair of the edge at the given position (in tile coordinates), or None
+
+        radius: Pick the nearest edge within this distance (in tile coordinates) instead
+        """
+        index = self._nearest_index(x, y, radius)
+        return self.id_pairs[index] if index >= 0 else None
+
+    def ids_along(self, x0, y0, x1, y1, radius=0):
+        """
+        The id pairs of the edges on the line from (x0, y0) to (x1, y1), in the order they are crossed
+
+        radius: Also pick the nearest edges within this distance of the line (in tile coordinates)
+        """
+        if radius < 1:
+            n = int(np.ceil(max(abs(x1 - x0), abs(y1 - y0)))) + 1
+            xs = np.floor(np.linspace(x0, x1, n)).astype(np.intp)
+            ys = np.floor(np.linspace(y0, y1, n)).astype(np.intp)
+            inside = (xs >= 0) & (xs < self._raster.shape[0]) & (ys >= 0) & (ys < self._raster.shape[1])
+            index = self._raster[xs[inside], ys[inside]]
+        else:
+            # The windows around samples one radius apart cover the whole band around the line.
+            n = int(np.ceil(max(abs(x1 - x0), abs(y1 - y0)) / radius)) + 1
+            xs, ys = np.linspace(x0, x1, n), np.linspace(y0, y1, n)
+            index = np.array([self._nearest_index(x, y, radius) for x, y in zip(xs, ys)], dtype=np.int32)
+        index = index[index >= 0]
+        _, first = np.unique(index, return_index=True)
+        return [self.id_pairs[i] for i in index[np.sort(first)]]
+
+
+class BatchedSegmentationEdgesItem(_EdgePickingMixin, QGraphicsObject):
+    """
+    Draws all edges of a tile as one QPainterPath per pen, instead of one SingleEdgeItem per edge.
+
+    Edges are picked (hovered, clicked, swiped) through an EdgePickingIndex,
+    so the number of items in the scene doesn't grow with the number of edges.
+    """
+
+    edgeClicked = Signal(tuple, object)  # id_pair, QGraphicsSceneMouseEvent
+    edgeSwiped = Signal(tuple, object)  # id_pair, QGraphicsSceneMouseEvent
+
+    def __init__(
+        self,
+        line_segments,
+        picking_index,
+        edge_pen_table,
+        default_pen,
+        *,
+        hoverIdChanged=None,
+        parent=None,
+        isClickable=False,
+    ):
+        """
+        line_segments: A dict of { id_pair : line segments }, see line_segments_for_labels()
+        picking_index: An EdgePickingIndex for the same tile
+        edge_pen_table, default_pen: See SegmentationEdgesItem
+        """
+        assert (
+            threading.current_thread().name == "MainThread"
+        ), "BatchedSegmentationEdgesItem objects may only be created in the main thread."
+        super(BatchedSegmentationEdgesItem, self).__init__(parent=parent)
+
+        self.hoverIdChanged = hoverIdChanged
+        self.isClickable = isClickable
+        self.line_segments = line_segments
+        self.path_ids = set(line_segments)
+        self.picking_index = picking_index
+        self.default_pen = default_pen
+        self._hover_id = None
+
+        # The edges are grouped by pen, each group is drawn as a single path.
+        self._pens = {}  # pen key -> QPen
+        self._pen_keys = {}  # id_pair -> pen key
+        self._groups = defaultdict(set)  # pen key -> id pairs
+        self._paths = {}  # pen key -> QPainterPath
+
+        assert isinstance(edge_pen_table, SignalingDict)
+        self.edge_pen_table = edge_pen_table
+        self.edge_pen_table.updated.connect(self.handle_updated_pen_table)
+        self._regroup(self.path_ids)
+
+        if hoverIdChanged or isClickable:
+            self.setAcceptHoverEvents(True)
+        if hoverIdChanged:
+            hoverIdChanged.connect(self.handle_id_hover)
+        if not isClickable:
+            self.setAcceptedMouseButtons(Qt.NoButton)
+
+    @staticmethod
+    def _pen_key(pen):
+        return (pen.color().rgba(), pen.widthF(), int(pen.style()), int(pen.capStyle()), pen.isCosmetic())
+
+    def _regroup(self, id_pairs):
+        """Move the given edges to the group of their current pen and rebuild the changed paths"""
+        changed = set()
+        for id_pair in id_pairs:
+            pen = self.edge_pen_table.get(id_pair, self.default_pen)
+            key = self._pen_key(pen)
+            old_key = self._pen_keys.get(id_pair)
+            if key == old_key:
+                continue
+            if old_key is not None:
+                self._groups[old_key].discard(id_pair)
+                changed.add(old_key)
+            self._pens.setdefault(key, pen)
+            self._groups[key].add(id_pair)
+            self._pen_keys[id_pair] = key
+            changed.add(key)
+
+        for key in changed:
+            ids = self._groups[key]
+            if ids:
+                segments = np.concatenate([self.line_segments[id_pair].reshape((-1, 2, 2)) for id_pair in ids])
+                self._paths[key] = painter_path_from_line_segments(segments)
+            else:
+                del self._groups[key], self._pens[key]
+                self._paths.pop(key, None)
+
+        if changed:
+            self.prepareGeometryChange()
+            self.update()
+
+    def boundingRect(self):
+        width, height = self.picking_index.shape
+        margin = max([pen.widthF() for pen in self._pens.values()] + [0]) + 2
+        return QRectF(0, 0, width, height).adjusted(-margin, -margin, margin, margin)
+
+    def paint(self, painter: QPainter, option, widget):
+        painter.setBrush(Qt.NoBrush)
+        for key, path in self._paths.items():
+            painter.setPen(self._pens[key])
+            painter.drawPath(path)
+
+        if self._hover_id in self.path_ids:
+            hover_pen = QPen(self._pens[self._pen_keys[self._hover_id]])
+            hover_pen.setWidth(hover_pen.width() + 2)
+            painter.strokePath(painter_path_from_line_segments(self.line_segments[self._hover_id]), hover_pen)
+
+    def handle_updated_pen_table(self, updated_path_ids):
+        self._regroup(self.path_ids.intersection(updated_path_ids))
+
+    def handle_id_hover(self, id_pair):
+        if id_pair != self._hover_id:
+            needs_update = id_pair in self.path_ids or self._hover_id in self.path_ids
+            self._hover_id = id_pair
+            if needs_update:
+                self.update()
+
+
 def pop_matching(l, match_f):
     for i, item in enumerate(l):
         if match_f(item):
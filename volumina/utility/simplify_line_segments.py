@@ -1,14 +1,6 @@
 from __future__ import print_function
 import numpy as np
 
-try:
-    import shapely.ops
-    from shapely.geometry import LineString, MultiLineString
-
-    _missing_shapely = False
-except ImportError:
-    _missing_shapely = True
-
 
 def simplify_line_segments(lines, tolerance=0.707):
     """
@@ -19,27 +11,172 @@ def simplify_line_segments(lines, tolerance=0.707):
 
     do the following:
 
-    - Aggregate all of the line segments into a shapely MultiLineString
-    - 'Merge' connected line segments
-    - 'Simplify' each contiguous LineString, constrained to the given tolerancea
+    - 'Merge' connected line segments into lines without branch points (see chain_line_segments())
+    - 'Simplify' each line, constrained to the given tolerance (see douglas_peucker())
 
     Returns a list of the segment point arrays (one array per segment),
     where each point array is already in order, ready to be drawn on screen.
     """
-    assert not _missing_shapely, "This function requires shapely to be installed."
+    points, offsets, _ = chain_line_segments(lines)
+    keep = douglas_peucker(points, offsets, tolerance)
+    return [points[start:stop][keep[start:stop]] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def simplify_grouped_line_segments(lines, groups, tolerance=0.707):
+    """
+    Like simplify_line_segments(), for the line segments of many edges at once:
+    segments are only merged with segments of the same group.
+
+    lines: An array of shape (N, 2, 2)
+    groups: An array of N (small, non-negative) integers, e.g. an edge index per segment
+
+    Returns the simplified line segments, shape (M, 2, 2), and the group of each, sorted by group.
+    """
+    points, offsets, chain_groups = chain_line_segments(lines, groups)
+    keep = douglas_peucker(points, offsets, tolerance)
+    chains = np.repeat(np.arange(len(chain_groups)), np.diff(offsets))[keep]
+    points = points[keep]
+    consecutive = chains[1:] == chains[:-1]
+    segments = np.stack((points[:-1][consecutive], points[1:][consecutive]), axis=1)
+    return segments.reshape((-1, 2, 2)), chain_groups[chains[:-1][consecutive]]
+
+
+def chain_line_segments(lines, groups=None):
+    """
+    Merge line segments (in any order) into lines: each line ends at the tips and branch points
+    of the graph formed by the segments, closed loops become lines that end where they started.
+
+    The segments are chained with array operations only (pointer jumping over the segments),
+    so the cost doesn't depend on the number of lines.
+
+    lines: An array of shape (N, 2, 2)
+    groups: An optional array of N integers. Segments of different groups are never merged.
+
+    Returns (points, offsets, line_groups): the points of all lines, in order, where line i
+    consists of points[offsets[i]:offsets[i+1]], and the group of each line (lines are sorted by group).
+    """
+    lines = np.asarray(lines, dtype=np.float64).reshape((-1, 2, 2))
+    groups = np.zeros(len(lines), dtype=np.intp) if groups is None else np.asarray(groups, dtype=np.intp)
+    # Drop degenerate segments
+    proper = (lines[:, 0] != lines[:, 1]).any(axis=1)
+    lines, groups = lines[proper], groups[proper]
+    if len(lines) == 0:
+        return np.zeros((0, 2)), np.zeros(1, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    # Number the nodes: the distinct (group, x, y) end points
+    ends = np.column_stack((np.repeat(groups, 2).astype(np.float64), lines.reshape((-1, 2))))
+    order = np.lexsort(ends.T[::-1])
+    new_node = np.concatenate(([True], (ends[order[1:]] != ends[order[:-1]]).any(axis=1)))
+    nodes = ends[order[new_node]]
+    node_ids = np.empty(len(ends), dtype=np.intp)
+    node_ids[order] = np.cumsum(new_node) - 1
+    node_ids = node_ids.reshape((-1, 2))
+
+    # Drop duplicate segments
+    _, first = np.unique(node_ids.min(axis=1) * len(nodes) + node_ids.max(axis=1), return_index=True)
+    first.sort()
+    node_ids, groups = node_ids[first], groups[first]
+
+    # Directed edges: 2 * i runs along segment i, 2 * i + 1 runs backwards.
+    tails = node_ids.ravel()
+    heads = node_ids[:, ::-1].ravel()
+    num_edges = len(tails)
+    edges = np.arange(num_edges)
+    degree = np.bincount(tails, minlength=len(nodes))
+
+    # Lines continue through nodes of degree 2: there, each edge is followed by the other edge leaving the node.
+    outgoing = np.argsort(tails, kind="stable")
+    first_outgoing = np.concatenate(([0], np.cumsum(degree)[:-1]))
+    successors = np.full(num_edges, -1, dtype=np.intp)
+    through = degree[heads] == 2
+    out_a = outgoing[first_outgoing[heads[through]]]
+    out_b = outgoing[first_outgoing[heads[through]] + 1]
+    successors[through] = np.where(out_a == (edges[through] ^ 1), out_b, out_a)
+
+    # Loops never reach an end: cut each one before its smallest edge.
+    # (Pointer jumping: after round k, jump points 2**k edges ahead, and reaches_end and smallest
+    # cover these 2**k edges. Once a round changes neither, they cover the whole line or loop.)
+    jump = np.where(successors >= 0, successors, edges)
+    reaches_end = successors < 0
+    smallest = edges.copy()
+    while True:
+        new_reaches_end = reaches_end | reaches_end[jump]
+        new_smallest = np.minimum(smallest, smallest[jump])
+        jump = jump[jump]
+        if (new_reaches_end == reaches_end).all() and (new_smallest == smallest).all():
+            break
+        reaches_end, smallest = new_reaches_end, new_smallest
+    successors[~reaches_end & (successors == smallest)] = -1
+
+    # The last edge of each line and the distance to it (list ranking)
+    jump = np.where(successors >= 0, successors, edges)
+    distance = (successors >= 0).astype(np.intp)
+    while True:
+        distance += distance[jump]
+        next_jump = jump[jump]
+        if (next_jump == jump).all():
+            break
+        jump = next_jump
+    last = jump
+
+    # Each line was found in both directions, keep one of them
+    kept = np.flatnonzero(last < last[edges ^ 1])
+    edge_groups = groups[kept >> 1]
+    kept = kept[np.lexsort((-distance[kept], last[kept], edge_groups))]
+    edge_groups = np.sort(edge_groups)
+
+    line_starts = np.flatnonzero(np.concatenate(([True], last[kept][1:] != last[kept][:-1])))
+    point_ids = np.insert(heads[kept], line_starts, tails[kept[line_starts]])
+    offsets = np.append(line_starts + np.arange(len(line_starts)), len(point_ids))
+    return nodes[point_ids, 1:], offsets, edge_groups[line_starts]
+
+
+def douglas_peucker(points, offsets, tolerance):
+    """
+    Ramer-Douglas-Peucker simplification of many lines at once.
+
+    Each round handles the current sub-line of all lines together: the point farthest from
+    the straight connection is kept (and splits the sub-line) if it is farther than tolerance.
 
-    # shapely calls repr() on these items many times,
-    # which is slow for numpy integer types like numpy.int64, etc.
-    # To avoid a ~2x slowdown, force everything to be plain python.
-    lines = np.asarray(lines).tolist()
-    lines = MultiLineString(lines)
+    points, offsets: The lines, as returned by chain_line_segments()
 
-    merged_lines = shapely.ops.linemerge(lines).simplify(tolerance, False)
-    if isinstance(merged_lines, LineString):
-        # Annoyingly, the output type of linemerge() depends
-        # on how many segments were found
-        return [np.array(merged_lines)]
-    return list(map(np.array, merged_lines))
+    Returns a boolean mask of the points to keep.
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[offsets[:-1]] = True
+    keep[offsets[1:] - 1] = True
+
+    lo, hi = offsets[:-1], offsets[1:] - 1
+    inner = hi - lo > 1
+    lo, hi = lo[inner], hi[inner]
+    while len(lo):
+        counts = hi - lo - 1
+        sub_lines = np.repeat(np.arange(len(lo)), counts)
+        firsts = np.cumsum(counts) - counts
+        indices = np.arange(counts.sum()) - np.repeat(firsts, counts) + np.repeat(lo + 1, counts)
+
+        distances = _segment_distances(points[indices], points[lo[sub_lines]], points[hi[sub_lines]])
+        farthest = np.maximum.reduceat(distances, firsts)
+        # the first point at the maximum distance of each sub-line
+        candidates = np.flatnonzero(distances == farthest[sub_lines])
+        candidates = candidates[np.concatenate(([True], np.diff(sub_lines[candidates]) != 0))]
+
+        split = farthest > tolerance
+        middle = indices[candidates][split]
+        keep[middle] = True
+        lo, hi = np.concatenate((lo[split], middle)), np.concatenate((middle, hi[split]))
+        inner = hi - lo > 1
+        lo, hi = lo[inner], hi[inner]
+    return keep
+
+
+def _segment_distances(points, starts, stops):
+    """The distance of each point to the line segment from start to stop"""
+    directions = stops - starts
+    lengths = (directions**2).sum(axis=1)
+    t = ((points - starts) * directions).sum(axis=1) / np.where(lengths > 0, lengths, 1)
+    nearest = starts + np.clip(t, 0, 1)[:, None] * directions
+    return np.hypot(*(points - nearest).T)
 
 
 ##
@@ -47,11 +184,17 @@ def simplify_line_segments(lines, tolerance=0.707):
 ## OLD IMPLEMENTATION: All functions below this line aren't needed any more,
 ##                     but might be useful in the future...
 ##
-## This version implements the merge step using networkx.
-## (I implemented this before I discovered the shapely.ops.linemerge() function...)
+## This version implements the merge step using networkx and the simplification with shapely.
 ##
 ##
 
+try:
+    from shapely.geometry import LineString
+
+    _missing_shapely = False
+except ImportError:
+    _missing_shapely = True
+
 try:
     import networkx as nx
 
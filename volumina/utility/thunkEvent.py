@@ -112,15 +112,46 @@ class ThunkEventHandler(QObject):
 import threading
 
 
+class MainThreadUnavailable(RuntimeError):
+    """The main thread stopped processing events (the application is quitting)"""
+
+
 class GlobalThunkEventProcessor(QObject):
     def __init__(self, parent=None):
         super(GlobalThunkEventProcessor, self).__init__(parent)
         self.thunkEventHandler = ThunkEventHandler(self)
+        self._lock = threading.Lock()
+        self._app = None
+        self._quitting = False
+
+    def _watchApplication(self):
+        """Whether the main thread will still process the posted events"""
+        app = QApplication.instance()
+        if app is None or app.closingDown():
+            return False
+        with self._lock:
+            if app is not self._app:
+                self._app = app
+                self._quitting = False
+                app.aboutToQuit.connect(self._handleAboutToQuit)
+        return not self._quitting
+
+    def _handleAboutToQuit(self):
+        self._quitting = True
 
     def execute(self, f, *args, **kwargs):
+        """
+        Execute f in the main thread and return its result.
+
+        Raises MainThreadUnavailable if called from another thread while (or after)
+        the application quits, instead of waiting forever for the event loop.
+        """
         if threading.current_thread().name == "MainThread":
             return f(*args, **kwargs)
 
+        if not self._watchApplication():
+            raise MainThreadUnavailable("Can't execute {} in the main thread, the application is quitting".format(f))
+
         e = threading.Event()
         result = [None]
 
@@ -129,7 +160,9 @@ class GlobalThunkEventProcessor(QObject):
             e.set()
 
         self.thunkEventHandler.post(inner, f, *args, **kwargs)
-        e.wait()
+        while not e.wait(0.1):
+            if not self._watchApplication():
+                raise MainThreadUnavailable("The application quit before {} was executed".format(f))
         return result[0]
 
 
@@ -1,3 +1,4 @@
+import numpy
 from qtpy.QtCore import Signal
 from qtpy.QtGui import QVector4D
 from qtpy.QtWidgets import QLabel
@@ -16,6 +17,7 @@ if volumina.config.CONFIG.show_3d_widget:
 
     from volumina.view3d.slicingplanes import SlicingPlanes
     from volumina.view3d.axessymbols import AxesSymbols
+    from volumina.view3d.lod import LODMeshItem, select_levels
 
     class GLViewReal(GLViewWidget):
         """
@@ -33,6 +35,9 @@ if volumina.config.CONFIG.show_3d_widget:
 
         slice_changed = Signal()
 
+        # total number of triangles of the shown meshes with levels of detail
+        MAX_TRIANGLES = 2000000
+
         def __init__(self, parent=None):
             GLViewWidget.__init__(self, parent)
             self.setBackgroundColor(preferences.get("GLView", "backgroundColor", default=[255, 255, 255]))
@@ -43,6 +48,7 @@ if volumina.config.CONFIG.show_3d_widget:
             self._mouse_pos = None
 
             self._meshes = {}
+            self._max_triangles = self.MAX_TRIANGLES
             # Make sure the layout stays the same no matter if the 3D widget is on/off
             size_policy = self.sizePolicy()
             size_policy.setRetainSizeWhenHidden(True)
@@ -106,6 +112,35 @@ if volumina.config.CONFIG.show_3d_widget:
             """
             return [key for key, value in self._meshes.items() if value.visible()]
 
+        def set_triangle_budget(self, max_triangles):
+            """
+            Limit the number of triangles drawn for the meshes with levels of detail.
+
+            :param Optional[int] max_triangles: the budget, None for no limit
+            """
+            self._max_triangles = max_triangles
+            self.update()
+
+        def update_levels_of_detail(self):
+            """
+            Show each mesh at the level of detail suiting its distance from the camera,
+            within the triangle budget (see lod.select_levels).
+            """
+            meshes = [mesh for mesh in self._meshes.values() if isinstance(mesh, LODMeshItem) and mesh.visible()]
+            if not meshes:
+                return
+            camera = self.cameraPosition()
+            camera = numpy.array([camera.x(), camera.y(), camera.z()])
+            objects = [
+                (mesh.triangleCounts(), mesh.radius, float(numpy.linalg.norm(mesh.center - camera))) for mesh in meshes
+            ]
+            for mesh, level in zip(meshes, select_levels(objects, self._max_triangles)):
+                mesh.setLevel(level)
+
+        def paintGL(self, *args, **kwargs):
+            self.update_levels_of_detail()
+            GLViewWidget.paintGL(self, *args, **kwargs)
+
         @property
         def slice(self):
             """
@@ -228,6 +263,9 @@ else:
         def invalidate_cache(self, name):
             pass
 
+        def set_triangle_budget(self, max_triangles):
+            pass
+
         @property
         def visible_meshes(self):
             return []
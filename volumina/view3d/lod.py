@@ -0,0 +1,156 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Level of detail for the meshes of the 3D view.
+
+Each object is meshed at several levels of detail (see meshgenerator.labeling_to_mesh):
+level 0 is the finest, every further level is marched on a downsampled labeling
+and decimated to its triangle budget. The 3D view shows the level that suits the
+object's apparent size and keeps the total number of triangles within a budget.
+"""
+import math
+
+import numpy
+from pyqtgraph.opengl import GLMeshItem
+
+# (downsampling step, triangle budget) per level, finest first
+DEFAULT_LOD_LEVELS = ((1, 500000), (2, 100000), (4, 20000))
+
+
+def decimate(vertices, faces, max_triangles):
+    """
+    Reduce a mesh to at most max_triangles triangles by vertex clustering.
+
+    The vertices are snapped to a grid, all vertices in one grid cell are merged into
+    their mean, and degenerate and duplicate triangles are dropped. The grid is
+    coarsened until the triangle budget is met.
+
+    :param numpy.ndarray vertices: (n, 3) vertex positions
+    :param numpy.ndarray faces: (m, 3) vertex indices
+    :param int max_triangles: the triangle budget
+    :return: the decimated vertices and faces
+    """
+    if len(faces) <= max_triangles:
+        return vertices, faces
+
+    lower = vertices.min(axis=0)
+    extent = max(float((vertices.max(axis=0) - lower).max()), 1e-6)
+    # the number of surface triangles is roughly proportional to (extent / cell) ** 2
+    cell = extent / math.sqrt(max_triangles)
+    while True:
+        cells = numpy.floor((vertices - lower) / cell).astype(numpy.int64)
+        dims = cells.max(axis=0) + 1
+        _, cluster = numpy.unique(numpy.ravel_multi_index(cells.T, dims), return_inverse=True)
+        cluster = cluster.ravel()
+
+        new_faces = cluster[faces]
+        new_faces = new_faces[
+            (new_faces[:, 0] != new_faces[:, 1])
+            & (new_faces[:, 1] != new_faces[:, 2])
+            & (new_faces[:, 0] != new_faces[:, 2])
+        ]
+        _, first = numpy.unique(numpy.sort(new_faces, axis=1), axis=0, return_index=True)
+        new_faces = new_faces[numpy.sort(first)]
+        if len(new_faces) <= max_triangles or cell >= extent:
+            break
+        cell *= 1.25
+
+    counts = numpy.bincount(cluster)
+    new_vertices = numpy.stack(
+        [numpy.bincount(cluster, weights=vertices[:, d]) / counts for d in range(vertices.shape[1])], axis=1
+    )
+
+    # drop the vertices that are not referenced anymore
+    used, new_faces = numpy.unique(new_faces, return_inverse=True)
+    return new_vertices[used].astype(vertices.dtype), new_faces.reshape(-1, 3).astype(faces.dtype)
+
+
+def select_levels(objects, max_triangles=None, detail=0.5):
+    """
+    Choose the level of detail for each object.
+
+    An object gets the finest level while its apparent size (radius / distance from the camera)
+    is at least detail, and one level coarser for each halving of the apparent size below that.
+    Then, while the total number of triangles exceeds max_triangles, the object with the most
+    triangles is coarsened (so the more objects are shown, the coarser they get).
+
+    :param Sequence[Tuple[Sequence[int], float, float]] objects: for each object: the triangle counts
+        of its levels (finest first), its radius and its distance from the camera
+    :param Optional[int] max_triangles: the triangle budget for all objects together
+    :param float detail: the apparent size down to which objects are shown at the finest level
+    :rtype: List[int]
+    """
+    levels = []
+    for counts, radius, distance in objects:
+        apparent = radius / max(distance, 1e-6)
+        level = 0 if apparent >= detail else int(math.log2(detail / max(apparent, 1e-12)))
+        levels.append(min(level, len(counts) - 1))
+
+    if max_triangles is not None:
+        total = sum(counts[level] for (counts, _, _), level in zip(objects, levels))
+        while total > max_triangles:
+            coarsenable = [i for i, (counts, _, _) in enumerate(objects) if levels[i] < len(counts) - 1]
+            if not coarsenable:
+                break
+            i = max(coarsenable, key=lambda i: objects[i][0][levels[i]])
+            counts = objects[i][0]
+            total -= counts[levels[i]] - counts[levels[i] + 1]
+            levels[i] += 1
+    return levels
+
+
+class LODMeshItem(GLMeshItem):
+    """
+    A GLMeshItem that holds several levels of detail of its mesh and shows one of them.
+    """
+
+    def __init__(self, levels, **kwds):
+        """
+        :param Sequence[MeshData] levels: the meshes, finest first
+        """
+        self._levels = list(levels)
+        self._level = 0
+        super(LODMeshItem, self).__init__(meshdata=self._levels[0], **kwds)
+
+        vertices = self._levels[0].vertexes()
+        if len(vertices):
+            lower, upper = vertices.min(axis=0), vertices.max(axis=0)
+            self.center = (lower + upper) / 2
+            self.radius = float(numpy.linalg.norm(upper - lower)) / 2
+        else:
+            self.center = numpy.zeros(3)
+            self.radius = 0.0
+
+    @property
+    def levels(self):
+        return list(self._levels)
+
+    def level(self):
+        return self._level
+
+    def triangleCounts(self):
+        return [len(mesh.faces()) for mesh in self._levels]
+
+    def setLevel(self, level):
+        if level != self._level:
+            self._level = level
+            self.setMeshData(meshdata=self._levels[level])
@@ -0,0 +1,186 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy
+from pyqtgraph.opengl import MeshData
+
+logger = logging.getLogger(__name__)
+
+
+def mesh_key(labeling, label, bbox, variant=None):
+    """
+    Identify the mesh of a label by the content of its mask.
+
+    The key only changes if the voxels of the label change (or the shape of the labeling,
+    which determines whether the surface is closed at the border), so edits elsewhere in
+    the labeling don't invalidate the mesh.
+
+    :param numpy.ndarray labeling: the labeling
+    :param int label: the label
+    :param Tuple[slice, ...] bbox: the bounding box of the label (see meshgenerator.label_bounding_boxes)
+    :param variant: distinguishes meshes generated with different settings (e.g. levels of detail),
+                    its repr is part of the key
+    :rtype: str
+    """
+    mask = labeling[bbox] == label
+    geometry = list(labeling.shape) + [s.start for s in bbox] + list(mask.shape)
+    digest = hashlib.sha1(numpy.asarray(geometry, dtype=numpy.int64).tobytes())
+    digest.update(numpy.packbits(mask).tobytes())
+    if variant is not None:
+        digest.update(repr(variant).encode())
+    return digest.hexdigest()
+
+
+class MeshCache(object):
+    """
+    Caches MeshData, or lists of MeshData (levels of detail), by mesh_key.
+
+    The most recently used max_entries meshes are kept in memory. If a directory is given,
+    meshes are also stored there (one .npz file per mesh) and can be reused across sessions.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, directory=None, max_entries=MAX_ENTRIES):
+        """
+        :param Optional[str] directory: where to persist the meshes, None to keep them in memory only
+        :param int max_entries: the number of meshes to keep in memory
+        """
+        self._directory = directory
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._meshes = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._meshes:
+                return True
+        return self._directory is not None and os.path.exists(self._path(key))
+
+    def get(self, key):
+        """
+        Look up the mesh for the given key.
+
+        :param str key: see mesh_key
+        :rtype: Optional[Union[MeshData, List[MeshData]]]
+        """
+        with self._lock:
+            mesh = self._meshes.get(key)
+            if mesh is not None:
+                self._meshes.move_to_end(key)
+                return mesh
+
+        mesh = self._load(key)
+        if mesh is not None:
+            self._remember(key, mesh)
+        return mesh
+
+    def put(self, key, mesh):
+        """
+        Store the mesh for the given key.
+
+        :param str key: see mesh_key
+        :param Union[MeshData, List[MeshData]] mesh: the mesh, or its levels of detail
+        """
+        self._remember(key, mesh)
+        if self._directory is not None:
+            self._save(key, mesh)
+
+    def clear(self):
+        """Forget the meshes in memory (persisted meshes are kept)"""
+        with self._lock:
+            self._meshes.clear()
+
+    def _remember(self, key, mesh):
+        with self._lock:
+            self._meshes[key] = mesh
+            self._meshes.move_to_end(key)
+            while len(self._meshes) > self._max_entries:
+                self._meshes.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + ".npz")
+
+    def _save(self, key, mesh):
+        # Persisting is best effort: a failure must never keep the mesh from being shown.
+        tmp = None
+        try:
+            if isinstance(mesh, MeshData):
+                arrays = self._to_arrays(mesh)
+            else:
+                arrays = {"levels": numpy.int64(len(mesh))}
+                for i, level in enumerate(mesh):
+                    arrays.update({"{}_{}".format(name, i): a for name, a in self._to_arrays(level).items()})
+            # write to a temporary file first, so that readers never see partial files
+            fd, tmp = tempfile.mkstemp(suffix=".npz", dir=self._directory)
+            with os.fdopen(fd, "wb") as f:
+                numpy.savez(f, **arrays)
+            os.replace(tmp, self._path(key))
+            tmp = None
+        except Exception:
+            logger.warning("Failed to write mesh to %s", self._directory, exc_info=True)
+        finally:
+            if tmp is not None and os.path.exists(tmp):
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    logger.warning("Failed to remove %s", tmp, exc_info=True)
+
+    def _load(self, key):
+        if self._directory is None:
+            return None
+        try:
+            with numpy.load(self._path(key)) as arrays:
+                if "levels" not in arrays:
+                    return self._from_arrays(arrays)
+                return [self._from_arrays(arrays, "_{}".format(i)) for i in range(int(arrays["levels"]))]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            logger.warning("Failed to read mesh %s from %s", key, self._directory, exc_info=True)
+            return None
+
+    @staticmethod
+    def _to_arrays(mesh):
+        arrays = {"vertices": mesh.vertexes(), "faces": mesh.faces()}
+        if mesh._vertexNormals is not None:
+            arrays["normals"] = mesh._vertexNormals
+        return arrays
+
+    @staticmethod
+    def _from_arrays(arrays, suffix=""):
+        mesh = MeshData(arrays["vertices" + suffix], arrays["faces" + suffix])
+        if "normals" + suffix in arrays:
+            mesh._vertexNormals = arrays["normals" + suffix]
+        return mesh
@@ -0,0 +1,246 @@
+###############################################################################
+#   volumina: volume slicing and editing library
+#
+#       Copyright (C) 2011-2024, the ilastik developers
+#                                <team@ilastik.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the Lesser GNU General Public License
+# as published by the Free Software Foundation; either version 2.1
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# See the files LICENSE.lgpl2 and LICENSE.lgpl3 for full text of the
+# GNU Lesser General Public License version 2.1 and 3 respectively.
+# This information is also available on the ilastik web site at:
+#          http://ilastik.org/license/
+###############################################################################
+"""
+Writing MeshData to .obj (text), .ply and .stl (binary little endian) files.
+
+All writers work on whole arrays: OBJ lines are formatted in chunks by a single
+%-operation each, PLY and STL records are written straight from structured arrays.
+"""
+import os
+
+import numpy
+from pyqtgraph.opengl import MeshData
+
+FILE_FORMATS = ("obj", "ply", "stl")
+
+# number of OBJ lines formatted at once
+CHUNK_ROWS = 65536
+
+_PLY_FACE = numpy.dtype([("n", "u1"), ("indices", "<i4", (3,))])
+_STL_TRIANGLE = numpy.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")])
+
+
+def mesh_file_format(path, file_format=None):
+    """
+    The format to write path in: file_format if given, else the extension of path.
+
+    :raises ValueError: if the format is not one of FILE_FORMATS
+    :rtype: str
+    """
+    fmt = (file_format or os.path.splitext(path)[1][1:]).lower()
+    if fmt not in FILE_FORMATS:
+        raise ValueError("Unsupported mesh format {!r}, expected one of {}".format(fmt, ", ".join(FILE_FORMATS)))
+    return fmt
+
+
+def vertex_normals(mesh):
+    """
+    The vertex normals of the mesh: the generated ones if present, else the normalized sum of the
+    normals of the adjacent faces (like MeshData.vertexNormals, without a Python loop over the vertices).
+
+    :param MeshData mesh: the mesh
+    :rtype: numpy.ndarray
+    """
+    if mesh._vertexNormals is not None:
+        return mesh._vertexNormals
+    return compute_vertex_normals(mesh.vertexes(), mesh.faces())
+
+
+def compute_vertex_normals(vertices, faces):
+    """
+    The normalized sum of the normals of the faces adjacent to each vertex
+
+    :param numpy.ndarray vertices: the vertices, shape (n, 3)
+    :param numpy.ndarray faces: the vertex indices of the triangles, shape (m, 3)
+    :rtype: numpy.ndarray
+    """
+    normals = numpy.zeros(vertices.shape, dtype=numpy.float32)
+    face_normals = _face_normals(vertices, faces, normalize=False)
+    for corner in range(3):
+        numpy.add.at(normals, faces[:, corner], face_normals)
+    length = numpy.linalg.norm(normals, axis=1, keepdims=True)
+    numpy.divide(normals, length, out=normals, where=length > 0)
+    return normals
+
+
+def _face_normals(vertices, faces, normalize=True):
+    corners = vertices[faces]
+    normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]).astype(numpy.float32)
+    if normalize:
+        length = numpy.linalg.norm(normals, axis=1, keepdims=True)
+        numpy.divide(normals, length, out=normals, where=length > 0)
+    return normals
+
+
+def _write_rows(f, fmt, rows):
+    """Write one line per row of rows, formatted by fmt"""
+    for start in range(0, len(rows), CHUNK_ROWS):
+        chunk = rows[start : start + CHUNK_ROWS]
+        f.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def _write_obj(f, mesh, name, first_index=1):
+    """
+    Write one object to an open .obj file
+
+    :param int first_index: the (1-based) index of the first vertex of the object in the file
+    :return: the number of vertices written
+    """
+    vertices = mesh.vertexes()
+    # enough digits to reproduce the coordinates exactly
+    digits = 9 if vertices.dtype.itemsize <= 4 else 17
+    f.write("o {}\n".format(name))
+    _write_rows(f, "v %.{0}g %.{0}g %.{0}g\n".format(digits), vertices)
+    _write_rows(f, "vn %.9g %.9g %.9g\n", vertex_normals(mesh))
+    _write_rows(f, "f %d//%d %d//%d %d//%d\n", numpy.repeat(mesh.faces().astype(numpy.int64) + first_index, 2, axis=1))
+    return len(vertices)
+
+
+def mesh_to_obj(mesh, path, name):
+    """
+    Write the mesh to .obj
+
+    :param MeshData mesh: the mesh to save
+    :param str path: the path for the file
+    :param str name: the name for the object
+    """
+    with open(path, "w") as fout:
+        _write_obj(fout, mesh, name)
+
+
+def mesh_to_ply(mesh, path, name=None):
+    """
+    Write the mesh to binary .ply (vertices with normals, triangles)
+
+    :param MeshData mesh: the mesh to save
+    :param str path: the path for the file
+    :param str name: an optional name, stored as comment
+    """
+    vertices = numpy.empty((len(mesh.vertexes()), 6), dtype="<f4")
+    vertices[:, :3] = mesh.vertexes()
+    vertices[:, 3:] = vertex_normals(mesh)
+    faces = numpy.empty(len(mesh.faces()), dtype=_PLY_FACE)
+    faces["n"] = 3
+    faces["indices"] = mesh.faces()
+
+    header = ["ply", "format binary_little_endian 1.0"]
+    if name is not None:
+        header.append("comment {}".format(name))
+    header.append("element vertex {}".format(len(vertices)))
+    header.extend("property float {}".format(p) for p in ("x", "y", "z", "nx", "ny", "nz"))
+    header.append("element face {}".format(len(faces)))
+    header.extend(["property list uchar int vertex_indices", "end_header"])
+    with open(path, "wb") as fout:
+        fout.write(("\n".join(header) + "\n").encode("ascii"))
+        fout.write(vertices.tobytes())
+        fout.write(faces.tobytes())
+
+
+def _stl_triangles(mesh):
+    vertices, faces = mesh.vertexes(), mesh.faces()
+    triangles = numpy.zeros(len(faces), dtype=_STL_TRIANGLE)
+    triangles["normal"] = _face_normals(vertices, faces)
+    triangles["vertices"] = vertices[faces]
+    return triangles
+
+
+def _stl_header(name, count):
+    return "{:<80}".format((name or "volumina")[:80]).encode("ascii", "replace") + numpy.uint32(count).tobytes()
+
+
+def mesh_to_stl(mesh, path, name=None):
+    """
+    Write the mesh to binary .stl
+
+    :param MeshData mesh: the mesh to save
+    :param str path: the path for the file
+    :param str name: an optional name, stored in the header
+    """
+    triangles = _stl_triangles(mesh)
+    with open(path, "wb") as fout:
+        fout.write(_stl_header(name, len(triangles)))
+        fout.write(triangles.tobytes())
+
+
+MESH_WRITERS = {"obj": mesh_to_obj, "ply": mesh_to_ply, "stl": mesh_to_stl}
+
+
+def mesh_to_file(mesh, path, name, file_format=None):
+    """
+    Write the mesh in the given format, or the one matching the extension of path
+
+    :param MeshData mesh: the mesh to save
+    :param str path: the path for the file
+    :param str name: the name for the object
+    :param str file_format: one of FILE_FORMATS
+    """
+    MESH_WRITERS[mesh_file_format(path, file_format)](mesh, path, name)
+
+
+def meshes_to_file(meshes, path, file_format=None):
+    """
+    Write several meshes to one file.
+
+    The meshes are written as they come (OBJ: one object per mesh, STL: one triangle soup),
+    except for PLY, which needs all counts in the header: the meshes are merged first.
+
+    :param Iterable[Tuple[str, MeshData]] meshes: name and mesh of each object
+    :param str path: the path for the file
+    :param str file_format: one of FILE_FORMATS
+    """
+    fmt = mesh_file_format(path, file_format)
+    if fmt == "obj":
+        with open(path, "w") as fout:
+            first_index = 1
+            for name, mesh in meshes:
+                first_index += _write_obj(fout, mesh, name, first_index)
+    elif fmt == "stl":
+        with open(path, "wb") as fout:
+            fout.write(_stl_header(None, 0))
+            count = 0
+            for _, mesh in meshes:
+                triangles = _stl_triangles(mesh)
+                fout.write(triangles.tobytes())
+                count += len(triangles)
+            fout.seek(80)
+            fout.write(numpy.uint32(count).tobytes())
+    else:
+        mesh_to_ply(merge_meshes(mesh for _, mesh in meshes), path)
+
+
+def merge_meshes(meshes):
+    """
+    Combine several meshes into one
+
+    :param Iterable[MeshData] meshes: the meshes
+    :rtype: MeshData
+    """
+    meshes = list(meshes)
+    if not meshes:
+        return MeshData(numpy.zeros((0, 3), dtype=numpy.float32), numpy.zeros((0, 3), dtype=numpy.uint32))
+    offsets = numpy.cumsum([0] + [len(mesh.vertexes()) for mesh in meshes[:-1]])
+    merged = MeshData(
+        numpy.concatenate([mesh.vertexes() for mesh in meshes]),
+        numpy.concatenate([mesh.faces().astype(numpy.int64) + offset for mesh, offset in zip(meshes, offsets)]),
+    )
+    merged._vertexNormals = numpy.concatenate([vertex_normals(mesh) for mesh in meshes])
+    return merged
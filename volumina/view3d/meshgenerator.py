@@ -1,5 +1,8 @@
-from os.path import split, join
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from os.path import isdir, join, split
 
+import numpy
 from numpy import where
 
 from pyqtgraph.opengl import MeshData, GLMeshItem
@@ -9,6 +12,14 @@ from qtpy.QtCore import QThread, Signal
 from qtpy.QtWidgets import QDialog
 from qtpy.uic import loadUiType
 
+from .lod import LODMeshItem, decimate
+from .meshexport import (
+    compute_vertex_normals,
+    mesh_file_format,
+    mesh_to_file,
+    mesh_to_obj,
+    meshes_to_file,
+)  # noqa: F401
 
 try:
     from marching_cubes import march
@@ -52,36 +63,218 @@ ShaderProgram(
 )
 
 
-def labeling_to_mesh(labeling, labels):
+# voxels label_bounding_boxes looks at at once, bounds its temporary memory (about 40 bytes per voxel)
+BBOX_CHUNK_VOXELS = 2**20
 
-    for label in labels:
-        vertices, normals, faces = march(where(labeling == label, 2, 0).astype(int).T, 3)
-        data = MeshData(vertices, faces)
-        if normals is not None:
-            data._vertexNormals = normals
 
-        yield label, data
+def label_bounding_boxes(labeling, labels):
+    """
+    Find the bounding boxes of several labels in a single pass over the labeling
 
+    The labeling is scanned in slabs along its first axis (see BBOX_CHUNK_VOXELS),
+    so the temporary memory doesn't grow with the size of the labeling.
 
-def mesh_to_obj(mesh, path, name):
+    :param numpy.ndarray labeling: the labeling
+    :param Iterable[int] labels: the labels to look for
+    :return: a dict label -> tuple of slices, for the labels that occur in the labeling
+    :rtype: Dict[int, Tuple[slice, ...]]
+    """
+    labels = numpy.unique(numpy.asarray(list(labels), dtype=labeling.dtype))
+    if labels.size == 0 or labeling.size == 0:
+        return {}
+
+    starts = numpy.full((labels.size, labeling.ndim), numpy.iinfo(numpy.intp).max, dtype=numpy.intp)
+    stops = numpy.zeros((labels.size, labeling.ndim), dtype=numpy.intp)
+    rows = max(1, BBOX_CHUNK_VOXELS // (labeling.size // labeling.shape[0]))
+    for first in range(0, labeling.shape[0], rows):
+        _update_bounding_boxes(labeling[first : first + rows], first, labels, starts, stops)
+
+    return {
+        label.item(): tuple(slice(int(start), int(stop)) for start, stop in zip(starts[i], stops[i]))
+        for i, label in enumerate(labels)
+        if stops[i, 0] > 0
+    }
+
+
+def _update_bounding_boxes(slab, first, labels, starts, stops):
+    """Extend the bounding boxes (starts, stops) of the sorted labels by a slab of the labeling starting at first"""
+    flat = slab.ravel()
+    index = numpy.minimum(numpy.searchsorted(labels, flat), labels.size - 1)
+    positions = numpy.flatnonzero(labels[index] == flat)
+    which = index[positions]
+    del index
+
+    # one coordinate array at a time (unravel_index would create all of them)
+    stride = slab.size
+    for axis, extent in enumerate(slab.shape):
+        stride //= extent
+        coords = positions // stride % extent
+        if axis == 0:
+            coords += first
+        numpy.minimum.at(starts[:, axis], which, coords)
+        numpy.maximum.at(stops[:, axis], which, coords + 1)
+
+
+def _march_label(crop, label, offset, step=1, max_triangles=None):
+    """
+    Run marching cubes on one label of a cropped labeling (may run in a worker process)
+
+    :param numpy.ndarray crop: the labeling, cropped to the (padded) bounding box of the label
+    :param int label: the label to mesh
+    :param Sequence[int] offset: the position of the crop in the labeling
+    :param int step: march every step-th voxel only (the crop must be padded by at least step voxels)
+    :param Optional[int] max_triangles: decimate the mesh to at most this many triangles
+    :return: the vertices (in labeling coordinates), vertex normals and faces,
+             or None if the label vanishes at this step
     """
-    Write the mesh to .obj
+    mask = crop[::step, ::step, ::step] == label
+    if not mask.any():
+        return None
+    vertices, normals, faces = march(where(mask, 2, 0).astype(int).T, 3)
+    # the crop is transposed for march, and so are the vertex coordinates
+    vertices = vertices * step + numpy.asarray(offset[::-1], dtype=vertices.dtype)
+    if max_triangles is not None and len(faces) > max_triangles:
+        vertices, faces = decimate(vertices, faces, max_triangles)
+        normals = None
+    if normals is None:
+        # computed here, in the worker: else pyqtgraph computes them vertex by vertex in the GUI thread
+        normals = compute_vertex_normals(vertices, faces)
+    return vertices, normals, faces
+
+
+def _march_levels(crop, label, offset, lod_levels):
+    """
+    Mesh one label at several levels of detail (may run in a worker process)
+
+    A level whose step is too coarse to sample the label is decimated from the previous level instead.
 
-    :param MeshData mesh: the mesh to save
-    :param str path: the path for the file
-    :param str name: the name for the object
+    :param Sequence[Tuple[int, int]] lod_levels: (step, triangle budget) per level, finest first
+    :return: a list of (vertices, normals, faces), one per level
     """
-    with open(path, "w") as fout:
-        fout.write("o {}\n".format(name))
+    levels = []
+    for step, max_triangles in lod_levels:
+        level = _march_label(crop, label, offset, step, max_triangles)
+        if level is None:
+            vertices, faces = decimate(levels[-1][0], levels[-1][2], max_triangles)
+            level = vertices, compute_vertex_normals(vertices, faces), faces
+        levels.append(level)
+    return levels
+
 
-        for vertex in mesh.vertexes():
-            fout.write("v {} {} {}\n".format(*vertex))
+def _crop(labeling, bbox, pad=1):
+    """Crop labeling to bbox, padded by pad voxels (within the labeling)"""
+    start = [max(s.start - pad, 0) for s in bbox]
+    stop = [min(s.stop + pad, n) for s, n in zip(bbox, labeling.shape)]
+    return labeling[tuple(slice(a, b) for a, b in zip(start, stop))], start
 
-        for normal in mesh.vertexNormals():
-            fout.write("vn {} {} {}\n".format(*normal))
 
-        for index in mesh.faces():
-            fout.write("f {0}//{0} {1}//{1} {2}//{2}\n".format(*(i + 1 for i in index)))
+def mesh_padding(lod_levels=None):
+    """The number of voxels labeling_to_mesh looks at around the bounding box of a label"""
+    if lod_levels is None:
+        return 1
+    # the coarsest step needs the widest padding to sample the background around the label
+    return max(step for step, _ in lod_levels)
+
+
+def labeling_to_mesh(labeling, labels, executor=None, lod_levels=None, origin=None):
+    """
+    Generate a mesh for each label in the labeling.
+
+    All bounding boxes are computed in one pass; each label is then meshed
+    in its padded bounding box only, in parallel if an executor is given.
+    The meshes are yielded as they finish (not necessarily in the order of labels).
+    Labels that don't occur in the labeling are skipped.
+
+    If lod_levels are given, each label is meshed at several levels of detail: for each
+    (step, max_triangles) the labeling is downsampled by step before marching and the mesh
+    is decimated to max_triangles (see lod.DEFAULT_LOD_LEVELS), and a list of meshes
+    (finest first) is yielded per label.
+
+    :param numpy.ndarray labeling: the labeling to convert into meshes
+    :param Iterable[int] labels: the labels to generate meshes for
+    :param concurrent.futures.Executor executor: an optional thread or process pool to mesh the labels in
+    :param Optional[Sequence[Tuple[int, int]]] lod_levels: (step, triangle budget) per level, finest first
+    :param Optional[Sequence[int]] origin: the position of labeling in the volume the meshes are placed in,
+                                           if labeling is a crop (padded by mesh_padding(lod_levels))
+    :rtype: Iterator[Tuple[int, Union[MeshData, List[MeshData]]]]
+    """
+    bboxes = label_bounding_boxes(labeling, labels)
+    origin = origin or (0,) * labeling.ndim
+    pad = mesh_padding(lod_levels)
+
+    def crop(bbox):
+        cropped, start = _crop(labeling, bbox, pad)
+        return cropped, [o + a for o, a in zip(origin, start)]
+
+    def to_mesh_data(vertices, normals, faces):
+        data = MeshData(vertices, faces)
+        data._vertexNormals = normals
+        return data
+
+    if lod_levels is None:
+        march_label, args = _march_label, ()
+
+        def convert(result):
+            return to_mesh_data(*result)
+
+    else:
+        march_label, args = _march_levels, (lod_levels,)
+
+        def convert(result):
+            return [to_mesh_data(*level) for level in result]
+
+    if executor is None:
+        for label, bbox in bboxes.items():
+            cropped, offset = crop(bbox)
+            yield label, convert(march_label(cropped, label, offset, *args))
+        return
+
+    futures = {}
+    for label, bbox in bboxes.items():
+        cropped, offset = crop(bbox)
+        futures[executor.submit(march_label, cropped, label, offset, *args)] = label
+    try:
+        for future in as_completed(futures):
+            yield futures[future], convert(future.result())
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def export_labeling(labeling, labels, path, file_format=None, name_mapping=None, max_workers=None):
+    """
+    Mesh several labels in parallel and write them to one file, or one file per label.
+
+    If path is an existing directory, each label is written to "<name>.<file_format>" in it,
+    in parallel to the meshing of the other labels. Otherwise all labels are written to path
+    (see meshexport.meshes_to_file) as they are meshed.
+
+    :param numpy.ndarray labeling: the labeling to convert into meshes
+    :param Iterable[int] labels: the labels to export
+    :param str path: the file or directory to write to
+    :param str file_format: one of meshexport.FILE_FORMATS (default: the extension of path, "obj" for directories)
+    :param Mapping[int, str] name_mapping: an optional mapping to name the labels
+    :param int max_workers: the number of labels to mesh in parallel (default: see ThreadPoolExecutor)
+    :return: the paths of the written files
+    :rtype: List[str]
+    """
+    name_mapping = name_mapping or {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        meshes = (
+            (str(name_mapping.get(label, label)), mesh) for label, mesh in labeling_to_mesh(labeling, labels, executor)
+        )
+        if not isdir(path):
+            meshes_to_file(meshes, path, file_format)
+            return [path]
+
+        file_format = mesh_file_format("", file_format or "obj")
+        writes = {}
+        for name, mesh in meshes:
+            file_path = join(path, "{}.{}".format(name, file_format))
+            writes[file_path] = executor.submit(mesh_to_file, mesh, file_path, name, file_format)
+        for future in writes.values():
+            future.result()
+        return list(writes)
 
 
 class MeshGenerator(QThread):
@@ -89,12 +282,15 @@ class MeshGenerator(QThread):
     This class wraps the mesh generation in a thread to avoid locking the ui.
 
     signal:
-        mesh_generated: emitted when the generation finished, passes the label/name and generated mesh
+        mesh_generated: emitted when the generation finished, passes the label/name, generated mesh
+                        and the key given for the name (see keys)
     """
 
-    mesh_generated = Signal(object, object)
+    mesh_generated = Signal(object, object, object)
 
-    def __init__(self, receiver, labeling, labels, name_mapping=None):
+    def __init__(
+        self, receiver, labeling, labels, name_mapping=None, max_workers=None, lod_levels=None, keys=None, origin=None
+    ):
         """
         Create the thread, connect the signals and start immediately
 
@@ -102,27 +298,58 @@ class MeshGenerator(QThread):
         :param numpy.ndarray labeling: the numpy array containing the labeling to convert into a mesh
         :param Iterable[int] labels: the labels to include
         :param Mapping[int, str] name_mapping: an optional mapping to rename the labels
+        :param int max_workers: the number of labels to mesh in parallel (default: see ThreadPoolExecutor)
+        :param Sequence[Tuple[int, int]] lod_levels: mesh at several levels of detail and send LODMeshItems
+                                                     (see labeling_to_mesh)
+        :param Mapping[str, object] keys: an optional key per name (e.g. a mesh_key), passed along with its mesh
+        :param Sequence[int] origin: the position of labeling in the volume, if it is a crop (see labeling_to_mesh)
         """
         super(MeshGenerator, self).__init__()
         self.mesh_generated.connect(receiver)
-        self.start()
         self._labeling = labeling
         self._labels = labels
         self._mapping = name_mapping or {}
+        self._max_workers = max_workers
+        self._lod_levels = lod_levels
+        self._keys = keys or {}
+        self._origin = origin
+        self._cancelled = False
+        self.start()
+
+    def cancel(self):
+        """Stop generating: the receiver gets no more meshes, nor the final signal"""
+        self._cancelled = True
+        try:
+            self.mesh_generated.disconnect()
+        except TypeError:
+            pass  # not connected anymore
 
     def run(self):
         """
         This does the actual mesh generation.
 
-        The labeling is converted into a mesh which is then wrapped in a GLMeshItem.
-        For each generated mesh the signal mesh_generated is emitted containing the label/name and mesh.
+        The labels are meshed in parallel, each mesh is wrapped in a GLMeshItem
+        (a LODMeshItem if levels of detail were requested).
+        For each generated mesh the signal mesh_generated is emitted containing the label/name and mesh,
+        as soon as it is finished.
 
         When finished the signal mesh_generated is emitted again with label 0 and mesh None
         """
-        for label, mesh in labeling_to_mesh(self._labeling, self._labels):
-            item = GLMeshItem(meshdata=mesh, smooth=True, shader="toon")
-            self.mesh_generated.emit(self._mapping.get(label, label), item)
-        self.mesh_generated.emit(0, None)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor, closing(
+            labeling_to_mesh(self._labeling, self._labels, executor, self._lod_levels, self._origin)
+        ) as meshes:
+            for label, mesh in meshes:
+                if self._cancelled:
+                    # closing the generator drops the labels that have not been started yet
+                    return
+                if self._lod_levels is None:
+                    item = GLMeshItem(meshdata=mesh, smooth=True, shader="toon")
+                else:
+                    item = LODMeshItem(mesh, smooth=True, shader="toon")
+                name = self._mapping.get(label, label)
+                self.mesh_generated.emit(name, item, self._keys.get(name))
+        if not self._cancelled:
+            self.mesh_generated.emit(0, None, None)
 
 
 class MeshGeneratorDialog(QDialog):
@@ -153,7 +380,7 @@ class MeshGeneratorDialog(QDialog):
         self._thread = MeshGenerator(self._mesh_generated, volume, [1])
         self._thread.start()
 
-    def _mesh_generated(self, _, mesh):
+    def _mesh_generated(self, _, mesh, _key):
         """
         The slot when the export is finished.
 
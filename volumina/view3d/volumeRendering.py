@@ -24,7 +24,12 @@ import numpy
 from colorsys import hsv_to_rgb
 from threading import current_thread
 
-from .meshgenerator import MeshGenerator
+from pyqtgraph.opengl import GLMeshItem
+
+from volumina.config import CONFIG
+from .lod import DEFAULT_LOD_LEVELS, LODMeshItem
+from .meshcache import MeshCache, mesh_key
+from .meshgenerator import MeshGenerator, label_bounding_boxes, mesh_padding
 
 NUM_OBJECTS = 256
 
@@ -62,13 +67,27 @@ class RenderingManager(object):
 
     """
 
-    def __init__(self, overview_scene):
+    def __init__(self, overview_scene, mesh_cache=None, lod_levels=None):
+        """
+        :param Overview3D overview_scene: the 3d view
+        :param MeshCache mesh_cache: the cache for the generated meshes (default: persisted
+                                     to the mesh_cache_dir in ~/.voluminarc, if configured)
+        :param lod_levels: (step, triangle budget) per level of detail, finest first (see
+                           meshgenerator.labeling_to_mesh) (default: lod.DEFAULT_LOD_LEVELS if
+                           mesh_levels_of_detail is enabled in ~/.voluminarc, else full resolution meshes only)
+        """
         self._overview_scene = overview_scene
         self.labelmgr = LabelManager(NUM_OBJECTS)
         self.ready = False
         self._cmap = {}
         self._mesh_thread = None
+        self._cancelled_threads = []  # MeshGenerators that may still be running, see _generate
         self._dirty = False
+        self._mesh_cache = mesh_cache if mesh_cache is not None else MeshCache(CONFIG.mesh_cache_dir)
+        self._mesh_keys = {}  # name -> mesh_key of the mesh in the 3d view
+        if lod_levels is None and CONFIG.mesh_levels_of_detail:
+            lod_levels = DEFAULT_LOD_LEVELS
+        self._lod_levels = lod_levels
 
         def _handle_scene_init():
             self.setup(self._overview_scene.dataShape)
@@ -80,8 +99,17 @@ class RenderingManager(object):
         shape = shape[::-1]
         self._volume = numpy.zeros(shape, dtype=numpy.uint8)
         self._mapping = {}
+        self._reset_label_index()
         self.ready = True
 
+    def _reset_label_index(self):
+        # Label presence index, maintained incrementally by _write():
+        # the number of voxels and the bounding box (in self._volume) of each label
+        self._label_counts = numpy.zeros(numpy.iinfo(self._volume.dtype).max + 1, dtype=numpy.int64)
+        self._label_counts[0] = self._volume.size
+        self._label_bboxes = {}
+        self._label_keys = {}  # label -> mesh_key, for the labels that didn't change since the last update()
+
     def update(self):
         assert (
             current_thread().name == "MainThread"
@@ -91,34 +119,87 @@ class RenderingManager(object):
             return
         self._dirty = False
 
-        new_labels = set(numpy.unique(self._volume))
+        new_labels = set(numpy.flatnonzero(self._label_counts))
         new_names = set(filter(None, (self._mapping.get(label) for label in new_labels)))
         old_names = self._overview_scene.get_visible_objects()
         for name in old_names - new_names:
             self._overview_scene.remove_object(name)
 
-        names_to_add = new_names - old_names
-        known = set(filter(self._overview_scene.has_object, names_to_add))
-        generate = set(self._mapping[name] for name in names_to_add - known)
+        # Meshes are identified by the content of their label's mask,
+        # objects that didn't change are never regenerated.
+        generate = {}  # name -> mesh_key
+        for name in new_names:
+            label = self._mapping[name]
+            key = self._label_keys.get(label)
+            if key is None:
+                key = self._label_keys[label] = mesh_key(
+                    self._volume, label, self._label_bboxes[label], self._lod_levels
+                )
+            if self._overview_scene.has_object(name) and self._mesh_keys.get(name) == key:
+                if name not in old_names:
+                    self._overview_scene.add_object(name)
+                continue
 
-        for name in known:
-            self._overview_scene.add_object(name)
+            mesh = self._mesh_cache.get(key)
+            if mesh is None:
+                generate[name] = key
+            else:
+                self._add_mesh(name, self._mesh_item(mesh), key)
 
         if generate:
-            self._overview_scene.set_busy(True)
-            self._mesh_thread = MeshGenerator(self._on_mesh_generated, self._volume, generate, self._mapping)
+            self._generate(generate)
+
+    def _generate(self, keys):
+        """Generate the meshes of the names in keys (name -> mesh_key), replacing a generation in progress"""
+        if self._mesh_thread is not None:
+            # its meshes of unchanged labels are generated again below, as they are not shown yet
+            self._mesh_thread.cancel()
+            # a QThread must not be destroyed while it is running
+            self._cancelled_threads = [t for t in self._cancelled_threads if not t.isFinished()]
+            self._cancelled_threads.append(self._mesh_thread)
+        labels = [self._mapping[name] for name in keys]
+
+        # March on a copy of the region of these labels: self._volume keeps changing meanwhile (see _write)
+        pad = mesh_padding(self._lod_levels)
+        bboxes = [self._label_bboxes[label] for label in labels]
+        start = [max(min(b[axis].start for b in bboxes) - pad, 0) for axis in range(self._volume.ndim)]
+        stop = [min(max(b[axis].stop for b in bboxes) + pad, n) for axis, n in enumerate(self._volume.shape)]
+        snapshot = self._volume[tuple(slice(a, b) for a, b in zip(start, stop))].copy()
 
-    def _on_mesh_generated(self, label, mesh):
+        self._overview_scene.set_busy(True)
+        self._mesh_thread = MeshGenerator(
+            self._on_mesh_generated,
+            snapshot,
+            labels,
+            self._mapping,
+            lod_levels=self._lod_levels,
+            keys=keys,
+            origin=start,
+        )
+
+    @staticmethod
+    def _mesh_item(mesh):
+        if isinstance(mesh, list):
+            return LODMeshItem(mesh, smooth=True, shader="toon")
+        return GLMeshItem(meshdata=mesh, smooth=True, shader="toon")
+
+    def _on_mesh_generated(self, label, mesh, key):
         """
         Slot for the mesh generated signal from the MeshGenerator
         """
         assert current_thread().name == "MainThread"
         if label == 0 and mesh is None:
             self._overview_scene.set_busy(False)
-        else:
-            mesh.setColor(self._cmap[self._mapping[label]] + (1,))
-            mesh.setShader("headlight")
-            self._overview_scene.add_object(label, mesh)
+        elif key is not None and key == self._label_keys.get(self._mapping.get(label)):
+            self._mesh_cache.put(key, mesh.levels if isinstance(mesh, LODMeshItem) else mesh.opts["meshdata"])
+            self._add_mesh(label, mesh, key)
+        # else: the label changed since (or was removed), a newer mesh is on its way
+
+    def _add_mesh(self, name, mesh, key):
+        mesh.setColor(self._cmap[self._mapping[name]] + (1,))
+        mesh.setShader("headlight")
+        self._overview_scene.add_object(name, mesh)
+        self._mesh_keys[name] = key
 
     def setColor(self, label, color):
         self._cmap[label] = color
@@ -133,13 +214,77 @@ class RenderingManager(object):
         # Must copy here because a reference to self._volume was stored in the pipeline (see setup())
         # store in reversed-transpose order to match the wireframe axes
         new_volume, mapping = value
-        new_volume = numpy.transpose(new_volume)
-        if numpy.any(new_volume != self._volume) or mapping != self._mapping:
-            self._volume[:] = new_volume
+        new_volume = numpy.broadcast_to(numpy.transpose(new_volume), self._volume.shape)
+        changed = self._write(tuple(slice(0, n) for n in self._volume.shape), new_volume)
+        if changed or mapping != self._mapping:
+            self._mapping = mapping
+            self._dirty = True
+            self.update()
+
+    def setVolumeRoi(self, roi, subvolume, mapping):
+        """
+        Update a part of the volume.
+
+        Unlike setting volume, this only costs O(size of roi): only the labels
+        of the voxels that changed are re-indexed (and their meshes regenerated).
+
+        :param Tuple[slice, ...] roi: the changed region, in the axis order of volume
+        :param numpy.ndarray subvolume: the new content of roi
+        :param Mapping mapping: the label mapping, see volume
+        """
+        shape = self._volume.shape[::-1]
+        roi = tuple(slice(*s.indices(n)[:2]) for s, n in zip(roi, shape))
+        changed = self._write(roi[::-1], numpy.transpose(subvolume))
+        if changed or mapping != self._mapping:
             self._mapping = mapping
             self._dirty = True
             self.update()
 
+    def _write(self, roi, new):
+        """
+        Write new to self._volume[roi] and update the label index.
+
+        :param Tuple[slice, ...] roi: bounded slices into self._volume
+        :return: whether any voxel changed
+        """
+        old = self._volume[roi]
+        new = numpy.asarray(new).astype(self._volume.dtype, copy=False)
+        diff = old != new
+        if not diff.any():
+            return False
+
+        # shrink to the bounding box of the changed voxels
+        changed = []
+        for axis in range(diff.ndim):
+            projection = numpy.flatnonzero(diff.any(axis=tuple(a for a in range(diff.ndim) if a != axis)))
+            changed.append(slice(int(projection[0]), int(projection[-1]) + 1))
+        changed = tuple(changed)
+        old, new, diff = old[changed], new[changed], diff[changed]
+        roi = tuple(slice(r.start + c.start, r.start + c.stop) for r, c in zip(roi, changed))
+
+        n = self._label_counts.size
+        self._label_counts -= numpy.bincount(old.ravel(), minlength=n)
+        self._label_counts += numpy.bincount(new.ravel(), minlength=n)
+        touched = numpy.union1d(old[diff], new[diff])
+        self._volume[roi] = new
+
+        for label in touched:
+            label = label.item()
+            self._label_keys.pop(label, None)
+            if label == 0:
+                continue
+            if self._label_counts[label] == 0:
+                self._label_bboxes.pop(label, None)
+                continue
+            # The label can only occur in its old bounding box and the changed region.
+            region = roi
+            old_bbox = self._label_bboxes.get(label)
+            if old_bbox is not None:
+                region = tuple(slice(min(r.start, b.start), max(r.stop, b.stop)) for r, b in zip(region, old_bbox))
+            bbox = label_bounding_boxes(self._volume[region], [label])[label]
+            self._label_bboxes[label] = tuple(slice(r.start + b.start, r.start + b.stop) for r, b in zip(region, bbox))
+        return True
+
     def addObject(self, color=None):
         label = self.labelmgr.request()
         if color is None:
@@ -151,10 +296,12 @@ class RenderingManager(object):
         self.labelmgr.free(label)
 
     def invalidateObject(self, name):
+        self._mesh_keys.pop(name, None)
         self._overview_scene.invalidate_object(name)
 
     def clear(
         self,
     ):
         self._volume[:] = 0
+        self._reset_label_index()
         self.labelmgr.free()
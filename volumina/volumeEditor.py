@@ -52,7 +52,9 @@ from .navigationController import NavigationController, NavigationInterpreter
 from .brushingcontroller import BrushingInterpreter, BrushingController, CrosshairController
 from .thresholdingcontroller import ThresholdingInterpreter
 from .brushingmodel import BrushingModel
+from .playback import TimeSeriesPlayer
 from .slicingtools import SliceProjection
+from .pixelpipeline.datasources import BrickFetcher
 from .utility import ShortcutManager
 
 import logging
@@ -138,6 +140,8 @@ class VolumeEditor(QObject):
         self.cropModel.set_time_shape_cropped(0, s[0])
 
         self.posModel.shape5D = s
+        if self.brickFetcher is not None:
+            self.brickFetcher.setShape(s)
         # for 2D images, disable the slice intersection marker
         is_2D = (numpy.asarray(s[1:4]) == 1).any()
         if is_2D:
@@ -157,10 +161,23 @@ class VolumeEditor(QObject):
         self.newImageView2DFocus.emit()
 
     def __init__(
-        self, layerStackModel, parent, labelsink=None, crosshair=True, is_3d_widget_visible=False, syncAlongAxes=(0, 1)
+        self,
+        layerStackModel,
+        parent,
+        labelsink=None,
+        crosshair=True,
+        is_3d_widget_visible=False,
+        syncAlongAxes=(0, 1),
+        sharedBrickFetching=False,
     ):
+        """
+        sharedBrickFetching -- serve the three orthogonal views from one shared 3D brick
+                               around the slicing position (see BrickFetcher); reduces
+                               redundant block reads with chunked backends
+        """
         super(VolumeEditor, self).__init__(parent=parent)
         self._sync_along = tuple(syncAlongAxes)
+        self.brickFetcher = BrickFetcher() if sharedBrickFetching else None
 
         ##
         ## properties
@@ -203,6 +220,8 @@ class VolumeEditor(QObject):
 
         self.cacheSize = 50
 
+        self.player = TimeSeriesPlayer(self.posModel, self.imageScenes, parent=self)
+
         ##
         ## interaction
         ##
@@ -239,6 +258,12 @@ class VolumeEditor(QObject):
         if crosshair:
             self.posModel.cursorPositionChanged.connect(self.navCtrl.moveCrosshair)
         self.posModel.slicingPositionSettled.connect(self.navCtrl.settleSlicingPosition)
+        if self.brickFetcher is not None:
+            self.brickFetcher.setPosition(self.posModel.slicingPos)
+            self.posModel.slicingPositionChanged.connect(lambda new, old: self.brickFetcher.setPosition(new))
+            for scene in self.imageScenes:
+                scene.tileWidthChanged.connect(self._updateBrickShape)
+            self._updateBrickShape()
 
         self.layerStack.layerAdded.connect(self._onLayerAdded)
         self.parent = parent
@@ -252,6 +277,17 @@ class VolumeEditor(QObject):
         for s in self.imageScenes:
             s._invalidateRect()
 
+    def playTimeSeries(self, fps, loop=True):
+        """
+        Play back the time axis at fps frames per second, reading the upcoming
+        time points ahead. Frames that are not ready in time are dropped;
+        see player.achievedFps() and player.achievedFpsChanged.
+        """
+        self.player.play(fps, loop)
+
+    def stopPlayback(self):
+        self.player.stop()
+
     def setInteractionMode(self, name):
         modes = {
             "navigation": self.navInterpret,
@@ -268,6 +304,17 @@ class VolumeEditor(QObject):
         for i in self.imageScenes:
             i.setTileWidth(tileWidth)
 
+    def _updateBrickShape(self):
+        """
+        Align the bricks of the brick fetcher with the tiles (whose width may follow the zoom,
+        see ImageScene2D.setTileWidthAdaptive), so that the tiles around the crosshair share one brick.
+        """
+        # imageScenes[i] slices along axis i (x, y, z), i.e. shows the other two
+        widths = [scene.currentTileWidth() for scene in self.imageScenes]
+        brickShape = tuple(max(w for i, w in enumerate(widths) if i != axis) for axis in range(3))
+        if brickShape != self.brickFetcher.brickShape():
+            self.brickFetcher.setBrickShape(brickShape)
+
     def cleanUp(self):
         QApplication.processEvents()
         for scene in self._imageViews:
@@ -307,9 +354,12 @@ class VolumeEditor(QObject):
         alongTZC = SliceProjection(abscissa=1, ordinate=2, along=[0, 3, 4])
 
         imagepumps = []
-        imagepumps.append(volumina.pixelpipeline.imagepump.ImagePump(self.layerStack, alongTXC, self._sync_along))
-        imagepumps.append(volumina.pixelpipeline.imagepump.ImagePump(self.layerStack, alongTYC, self._sync_along))
-        imagepumps.append(volumina.pixelpipeline.imagepump.ImagePump(self.layerStack, alongTZC, self._sync_along))
+        for projection in (alongTXC, alongTYC, alongTZC):
+            imagepumps.append(
+                volumina.pixelpipeline.imagepump.ImagePump(
+                    self.layerStack, projection, self._sync_along, brickFetcher=self.brickFetcher
+                )
+            )
 
         return imagepumps
 